@@ -0,0 +1,127 @@
+"""
+Alert evaluation cost per price tick: sorted threshold index vs. full scan
+
+Builds synthetic above/below alerts around a base price and replays a random
+walk of ticks through both strategies, checking they fire the same alerts.
+Then times AlertService.evaluate, removal of fired one-shot alerts
+included, for a tick that crosses a burst of alerts sharing one threshold.
+
+    python -m benchmarks.alert_index --alerts 1000000 --ticks 1000 --burst 20000
+"""
+import argparse
+import asyncio
+import random
+import time
+from typing import List
+from src.core.alert_index import AlertIndex
+from src.core.models.alert import Alert, ABOVE, BELOW
+from src.services.alert_service import AlertService
+from .wallet_query import report
+
+
+class _Repository:
+    def __init__(self, alerts: List[Alert]):
+        self.alerts = alerts
+
+    async def iterate(self):
+        for alert in self.alerts:
+            yield alert
+
+
+class _Prices:
+    prices = {}
+
+    def add_listener(self, listener):
+        pass
+
+
+def make_alerts(count: int, base: float, spread: float, rng: random.Random) -> List[Alert]:
+    alerts = []
+    for i in range(count):
+        threshold = base * (1 + rng.uniform(-spread, spread))
+        direction = ABOVE if threshold > base else BELOW
+        alerts.append(Alert(
+            id=str(i), user_id=str(i % 50_000), chat_id=i % 50_000,
+            symbol="BOLT", direction=direction, threshold=threshold, created_at=0.0
+        ))
+    return alerts
+
+
+def scan(alerts: List[Alert], previous: float, current: float) -> List[Alert]:
+    """What a per-tick loop over every alert would do"""
+    if current > previous:
+        return [a for a in alerts if a.direction == ABOVE and previous < a.threshold <= current]
+    if current < previous:
+        return [a for a in alerts if a.direction == BELOW and current <= a.threshold < previous]
+    return []
+
+
+def evaluate_burst(alerts: List[Alert], burst: int, base: float) -> None:
+    """Time one tick crossing ``burst`` one-shot alerts at the same threshold"""
+    threshold = base * 1.01
+    clustered = [
+        Alert(id=f"burst{i}", user_id=str(i), chat_id=i, symbol="BOLT", direction=ABOVE, threshold=threshold, created_at=0.0)
+        for i in range(burst)
+    ]
+    service = AlertService(_Repository(alerts + clustered), _Prices())
+    asyncio.run(service.load())
+    size = len(service.index)
+
+    started = time.perf_counter()
+    fired = service.evaluate("BOLT", threshold * 0.9999, threshold)
+    elapsed = time.perf_counter() - started
+    assert len(service.index) == size - len(fired) and len(fired) >= burst
+    print(f"evaluate: {len(fired)} alerts fired and removed out of {size} in {elapsed * 1000:.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--alerts", type=int, default=1_000_000)
+    parser.add_argument("--ticks", type=int, default=1000)
+    parser.add_argument("--scan-ticks", type=int, default=20, help="ticks replayed through the full scan")
+    parser.add_argument("--volatility", type=float, default=0.002, help="relative stdev of one tick")
+    parser.add_argument("--burst", type=int, default=20_000, help="one-shot alerts sharing one threshold")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    base = 0.01
+    alerts = make_alerts(args.alerts, base, 0.5, rng)
+
+    index = AlertIndex()
+    started = time.perf_counter()
+    index.load(list(alerts))
+    print(f"{args.alerts} alerts indexed in {(time.perf_counter() - started) * 1000:.0f}ms")
+
+    prices = [base]
+    for _ in range(args.ticks):
+        prices.append(prices[-1] * (1 + rng.gauss(0, args.volatility)))
+
+    indexed, fired = [], 0
+    for previous, current in zip(prices, prices[1:]):
+        started = time.perf_counter()
+        fired += len(index.crossed("BOLT", previous, current))
+        indexed.append(time.perf_counter() - started)
+
+    scanned = []
+    for previous, current in list(zip(prices, prices[1:]))[:args.scan_ticks]:
+        started = time.perf_counter()
+        expected = scan(alerts, previous, current)
+        scanned.append(time.perf_counter() - started)
+        got = index.crossed("BOLT", previous, current)
+        assert {a.id for a in got} == {a.id for a in expected}
+
+    print(f"{args.ticks} ticks, {fired / args.ticks:.1f} alerts crossed per tick on average")
+    report("index", indexed)
+    report("full scan", scanned)
+
+    sample = alerts[rng.randrange(len(alerts))]
+    started = time.perf_counter()
+    index.remove(sample)
+    index.add(sample)
+    print(f"remove + add one alert: {(time.perf_counter() - started) * 1e6:.0f}us")
+
+    evaluate_burst(alerts, args.burst, base)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+End-to-end load test: BoltBot against local Bot API, tonapi and CoinGecko stand-ins
+
+Runs the whole bot in-process, pointed at aiohttp stand-ins on localhost,
+so nothing leaves the machine. Virtual users, one chat each, send a mix of
+``!тон`` commands, main/price/community menu taps and wallet address
+queries; each waits for the bot's reply (a sent or edited message in its
+chat) before sending the next. Reports updates per second and
+update-to-reply latency percentiles.
+
+Latency and 503 error injection are set per stand-in; errors are switched
+on once the bot has started. ``--set`` overrides any setting through the
+environment before the bot is imported, e.g. ``--set TON_API_RATE_LIMIT=100``.
+
+    python -m benchmarks.load_test --users 50 --requests 5000 --mix price=5,menu=3,wallet=2
+    python -m benchmarks.load_test --mode webhook --upstream-latency 0.05 --error-rate 0.01
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from src.app.config import get_settings
+from tests.fakes import FakeBotApi, FakeCoinGecko, FakeTonApi
+from .wallet_query import percentile
+
+MENUS = ("main_menu", "price_menu", "community_menu")
+KINDS = ("price", "menu", "wallet")
+
+
+@dataclass
+class LoadResult:
+    latencies: List[float] = field(default_factory=list)
+    timeouts: int = 0
+    elapsed: float = 0.0
+    requests: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        return len(self.latencies) / self.elapsed if self.elapsed else 0.0
+
+
+def parse_mix(text: str) -> Dict[str, int]:
+    mix = {}
+    for part in text.split(","):
+        kind, _, weight = part.partition("=")
+        if kind not in KINDS:
+            raise argparse.ArgumentTypeError(f"unknown request kind {kind!r}, expected one of {KINDS}")
+        mix[kind] = int(weight or 1)
+    return mix
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_load(
+    users: int = 20,
+    requests: int = 1000,
+    mix: Optional[Dict[str, int]] = None,
+    mode: str = "polling",
+    telegram_latency: float = 0.0,
+    upstream_latency: float = 0.0,
+    error_rate: float = 0.0,
+    wallets: int = 1000,
+    reply_timeout: float = 10.0,
+    seed: int = 0
+) -> LoadResult:
+    """Start the bot against fresh stand-ins and drive ``requests`` updates through it"""
+    # Imported here so settings overridden through the environment apply
+    from src.app.bot import BoltBot
+
+    mix = mix or {"price": 5, "menu": 3, "wallet": 2}
+    settings = get_settings()
+    addresses = [f"0:{i:064x}" for i in range(1, wallets + 1)]
+    telegram = FakeBotApi(latency=telegram_latency, seed=seed)
+    tonapi = FakeTonApi(
+        accounts={address: {"balance": 10 ** 10, "status": "active"} for address in addresses},
+        latency=upstream_latency,
+        seed=seed
+    )
+    for address in addresses:
+        tonapi.jettons[address] = [{"balance": "1000000000", "jetton": {"symbol": "BOLT", "decimals": 9}}]
+    tonapi.rates[settings.BOLT_JETTON] = 0.01
+    coingecko = FakeCoinGecko(latency=upstream_latency, seed=seed)
+    servers = (telegram, tonapi, coingecko)
+    for server in servers:
+        await server.start()
+
+    changes: Dict[str, Any] = {
+        "BOT_TOKEN": FakeBotApi.TOKEN,
+        "BOT_API_BASE_URL": f"{telegram.url}/bot",
+        "TON_API_BASE_URL": f"{tonapi.url}/v2",
+        "PRICE_API_BASE_URL": f"{coingecko.url}/api/v3",
+        "UPDATE_MODE": mode,
+        "ENABLE_WHALE_TRACKING": False,
+        "ENABLE_METRICS": False
+    }
+    if mode == "webhook":
+        port = free_port()
+        changes.update(
+            WEBHOOK_URL=f"http://127.0.0.1:{port}",
+            WEBHOOK_LISTEN="127.0.0.1",
+            WEBHOOK_PORT=port,
+            WEBHOOK_SECRET="load-test"
+        )
+    saved = {name: getattr(settings, name) for name in changes}
+    for name, value in changes.items():
+        setattr(settings, name, value)
+
+    bot = None
+    result = LoadResult()
+    try:
+        bot = BoltBot()
+        await bot.startup()
+        prices = bot.container.price_service()
+
+        async def first_prices() -> None:
+            while prices.get_quote("TON") is None:
+                await asyncio.sleep(0.01)
+        await asyncio.wait_for(first_prices(), reply_timeout)
+        for server in servers:
+            server.error_rate = error_rate
+            server.requests.clear()
+
+        loop = asyncio.get_running_loop()
+        kinds = list(mix)
+        weights = [mix[kind] for kind in kinds]
+        remaining = requests
+
+        async def user(chat_id: int) -> None:
+            nonlocal remaining
+            rng = random.Random(seed * 1_000_003 + chat_id)
+            taps = 0
+            while remaining > 0:
+                remaining -= 1
+                kind = rng.choices(kinds, weights)[0]
+                reply = telegram.wait_for_reply(chat_id)
+                started = loop.time()
+                if kind == "price":
+                    await telegram.push_update("!тон", chat_id)
+                elif kind == "menu":
+                    # Consecutive taps differ, so every tap edits the menu message
+                    await telegram.push_callback(MENUS[taps % len(MENUS)], chat_id, message_id=chat_id)
+                    taps += 1
+                else:
+                    await telegram.push_update(rng.choice(addresses), chat_id)
+                try:
+                    result.latencies.append(await asyncio.wait_for(reply, reply_timeout) - started)
+                except asyncio.TimeoutError:
+                    result.timeouts += 1
+
+        started = time.perf_counter()
+        await asyncio.gather(*(user(chat_id) for chat_id in range(1, users + 1)))
+        result.elapsed = time.perf_counter() - started
+        result.requests = {
+            "bot api": len(telegram.requests),
+            "tonapi": len(tonapi.requests),
+            "coingecko": len(coingecko.requests)
+        }
+    finally:
+        if bot:
+            await bot.shutdown()
+        for name, value in saved.items():
+            setattr(settings, name, value)
+        for server in servers:
+            await server.stop()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=20, help="concurrent chats, one request in flight each")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--mix", type=parse_mix, default="price=5,menu=3,wallet=2")
+    parser.add_argument("--mode", choices=("polling", "webhook"), default="polling")
+    parser.add_argument("--telegram-latency", type=float, default=0.0, help="seconds added by the Bot API stand-in")
+    parser.add_argument("--upstream-latency", type=float, default=0.0, help="seconds added by tonapi and CoinGecko")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of stand-in requests answered with 503")
+    parser.add_argument("--wallets", type=int, default=1000, help="distinct addresses queried")
+    parser.add_argument("--reply-timeout", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--set", action="append", default=[], metavar="NAME=VALUE", help="override a setting")
+    args = parser.parse_args()
+
+    for override in args.set:
+        name, _, value = override.partition("=")
+        os.environ[name] = value
+    get_settings.cache_clear()
+
+    # Storage, state and log files go to a scratch directory
+    os.chdir(tempfile.mkdtemp(prefix="bolt-load-"))
+    result = asyncio.run(run_load(
+        users=args.users,
+        requests=args.requests,
+        mix=args.mix,
+        mode=args.mode,
+        telegram_latency=args.telegram_latency,
+        upstream_latency=args.upstream_latency,
+        error_rate=args.error_rate,
+        wallets=args.wallets,
+        reply_timeout=args.reply_timeout,
+        seed=args.seed
+    ))
+
+    mix = ",".join(f"{kind}={weight}" for kind, weight in args.mix.items())
+    print(
+        f"{args.mode}, {args.users} users, mix {mix}, telegram +{args.telegram_latency * 1000:.0f}ms, "
+        f"upstream +{args.upstream_latency * 1000:.0f}ms, {args.error_rate:.1%} errors"
+    )
+    print(
+        f"{len(result.latencies)} replies in {result.elapsed:.2f}s: {result.throughput:.1f} updates/s, "
+        f"{result.timeouts} timed out"
+    )
+    if result.latencies:
+        samples = result.latencies
+        print(
+            f"latency p50={percentile(samples, 50) * 1000:.1f}ms p95={percentile(samples, 95) * 1000:.1f}ms "
+            f"p99={percentile(samples, 99) * 1000:.1f}ms mean={statistics.mean(samples) * 1000:.1f}ms"
+        )
+    print("stand-in requests: " + ", ".join(f"{name} {count}" for name, count in result.requests.items()))
+
+
+if __name__ == "__main__":
+    main()
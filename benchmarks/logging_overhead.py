@@ -0,0 +1,70 @@
+"""
+Logging cost per update on the event loop thread, synchronous vs. queued
+
+Each simulated update logs one info line with structured fields and a few
+debug lines that the INFO level drops. The synchronous setup writes to
+bot.log from the calling thread like the old logger; the queued setup
+only enqueues for the writer thread. --disk-delay adds a sleep to every
+file write to stand in for a slow or busy disk.
+
+    python -m benchmarks.logging_overhead --updates 20000 --disk-delay 0.001
+"""
+import argparse
+import logging
+import tempfile
+import time
+from pathlib import Path
+from typing import Tuple
+from src.utils.logging import BotLogger
+
+DEBUG_LINES = 5
+
+class SlowFileHandler(logging.FileHandler):
+    def __init__(self, path: Path, delay: float):
+        super().__init__(path, encoding='utf-8')
+        self.disk_delay = delay
+
+    def emit(self, record):
+        if self.disk_delay:
+            time.sleep(self.disk_delay)
+        super().emit(record)
+
+def run_sync(path: Path, updates: int, delay: float) -> Tuple[float, int]:
+    log = logging.getLogger("bench.sync")
+    log.setLevel(logging.INFO)
+    handler = SlowFileHandler(path, delay)
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    log.addHandler(handler)
+    started = time.perf_counter()
+    for update_id in range(updates):
+        for line in range(DEBUG_LINES):
+            log.debug(f"Update {update_id} step {line} state {dict(step=line)}")
+        log.info(f"Handled update {update_id} handler=price_menu chat={update_id % 100} latency_ms=1.2")
+    elapsed = time.perf_counter() - started
+    handler.close()
+    return elapsed, 0
+
+def run_queued(path: Path, updates: int, delay: float) -> Tuple[float, int]:
+    log = BotLogger("bench.queued", level=logging.INFO, handlers=[SlowFileHandler(path, delay)])
+    started = time.perf_counter()
+    for update_id in range(updates):
+        for line in range(DEBUG_LINES):
+            log.debug("Update %s step %s state %s", update_id, line, dict(step=line))
+        log.info("Handled update %s", update_id, handler="price_menu", chat=update_id % 100, latency_ms=1.2)
+    elapsed = time.perf_counter() - started
+    log.stop()
+    return elapsed, log.dropped
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--updates", type=int, default=20_000)
+    parser.add_argument("--disk-delay", type=float, default=0.0, help="seconds added to every file write")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, run in (("sync", run_sync), ("queued", run_queued)):
+            elapsed, dropped = run(Path(tmp) / f"{name}.log", args.updates, args.disk_delay)
+            print(f"{name:>10}: {elapsed / args.updates * 1e6:8.1f}us per update on the calling thread, {dropped} records dropped")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Cost of the metrics layer: per-update instrumentation and scrape rendering
+
+Times the work the router adds around every handler call (two clock reads
+and a labelled histogram observation), counter increments as done per
+upstream attempt, and rendering a registry with many label sets.
+
+    python -m benchmarks.metrics_overhead --iterations 1000000 --series 1000
+"""
+import argparse
+import time
+from src.utils.metrics import MetricsRegistry
+
+
+def per_call(label: str, iterations: int, fn) -> None:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:>28}: {elapsed / iterations * 1e9:6.0f}ns per call")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=1_000_000)
+    parser.add_argument("--series", type=int, default=1000, help="label sets rendered per scrape")
+    args = parser.parse_args()
+
+    metrics = MetricsRegistry()
+    latency = metrics.histogram("handler_seconds", "Handler latency", ["handler"])
+    requests = metrics.counter("requests_total", "Requests", ["upstream", "status"])
+
+    per_call("empty loop", args.iterations, lambda: None)
+    per_call("counter labels().inc()", args.iterations, lambda: requests.labels("tonapi.io", "200").inc())
+
+    def timed_handler():
+        started = time.perf_counter()
+        latency.labels("handle_price_menu").observe(time.perf_counter() - started)
+    per_call("handler timing + observe", args.iterations, timed_handler)
+
+    for i in range(args.series):
+        latency.labels(f"handler_{i}").observe(0.01)
+    started = time.perf_counter()
+    text = metrics.render()
+    elapsed = time.perf_counter() - started
+    print(f"render {args.series} histogram series: {elapsed * 1000:.1f}ms, {len(text) / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
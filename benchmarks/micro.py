@@ -0,0 +1,274 @@
+"""
+Micro-benchmarks of storage, state, dispatch, rendering and parsing hot paths
+
+Each case reports the best of several timed rounds in nanoseconds per
+operation. --save writes the results to benchmarks/baseline.json, which
+tests/test_benchmarks.py compares against when BENCH_GATE=1. Baselines are
+only comparable on the machine that recorded them, so record one before
+gating a change.
+
+    python -m benchmarks.micro
+    python -m benchmarks.micro --filter json_repository --rounds 10
+    python -m benchmarks.micro --save
+"""
+import argparse
+import asyncio
+import json
+import platform
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, NamedTuple, Optional
+from src.core.commands.base import Command
+from src.core.commands.registry import CommandRegistry
+from src.core.commands.router import Router
+from src.core.models.price import PriceQuote
+from src.core.models.user import User
+from src.core.models.wallet import JettonBalance, WalletSnapshot
+from src.core.state_manager import StateManager
+from src.features.prices.handlers import PriceHandlers
+from src.features.wallet_info.handlers import WalletInfoHandlers
+from src.infrastructure.storage.json_storage import JsonRepository
+from src.utils.rendering import ScreenCache
+
+BASELINE = Path(__file__).with_name("baseline.json")
+
+
+class Bench(NamedTuple):
+    run: Callable[[], None]  # performs ``ops`` operations
+    ops: int
+    close: Optional[Callable[[], None]] = None
+
+
+CASES: Dict[str, Callable[[], Bench]] = {}
+
+
+def case(name: str):
+    def register(setup: Callable[[], Bench]) -> Callable[[], Bench]:
+        CASES[name] = setup
+        return setup
+    return register
+
+
+def measure(name: str, rounds: int = 5) -> float:
+    """Best nanoseconds per operation over ``rounds`` runs, after one warmup"""
+    bench = CASES[name]()
+    try:
+        bench.run()
+        best = float("inf")
+        for _ in range(rounds):
+            started = time.perf_counter()
+            bench.run()
+            best = min(best, time.perf_counter() - started)
+    finally:
+        if bench.close:
+            bench.close()
+    return best / bench.ops * 1e9
+
+
+def load_baseline() -> Dict[str, float]:
+    if not BASELINE.exists():
+        return {}
+    return json.loads(BASELINE.read_text())["cases"]
+
+
+def json_repository(users: int, operation: str) -> Bench:
+    tmp = tempfile.TemporaryDirectory()
+    path = Path(tmp.name) / "users.json"
+    path.write_text(json.dumps({str(i): {"id": str(i), "session_data": {"step": i}} for i in range(users)}))
+    loop = asyncio.new_event_loop()
+    repository = JsonRepository(path, User)
+    ids = [str(i * 7919 % users) for i in range(1000)]
+
+    async def get():
+        for id in ids:
+            await repository.get(id)
+
+    async def save():
+        # Concurrent saves share group commits, as concurrent handlers do
+        await asyncio.gather(*(repository.save(id, User(id, {"step": 1})) for id in ids))
+
+    def close():
+        loop.run_until_complete(repository.close())
+        loop.close()
+        tmp.cleanup()
+
+    run = get if operation == "get" else save
+    return Bench(lambda: loop.run_until_complete(run()), len(ids), close)
+
+
+for _users in (1_000, 100_000):
+    for _operation in ("get", "save"):
+        case(f"json_repository.{_operation}[{_users // 1000}k]")(
+            lambda users=_users, operation=_operation: json_repository(users, operation)
+        )
+
+
+@case("state_manager.set_state")
+def state_set() -> Bench:
+    manager = StateManager(max_states=100_000)
+    ids = [str(i) for i in range(10_000)]
+
+    def run():
+        for id in ids:
+            manager.set_state(id, "awaiting_address", {"page": 1})
+    return Bench(run, len(ids))
+
+
+@case("state_manager.get_state")
+def state_get() -> Bench:
+    manager = StateManager(max_states=100_000)
+    ids = [str(i) for i in range(10_000)]
+    for id in ids:
+        manager.set_state(id, "awaiting_address")
+
+    def run():
+        for id in ids:
+            manager.get_state(id)
+    return Bench(run, len(ids))
+
+
+@case("state_manager.update_data")
+def state_update() -> Bench:
+    manager = StateManager(max_states=100_000)
+    ids = [str(i) for i in range(10_000)]
+    for id in ids:
+        manager.set_state(id, "awaiting_address")
+
+    def run():
+        for id in ids:
+            manager.update_data(id, {"page": 2})
+    return Bench(run, len(ids))
+
+
+class _NamedCommand(Command):
+    def __init__(self, name: str):
+        super().__init__()
+        self.name = name
+        self.aliases = [f"!{name.lstrip('/')}"]
+
+    async def execute(self, update, context) -> None:
+        pass
+
+
+@case("command_registry.get_command")
+def registry_lookup() -> Bench:
+    registry = CommandRegistry()
+    for i in range(50):
+        registry.register(_NamedCommand(f"/command{i}"))
+    texts = [f"/COMMAND{i % 60}" for i in range(10_000)]
+
+    def run():
+        for text in texts:
+            registry.get_command(text)
+    return Bench(run, len(texts))
+
+
+@case("router.resolve_text")
+def router_resolve() -> Bench:
+    router = Router()
+
+    async def noop(update, context):
+        pass
+    for i in range(50):
+        router.command(f"/command{i}", noop)
+    texts = [f"/command{i % 60} arg" for i in range(10_000)]
+
+    def run():
+        for text in texts:
+            router.resolve_text(text)
+    return Bench(run, len(texts))
+
+
+class _Prices:
+    version = 1
+
+    def __init__(self):
+        now = time.time()
+        self.quotes = {
+            "TON": PriceQuote("TON", 3.21, now, "bench", 300),
+            "BOLT": PriceQuote("BOLT", 0.0123, now - 900, "bench", 300)
+        }
+
+    def get_quote(self, symbol):
+        return self.quotes.get(symbol)
+
+    def get_price(self, symbol):
+        quote = self.quotes.get(symbol)
+        return quote.value if quote else None
+
+    def get_change(self, symbol, hours):
+        return 4.2
+
+
+@case("price_handlers.render_price_menu")
+def render_price_menu() -> Bench:
+    handlers = PriceHandlers(_Prices(), ScreenCache())
+
+    def run():
+        for _ in range(1000):
+            handlers.render_price_menu()
+    return Bench(run, 1000)
+
+
+@case("wallet_info.render_snapshot")
+def render_snapshot() -> Bench:
+    handlers = WalletInfoHandlers(None, _Prices(), None, ScreenCache())
+    snapshot = WalletSnapshot(
+        address="EQD0vdSA_NedR9uvbgN9EikRX-suesDxGeFg69XQMavfLqIw",
+        ton_balance=1234.5,
+        jettons=[JettonBalance(f"JET{i}", f"Jetton {i}", f"0:{i:064x}", 1000.0 + i, 0.01 if i % 2 else None) for i in range(20)]
+    )
+
+    def run():
+        for _ in range(1000):
+            handlers.render_snapshot(snapshot)
+    return Bench(run, 1000)
+
+
+@case("wallet.parse_jettons")
+def parse_jettons() -> Bench:
+    body = json.dumps({"balances": [
+        {
+            "balance": str(10 ** 12 + i),
+            "price": {"prices": {"USD": 0.01 * i}},
+            "jetton": {"address": f"0:{i:064x}", "name": f"Jetton {i}", "symbol": f"jet{i}", "decimals": 9}
+        }
+        for i in range(20)
+    ]})
+
+    def run():
+        for _ in range(1000):
+            WalletSnapshot.parse_jettons(json.loads(body))
+    return Bench(run, 1000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--filter", default="", help="only cases whose name contains this")
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--save", action="store_true", help=f"write results to {BASELINE.name}")
+    args = parser.parse_args()
+
+    baseline = load_baseline()
+    results: Dict[str, float] = {}
+    for name in CASES:
+        if args.filter not in name:
+            continue
+        results[name] = measure(name, args.rounds)
+        previous = baseline.get(name)
+        change = f"{(results[name] / previous - 1) * 100:+6.1f}% vs baseline" if previous else ""
+        print(f"{name:<38} {results[name]:12.0f}ns/op  {change}")
+
+    if args.save:
+        cases = {**baseline, **results}
+        BASELINE.write_text(json.dumps({
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "cases": {name: round(cases[name], 1) for name in sorted(cases)}
+        }, indent=2) + "\n")
+        print(f"saved {len(results)} cases to {BASELINE}")
+
+
+if __name__ == "__main__":
+    main()
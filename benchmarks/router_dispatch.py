@@ -0,0 +1,79 @@
+"""
+Handler lookup cost per update: one indexed Router vs. a list of regex handlers
+
+Registers the same N callback routes both as python-telegram-bot
+CallbackQueryHandlers (tried in order, as Application does) and on a Router,
+then resolves callback queries for uniformly chosen routes.
+
+    python -m benchmarks.router_dispatch --routes 10 100 1000 --lookups 2000
+"""
+import argparse
+import random
+import time
+from typing import List
+from telegram import Bot, Update
+from telegram.ext import CallbackQueryHandler
+from src.core.commands.router import Router
+from tests.fakes import FakeBotApi
+from .wallet_query import report
+
+
+BOT = Bot(FakeBotApi.TOKEN)
+
+
+async def noop(update, context) -> None:
+    pass
+
+
+def make_update(data: str) -> Update:
+    return Update.de_json({
+        "update_id": 1,
+        "callback_query": {
+            "id": "1",
+            "chat_instance": "1",
+            "from": {"id": 1, "is_bot": False, "first_name": "Bench"},
+            "data": data
+        }
+    }, BOT)
+
+
+def measure(routes: int, lookups: int, rng: random.Random) -> None:
+    prefixes = [f"button_{i}" for i in range(routes)]
+    handlers = [CallbackQueryHandler(noop, pattern=f"^{prefix}(:.*)?$") for prefix in prefixes]
+    router = Router()
+    for prefix in prefixes:
+        router.callback_query(prefix, noop)
+
+    updates = [make_update(f"{rng.choice(prefixes)}:{rng.randrange(100)}") for _ in range(lookups)]
+
+    listed: List[float] = []
+    for update in updates:
+        started = time.perf_counter()
+        # Application.process_update stops at the first handler whose check passes
+        next(handler for handler in handlers if handler.check_update(update))
+        listed.append(time.perf_counter() - started)
+
+    indexed: List[float] = []
+    for update in updates:
+        started = time.perf_counter()
+        assert router.check_update(update)
+        indexed.append(time.perf_counter() - started)
+
+    print(f"{routes} routes")
+    report("  handler list", listed)
+    report("  router", indexed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--routes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--lookups", type=int, default=2000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    for routes in args.routes:
+        measure(routes, args.lookups, rng)
+
+
+if __name__ == "__main__":
+    main()
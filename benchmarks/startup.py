@@ -0,0 +1,80 @@
+"""
+Startup cost: import time and process spawn to first reply
+
+Imports src.app.bot in fresh interpreters, then starts run.py as a real
+process against a local Bot API stand-in that already holds a /start
+update. The timer runs from spawning the process until the bot's reply
+arrives, which is the downtime a restarted worker adds. Pass
+--profile to print each run's startup profile from the bot's log.
+
+    python -m benchmarks.startup --runs 5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+from tests.fakes import FakeBotApi, FakeCoinGecko, FakeTonApi
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def import_times(runs: int) -> List[float]:
+    code = "import time; t = time.perf_counter(); import src.app.bot; print(time.perf_counter() - t)"
+    return [
+        float(subprocess.check_output([sys.executable, "-c", code], cwd=ROOT, text=True))
+        for _ in range(runs)
+    ]
+
+
+async def first_reply(profile: bool) -> float:
+    async with FakeBotApi() as telegram, FakeTonApi() as tonapi, FakeCoinGecko() as coingecko:
+        env = dict(
+            os.environ,
+            PYTHONPATH=str(ROOT),
+            BOT_TOKEN=FakeBotApi.TOKEN,
+            BOT_API_BASE_URL=f"{telegram.url}/bot",
+            TON_API_BASE_URL=f"{tonapi.url}/v2",
+            PRICE_API_BASE_URL=f"{coingecko.url}/api/v3",
+            ENABLE_METRICS="false",
+            ENABLE_WHALE_TRACKING="false"
+        )
+        await telegram.push_update("/start", chat_id=1)
+        replied = telegram.wait_for_reply(1)
+        args = [sys.executable, str(ROOT / "run.py")] + (["--profile-startup"] if profile else [])
+        with tempfile.TemporaryDirectory() as workdir:
+            started = asyncio.get_running_loop().time()
+            process = await asyncio.create_subprocess_exec(
+                *args, cwd=workdir, env=env,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            try:
+                elapsed = await asyncio.wait_for(replied, 60) - started
+            finally:
+                process.terminate()
+                await process.wait()
+            if profile:
+                log = (Path(workdir) / "logs" / "bot.log").read_text()
+                print(log[log.index("Startup profile"):log.index("after start", log.index("ready")) + 11])
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--profile", action="store_true", help="print the bot's startup profile of each run")
+    args = parser.parse_args()
+
+    imports = import_times(args.runs)
+    print(f"import src.app.bot     median {statistics.median(imports) * 1000:7.1f}ms over {args.runs} runs")
+    replies = [asyncio.run(first_reply(args.profile)) for _ in range(args.runs)]
+    print(f"spawn to first reply   median {statistics.median(replies) * 1000:7.1f}ms over {args.runs} runs")
+
+
+if __name__ == "__main__":
+    main()
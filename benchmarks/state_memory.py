@@ -0,0 +1,81 @@
+"""
+Conversation state memory and expiry cost at 1M sessions
+
+Fills a StateManager with one state per user and reports the traced memory
+per session next to the previous layout (a dict of plain dataclasses
+holding datetimes and a data dict). Then times the reaper with every
+session expired and with none expired.
+
+    python -m benchmarks.state_memory --sessions 1000000
+"""
+import argparse
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict
+from src.core.state_manager import StateManager
+
+
+@dataclass
+class LegacyState:
+    """Record layout before slots and monotonic timestamps"""
+    state: str
+    data: Dict[str, Any]
+    started_at: datetime
+    expires_at: datetime
+
+
+def fill_legacy(sessions: int) -> dict:
+    states = {}
+    now = datetime.now()
+    for i in range(sessions):
+        states[str(i)] = LegacyState("menu", {}, now, now + timedelta(minutes=30))
+    return states
+
+
+def fill_manager(sessions: int, expiry_minutes: float = 30) -> StateManager:
+    manager = StateManager(expiry_minutes=expiry_minutes, max_states=sessions, resolution=0.01)
+    for i in range(sessions):
+        manager.set_state(str(i), "menu")
+    return manager
+
+
+def traced(build, sessions: int):
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = build(sessions)
+    elapsed = time.perf_counter() - started
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    for name, build in (("legacy dataclass", fill_legacy), ("state manager", fill_manager)):
+        result, size, elapsed = traced(build, args.sessions)
+        print(
+            f"{name:>16}: {size / 2**20:7.1f} MiB, {size / args.sessions:5.0f} B/session, "
+            f"filled in {elapsed:.2f}s"
+        )
+        del result
+
+    manager = fill_manager(args.sessions, expiry_minutes=0)
+    time.sleep(manager.resolution)
+    started = time.perf_counter()
+    removed = manager.reap()
+    elapsed = time.perf_counter() - started
+    print(f"reaped {removed} expired sessions in {elapsed * 1000:.0f}ms")
+
+    manager = fill_manager(args.sessions)
+    started = time.perf_counter()
+    removed = manager.reap()
+    print(f"reap with nothing expired: {(time.perf_counter() - started) * 1e6:.0f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Update-to-reply latency: long polling vs. webhook ingestion
+
+Runs a python-telegram-bot Application with an echo handler against a local
+Bot API stand-in. Each sample is the time from the stand-in releasing an
+update (to ``getUpdates`` or as a webhook POST) until the bot's reply
+reaches it.
+
+    python -m benchmarks.update_latency --iterations 200
+"""
+import argparse
+import asyncio
+from typing import List
+from telegram import Update
+from telegram.ext import ApplicationBuilder, CallbackContext, MessageHandler, filters
+from src.app.webhook import WebhookServer
+from tests.fakes import FakeBotApi
+from .wallet_query import report
+
+SECRET = "benchmark-secret"
+
+
+async def echo(update: Update, context: CallbackContext) -> None:
+    await update.message.reply_text(f"re:{update.message.text}")
+
+
+async def measure(mode: str, iterations: int, poll_interval: float) -> List[float]:
+    async with FakeBotApi() as server:
+        app = ApplicationBuilder().token(FakeBotApi.TOKEN).base_url(f"{server.url}/bot").build()
+        app.add_handler(MessageHandler(filters.TEXT, echo))
+        await app.initialize()
+        await app.start()
+
+        webhook = None
+        if mode == "webhook":
+            webhook = WebhookServer(app, SECRET, host="127.0.0.1", port=0)
+            await webhook.start()
+            await app.bot.set_webhook(f"http://127.0.0.1:{webhook.port}{webhook.path}", secret_token=SECRET)
+        else:
+            await app.updater.start_polling(poll_interval=poll_interval, timeout=10)
+
+        loop = asyncio.get_running_loop()
+        samples = []
+        for i in range(iterations):
+            replied = server.wait_for_message(f"re:{i}")
+            started = loop.time()
+            await server.push_update(str(i))
+            samples.append(await asyncio.wait_for(replied, 30) - started)
+
+        if webhook:
+            await webhook.stop()
+        if app.updater.running:
+            await app.updater.stop()
+        await app.stop()
+        await app.shutdown()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument(
+        "--poll-interval", type=float, default=0.0,
+        help="pause between getUpdates calls, as in Updater.start_polling"
+    )
+    args = parser.parse_args()
+
+    print(f"{args.iterations} updates per mode, poll interval {args.poll_interval}s")
+    for mode in ("polling", "webhook"):
+        report(mode, asyncio.run(measure(mode, args.iterations, args.poll_interval)))
+
+
+if __name__ == "__main__":
+    main()
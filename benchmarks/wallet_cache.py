@@ -0,0 +1,87 @@
+"""
+Wallet lookups under skewed traffic: plain TTL cache vs. stale-while-revalidate
+
+Most lookups go to a few hot addresses and the rest to a long tail, as
+with the BOLT contract and known whales. The same request stream runs
+against a TTL-only cache and against stale serving with prefetch, on a
+scaled-down TTL so several expiries fit in one run. Reports per-lookup
+latency of hot and tail addresses and the upstream requests made.
+
+    python -m benchmarks.wallet_cache --seconds 10 --rate 200 --ttl 1
+"""
+import argparse
+import asyncio
+import random
+import time
+from typing import Dict, List
+from src.infrastructure.cache.memory_cache import MemoryCache
+from src.infrastructure.ton_api.client import TonApiClient
+from src.services.wallet_service import WalletService
+from tests.fakes import FakeTonApi
+from .wallet_query import report
+
+
+class _NoPrices:
+    def get_price(self, symbol):
+        return None
+
+
+def addresses(count: int) -> List[str]:
+    return [f"0:{i:064x}" for i in range(count)]
+
+
+async def run_mode(mode: str, args, hot: List[str], tail: List[str]) -> None:
+    accounts = {address: {"balance": 10 ** 10, "status": "active"} for address in hot + tail}
+    async with FakeTonApi(accounts=accounts, latency=args.latency) as server:
+        client = TonApiClient()
+        client.transport.base_url = f"{server.url}/v2"
+        client.transport.rate_limiter = None
+        service = WalletService(client, _NoPrices(), cache=MemoryCache(), timeout=10)
+        service.fresh_ttl = args.ttl
+        service.prefetch_interval = args.ttl / 4
+        service.settings.WALLET_PREFETCH_ADDRESSES = []
+        if mode == "swr":
+            await service.start()
+        else:
+            service.stale_ttl = 0
+
+        rng = random.Random(0)
+        latencies: Dict[str, List[float]] = {"hot": [], "tail": []}
+
+        async def lookup(kind: str, address: str) -> None:
+            started = time.perf_counter()
+            await service.get_snapshot(address)
+            latencies[kind].append(time.perf_counter() - started)
+
+        tasks = []
+        for _ in range(int(args.seconds * args.rate)):
+            kind = "hot" if rng.random() < args.hot_share else "tail"
+            tasks.append(asyncio.create_task(lookup(kind, rng.choice(hot if kind == "hot" else tail))))
+            await asyncio.sleep(1 / args.rate)
+        await asyncio.gather(*tasks)
+        await service.stop()
+        await client.close()
+
+    print(f"{mode}: {len(server.requests)} upstream requests, {service.stats()}")
+    report("  hot", latencies["hot"])
+    report("  tail", latencies["tail"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--rate", type=float, default=200, help="lookups per second")
+    parser.add_argument("--ttl", type=float, default=1, help="fresh TTL in seconds")
+    parser.add_argument("--latency", type=float, default=0.05, help="fake tonapi latency")
+    parser.add_argument("--hot", type=int, default=5, help="number of hot addresses")
+    parser.add_argument("--tail", type=int, default=500, help="number of tail addresses")
+    parser.add_argument("--hot-share", type=float, default=0.8)
+    args = parser.parse_args()
+
+    known = addresses(args.hot + args.tail)
+    for mode in ("ttl", "swr"):
+        asyncio.run(run_mode(mode, args, known[:args.hot], known[args.hot:]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Wallet query latency: sequential account -> jettons vs. concurrent snapshot
+
+Runs against a local fake tonapi with configurable latency, with caching
+disabled so every iteration pays the upstream round trips.
+
+    python -m benchmarks.wallet_query --latency 0.08 --iterations 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import List
+from src.infrastructure.ton_api.client import TonApiClient
+from src.services.wallet_service import WalletService
+from tests.fakes import FakeTonApi
+
+ADDRESS = "EQD0vdSA_NedR9uvbgN9EikRX-suesDxGeFg69XQMavfLqIw"
+
+
+class _NoPrices:
+    def get_price(self, symbol):
+        return None
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def report(name: str, samples: List[float]) -> None:
+    print(
+        f"{name:<12} p50={percentile(samples, 50) * 1000:7.1f}ms "
+        f"p99={percentile(samples, 99) * 1000:7.1f}ms "
+        f"mean={statistics.mean(samples) * 1000:7.1f}ms"
+    )
+
+
+async def run(latency: float, jitter: float, iterations: int) -> None:
+    server = FakeTonApi(accounts={ADDRESS: {"balance": 10 ** 10, "status": "active"}}, latency=latency)
+    server.jettons[ADDRESS] = [{"balance": "1000000000", "jetton": {"symbol": "BOLT", "decimals": 9}}]
+    async with server:
+        client = TonApiClient()
+        client.transport.base_url = f"{server.url}/v2"
+        client.transport.rate_limiter = None
+        service = WalletService(client, _NoPrices(), cache=None, timeout=10)
+
+        sequential, concurrent = [], []
+        for i in range(iterations):
+            server.latency = latency + jitter * ((i * 7919) % 100) / 100
+            started = time.perf_counter()
+            await client.get_account_info(ADDRESS)
+            await client.get_jettons(ADDRESS)
+            sequential.append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            await service.get_snapshot(ADDRESS)
+            concurrent.append(time.perf_counter() - started)
+
+        await client.close()
+
+    print(f"fake tonapi latency {latency * 1000:.0f}ms (+0..{jitter * 1000:.0f}ms), {iterations} iterations")
+    report("sequential", sequential)
+    report("concurrent", concurrent)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--iterations", type=int, default=100)
+    args = parser.parse_args()
+    asyncio.run(run(args.latency, args.jitter, args.iterations))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,20 @@
 import asyncio
-from src.app.bot import BoltBot
+import sys
+import time
 
-async def main():
-    bot = BoltBot()
-    await bot.start()
+STARTED = time.perf_counter()
+
+def main():
+    profile = None
+    if "--profile-startup" in sys.argv:
+        from src.utils.startup import StartupProfile
+        profile = StartupProfile(STARTED)
+        profile.trace_imports()
+    
+    # Imported after the profiler is installed so the imports are measured
+    from src.app.bot import BoltBot
+    bot = BoltBot(profile)
+    asyncio.run(bot.start())
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    main()
@@ -1,20 +1,39 @@
 import asyncio
+import secrets
 from pathlib import Path
-from telegram.ext import (
-    ApplicationBuilder,
-    CommandHandler,
-    CallbackQueryHandler,
-    MessageHandler,
-    filters
-)
+from typing import Optional
+from telegram import Update
+from telegram.ext import ApplicationBuilder
 from .container import Container
+from ..core.models.wallet import ADDRESS_PATTERN
 from .config import get_settings
+from .webhook import WebhookServer
+from .update_processor import KeyedUpdateProcessor
+from ..utils.logging import logger
+from ..utils.metrics import LoopLagMonitor, MetricFamily, MetricsServer, registry, stats_collector
+from ..utils.startup import StartupProfile
 
 class BoltBot:
-    def __init__(self):
+    def __init__(self, profile: Optional[StartupProfile] = None):
         self.settings = get_settings()
+        self.profile = profile or StartupProfile()
         self.container = Container()
-        self.app = ApplicationBuilder().token(self.settings.BOT_TOKEN).build()
+        # Chats are served in parallel; each chat's updates stay in order
+        self.update_processor = KeyedUpdateProcessor(
+            self.settings.MAX_CONCURRENT_UPDATES,
+            max_pending_per_key=self.settings.MAX_PENDING_UPDATES_PER_CHAT
+        )
+        self.app = (
+            ApplicationBuilder()
+            .token(self.settings.BOT_TOKEN)
+            .base_url(self.settings.BOT_API_BASE_URL)
+            .concurrent_updates(self.update_processor)
+            .build()
+        )
+        self.webhook: Optional[WebhookServer] = None
+        self.metrics: Optional[MetricsServer] = None
+        self.loop_lag: Optional[LoopLagMonitor] = None
+        self.update_processor.on_first_update = self.first_update
         
     def register_handlers(self):
         """Register all bot handlers"""
@@ -22,51 +41,111 @@ class BoltBot:
         tracking = self.container.tracking_handlers()
         prices = self.container.price_handlers()
         community = self.container.community_handlers()
+        wallet_info = self.container.wallet_info_handlers()
+        portfolio = self.container.portfolio_handlers()
+        alerts = self.container.alert_handlers()
+        whales = self.container.whale_handlers()
         
-        # Command handlers
-        self.app.add_handler(CommandHandler('start', tracking.handle_tracking_menu))
+        router = self.container.router()
         
-        # Callback query handlers
-        self.app.add_handler(CallbackQueryHandler(
-            tracking.handle_tracking_menu, 
-            pattern='^menu_tracking$'
+        # Commands, routed by their first word
+        router.command('/start', tracking.handle_main_menu)
+        router.command(['/portfolio', '!портфель'], portfolio.handle_portfolio_command)
+        router.command('/alert', alerts.handle_alert_command)
+        router.command('/alerts', alerts.handle_list_command)
+        router.command('/unalert', alerts.handle_delete_command)
+        router.command('/whales', whales.handle_whales_command)
+        router.command(['!болт', '!тон'], prices.handle_price_command)
+        router.include(self.container.command_registry())
+        
+        # Callback queries, routed by the data before the first ':'
+        router.callback_query('main_menu', tracking.handle_main_menu)
+        router.callback_query('menu_tracking', tracking.handle_wallet_query_menu)
+        router.callback_query('price_menu', prices.handle_price_menu)
+        router.callback_query('wallet_info', wallet_info.handle_wallet_info_menu)
+        router.callback_query('community_menu', community.handle_community_menu)
+        router.callback_query('social_media', community.handle_social_media)
+        router.callback_query('alerts', alerts.handle_list_command)
+        
+        # Plain messages that are not commands
+        router.pattern(ADDRESS_PATTERN, wallet_info.handle_wallet_message)
+        
+        self.app.add_handler(router)
+        
+        # Alert notifications
+        self.container.alert_service().add_listener(alerts.send_alert)
+        self.container.whale_service().add_listener(whales.send_transfer)
+        
+    def register_metrics(self):
+        """Expose component stats through the metrics registry"""
+        container = self.container
+        
+        def cache_metrics():
+            stats = container.cache().stats()
+            for field in ("hits", "misses", "evictions", "expirations", "entries", "bytes"):
+                counter = field not in ("entries", "bytes")
+                yield MetricFamily(
+                    f"bot_cache_{field}_total" if counter else f"bot_cache_{field}",
+                    "counter" if counter else "gauge",
+                    f"Cache {field} per namespace",
+                    [({"namespace": name}, getattr(ns, field)) for name, ns in stats.items()]
+                )
+            yield MetricFamily(
+                "bot_cache_hit_ratio", "gauge", "Cache hits over lookups per namespace",
+                [({"namespace": name}, ns.hit_rate) for name, ns in stats.items()]
+            )
+            
+        def upstream_metrics():
+            transports = [container.ton_client().transport, container.price_client().transport]
+            queued, breakers = [], []
+            for transport in transports:
+                if transport.rate_limiter:
+                    queued.append(({"limiter": transport.rate_limiter.name}, transport.rate_limiter.queue_depth))
+                for host, breaker in transport.breakers.items():
+                    breakers.append(({"upstream": host}, 0 if breaker.state == breaker.CLOSED else 1))
+            yield MetricFamily("bot_rate_limiter_queue_depth", "gauge", "Requests waiting for a rate limiter slot", queued)
+            yield MetricFamily("bot_circuit_open", "gauge", "1 while an upstream circuit is open or half-open", breakers)
+            
+        registry.add_collector(cache_metrics)
+        registry.add_collector(upstream_metrics)
+        registry.add_collector(stats_collector(
+            "bot_updates", "Update processor", self.update_processor.stats
         ))
-        self.app.add_handler(CallbackQueryHandler(
-            prices.handle_price_menu,
-            pattern='^price_menu$'
+        registry.add_collector(stats_collector(
+            "bot_notifications", "Notification dispatcher", container.notification_dispatcher().stats
         ))
-        
-        # Message handlers
-        self.app.add_handler(MessageHandler(
-            filters.Regex(r'^!(болт|тон)$'),
-            prices.handle_price_command
+        registry.add_collector(stats_collector(
+            "bot_wallets", "Wallet snapshots", container.wallet_service().stats
         ))
-        
-        # Add community handlers
-        self.app.add_handler(CallbackQueryHandler(
-            community.handle_community_menu,
-            pattern='^community_menu$'
+        registry.add_collector(stats_collector(
+            "bot_whales", "Whale tracker", container.whale_service().stats
+        ))
+        registry.add_collector(stats_collector(
+            "bot_screens", "Screen cache", container.screen_cache().stats
         ))
-        self.app.add_handler(CallbackQueryHandler(
-            community.handle_social_media,
-            pattern='^social_media$'
+        if self.settings.STATE_BACKEND == "memory":
+            registry.add_collector(stats_collector(
+                "bot_states", "Conversation states", container.state_manager().stats
+            ))
+        registry.add_collector(stats_collector(
+            "bot_startup", "Startup", self.profile.stats
         ))
+        registry.add_collector(stats_collector(
+            "bot_webhook", "Webhook server", lambda: self.webhook.stats() if self.webhook else {}
+        ))
+        
+    async def start_metrics(self):
+        """Serve /metrics and start probing event loop lag"""
+        self.register_metrics()
+        self.loop_lag = LoopLagMonitor(self.settings.LOOP_LAG_INTERVAL)
+        await self.loop_lag.start()
+        self.metrics = MetricsServer(registry, self.settings.METRICS_HOST, self.settings.METRICS_PORT)
+        await self.metrics.start()
         
     async def start(self):
         """Start the bot"""
         try:
-            # Initialize services
-            await self.container.ton_client().initialize()
-            await self.container.price_client().initialize()
-            await self.container.price_service().start()
-            
-            # Register handlers
-            self.register_handlers()
-            
-            # Start bot
-            await self.app.initialize()
-            await self.app.start()
-            await self.app.updater.start_polling()
+            await self.startup()
             
             # Keep running
             await asyncio.Event().wait()
@@ -77,19 +156,110 @@ class BoltBot:
         finally:
             await self.shutdown()
             
+    async def startup(self):
+        """Start services and begin receiving updates"""
+        timed = self.profile.timed
+        
+        # Independent steps run concurrently; getMe is a network round trip.
+        # If one fails the others are cancelled before shutdown tears them down.
+        try:
+            async with asyncio.TaskGroup() as steps:
+                steps.create_task(timed("cache", self.container.cache().start()))
+                steps.create_task(timed("state_backend", self.container.state_backend().start()))
+                steps.create_task(timed("ton_client", self.container.ton_client().initialize()))
+                steps.create_task(timed("price_client", self.container.price_client().initialize()))
+                steps.create_task(timed("alerts", self.container.alert_service().load()))
+                steps.create_task(timed("whales", self.container.whale_service().load()))
+                steps.create_task(timed("telegram", self.app.initialize()))
+        except ExceptionGroup as e:
+            raise e.exceptions[0]
+        if self.settings.STATE_BACKEND != "memory" and self.settings.STORAGE_BACKEND == "json":
+            logger.warning("User sessions stay per process with STORAGE_BACKEND=json; use sql to share them")
+        await self.container.price_service().start()
+        await self.container.wallet_service().start()
+        
+        # Register handlers
+        with self.profile.phase("handlers"):
+            self.register_handlers()
+        
+        # Streams start once their listeners are registered
+        if self.settings.ENABLE_WHALE_TRACKING:
+            await self.container.whale_service().start()
+        
+        # Start bot
+        await self.app.start()
+        await self.container.notification_dispatcher().start(self.app.bot)
+        if self.settings.ENABLE_METRICS:
+            await self.start_metrics()
+        await timed("ingestion", self.start_ingestion())
+        
+        logger.info("Ready %.2fs after start", self.profile.mark("ready"))
+        if self.profile.imports:
+            logger.info(self.profile.report())
+            
+    def first_update(self):
+        """Record time-to-first-update"""
+        logger.info("First update %.2fs after start", self.profile.mark("first_update"))
+        
+    async def start_ingestion(self):
+        """Start receiving updates through a webhook or long polling"""
+        if self.settings.UPDATE_MODE == "webhook":
+            if not self.settings.WEBHOOK_URL:
+                raise ValueError("WEBHOOK_URL is required when UPDATE_MODE is 'webhook'")
+            secret = self.settings.WEBHOOK_SECRET or secrets.token_urlsafe(32)
+            self.webhook = WebhookServer(
+                self.app,
+                secret_token=secret,
+                path=self.settings.WEBHOOK_PATH,
+                host=self.settings.WEBHOOK_LISTEN,
+                port=self.settings.WEBHOOK_PORT,
+                max_body=self.settings.WEBHOOK_MAX_BODY
+            )
+            await self.webhook.start()
+            await self.app.bot.set_webhook(
+                url=self.settings.WEBHOOK_URL.rstrip('/') + self.settings.WEBHOOK_PATH,
+                secret_token=secret,
+                max_connections=self.settings.WEBHOOK_MAX_CONNECTIONS,
+                allowed_updates=Update.ALL_TYPES
+            )
+        else:
+            # start_polling removes any webhook left from a previous run
+            await self.app.updater.start_polling(
+                timeout=self.settings.POLLING_TIMEOUT,
+                allowed_updates=Update.ALL_TYPES
+            )
+            
     async def shutdown(self):
         """Shutdown the bot and cleanup"""
         try:
+            # Stop taking updates first, then let running handlers finish.
+            # The webhook stays registered so Telegram holds updates meanwhile.
+            if self.webhook:
+                await self.webhook.stop()
+                self.webhook = None
+            if self.app.updater.running:
+                await self.app.updater.stop()
+            if self.app.running:
+                await self.app.stop()
+            
             # Stop services
             await self.container.price_service().stop()
+            await self.container.wallet_service().stop()
+            await self.container.whale_service().stop()
+            await self.container.notification_dispatcher().stop()
+            await self.app.shutdown()
+            if self.metrics:
+                await self.metrics.stop()
+            if self.loop_lag:
+                await self.loop_lag.stop()
+            self.container.price_history().close()
             await self.container.ton_client().close()
             await self.container.price_client().close()
-            
-            # Stop bot
-            if self.app.running:
-                await self.app.updater.stop()
-                await self.app.stop()
-                await self.app.shutdown()
+            await self.container.cache().stop()
+            await self.container.state_backend().close()
+            await self.container.user_repository().close()
+            await self.container.alert_repository().close()
+            await self.container.whale_subscription_repository().close()
                 
         except Exception as e:
-            print(f"Error during shutdown: {e}") 
\ No newline at end of file
+            print(f"Error during shutdown: {e}")
@@ -1,41 +1,101 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 from pathlib import Path
-from typing import Dict, ClassVar
+from typing import Dict, List, ClassVar
 import os
 
 class Settings(BaseSettings):
     # Bot Configuration - Use environment variables
     BOT_TOKEN: str = os.getenv("BOT_TOKEN", "YOUR_BOT_TOKEN_HERE")
-    DEBUG: bool = True
+    DEBUG: bool = False
     
     # API Keys - Use environment variables
     TON_API_KEY: str = os.getenv("TON_API_KEY", "YOUR_TON_API_KEY_HERE")
     
+    # Update Ingestion
+    UPDATE_MODE: str = "polling"  # "polling" or "webhook"
+    WEBHOOK_URL: str = ""  # public HTTPS base URL Telegram posts to
+    WEBHOOK_PATH: str = "/telegram/webhook"
+    WEBHOOK_LISTEN: str = "0.0.0.0"
+    WEBHOOK_PORT: int = 8443
+    WEBHOOK_SECRET: str = os.getenv("WEBHOOK_SECRET", "")  # generated per start when empty
+    WEBHOOK_MAX_BODY: int = 1024 * 1024  # bytes
+    WEBHOOK_MAX_CONNECTIONS: int = 40
+    POLLING_TIMEOUT: int = 10  # getUpdates long-poll timeout (seconds)
+    MAX_CONCURRENT_UPDATES: int = 64  # updates of different chats handled in parallel
+    MAX_PENDING_UPDATES_PER_CHAT: int = 50
+    
     # Storage Configuration
     DATA_DIR: Path = Path("data")
     USER_DATA_FILE: Path = DATA_DIR / "user_data.json"
     WALLET_DATA_FILE: Path = DATA_DIR / "wallets.json"
     LOG_DIR: Path = Path("logs")
+    STORAGE_BACKEND: str = "json"  # "json" or "sql"
+    DATABASE_URL: str = f"sqlite:///{DATA_DIR / 'bot.db'}"
+    DB_POOL_SIZE: int = 5
     
     # Feature Flags
     ENABLE_PRICE_TRACKING: bool = True
     ENABLE_WHALE_TRACKING: bool = True
     ENABLE_NOTIFICATIONS: bool = True
+    ENABLE_METRICS: bool = True
     
     # Limits & Timeouts
     MAX_TRACKED_WALLETS: int = 5
+    PORTFOLIO_MAX_ADDRESSES: int = 100
     PRICE_UPDATE_INTERVAL: int = 60  # seconds
     REQUEST_TIMEOUT: int = 10  # seconds
+    WALLET_QUERY_TIMEOUT: float = 5  # shared deadline for one wallet lookup
+    CONNECT_TIMEOUT: int = 5  # seconds
     MAX_RETRIES: int = 3
+    RETRY_BACKOFF_BASE: float = 0.5  # seconds
+    RETRY_BACKOFF_MAX: float = 10  # seconds
+    
+    # HTTP Connection Pool
+    HTTP_POOL_LIMIT: int = 100
+    HTTP_POOL_LIMIT_PER_HOST: int = 20
+    HTTP_KEEPALIVE_TIMEOUT: int = 30  # seconds
+    DNS_CACHE_TTL: int = 300  # seconds
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RESET_TIMEOUT: int = 30  # seconds
+    
+    # Upstream Rate Limits (requests per second / burst size)
+    TON_API_RATE_LIMIT: float = 10
+    TON_API_BURST: int = 10
+    PRICE_API_RATE_LIMIT: float = 0.5
+    PRICE_API_BURST: int = 5
+    TON_API_BULK_LIMIT: int = 100  # accounts per bulk request
+    TON_API_FANOUT_CONCURRENCY: int = 8  # parallel single requests when fanning out
+    INTERACTIVE_QUEUE_TIMEOUT: float = 5  # seconds
+    BACKGROUND_QUEUE_TIMEOUT: float = 30  # seconds
     
     # Cache Configuration
     CACHE_TTL: int = 300  # 5 minutes
     PRICE_CACHE_TTL: int = 60  # 1 minute
     WALLET_CACHE_TTL: int = 120  # 2 minutes
+    WALLET_STALE_TTL: int = 600  # served while revalidating for this long after WALLET_CACHE_TTL
+    CACHE_MAX_ENTRIES: int = 10_000  # per namespace
+    CACHE_MAX_BYTES: int = 16 * 1024 * 1024  # per namespace, approximate
+    CACHE_SWEEP_INTERVAL: int = 30  # seconds
     
     # State Management
     STATE_EXPIRY_MINUTES: int = 30
+    STATE_MAX_ENTRIES: int = 100_000  # oldest conversations are evicted beyond this
+    STATE_REAP_INTERVAL: int = 60  # seconds
+    STATE_BACKEND: str = "memory"  # "memory" (one worker) or "sqlite" (workers on one host)
+    STATE_DB_PATH: str = "data/state.db"
+    
+    # Metrics
+    METRICS_HOST: str = "127.0.0.1"  # Prometheus scrape endpoint, local only by default
+    METRICS_PORT: int = 9108
+    LOOP_LAG_INTERVAL: float = 0.5  # seconds between event loop lag probes
+    
+    # Logging
+    LOG_MAX_BYTES: int = 10 * 1024 * 1024  # bot.log is rotated at this size...
+    LOG_ROTATE_INTERVAL: int = 86400  # ...or after this many seconds, 0 to rotate by size only
+    LOG_BACKUP_COUNT: int = 7
+    LOG_QUEUE_SIZE: int = 10_000  # records waiting for the writer thread; more are dropped
+    LOG_UPDATE_SAMPLE_RATE: float = 0.01  # share of handled updates logged at debug level
     
     # Command Configuration
     COMMAND_PREFIX: str = "/"
@@ -44,17 +104,56 @@ class Settings(BaseSettings):
     BOLT_CONTRACT: str = "EQD0vdSA_NedR9uvbgN9EikRX-suesDxGeFg69XQMavfLqIw"
     BOLT_JETTON: str = "0:f4bdd480fcd79d47dbaf6e037d1229115feb2e7ac0f119e160ebd5d031abdf2e"
     
+    # Wallet Prefetch
+    WALLET_PREFETCH_TOP: int = 20  # most requested addresses refreshed before they go stale
+    WALLET_PREFETCH_INTERVAL: int = 30  # seconds
+    WALLET_PREFETCH_ADDRESSES: List[str] = [BOLT_CONTRACT]  # always kept fresh
+    
+    # Price Tracking
+    # CoinGecko ids of assets refreshed in one batched request
+    TRACKED_ASSETS: Dict[str, str] = {"TON": "the-open-network"}
+    # Jetton masters priced through tonapi rates
+    TRACKED_JETTONS: Dict[str, str] = {"BOLT": BOLT_JETTON}
+    PRICE_STALE_AFTER: int = 300  # seconds
+    PRICE_HISTORY_DIR: Path = DATA_DIR / "prices"
+    PRICE_HISTORY_TICKS: int = 10_000  # recent ticks kept in memory per symbol
+    
+    # Price Alerts
+    ALERT_DATA_FILE: Path = DATA_DIR / "alerts.json"
+    MAX_ALERTS_PER_USER: int = 20
+    ALERT_COOLDOWN: int = 3600  # seconds between notifications of a repeating alert
+    
+    # Whale Tracking
+    # Accounts whose transactions are streamed from tonapi (DEX pools, known whales)
+    WHALE_WATCH_ACCOUNTS: List[str] = []
+    WHALE_JETTON: str = BOLT_JETTON
+    WHALE_MIN_AMOUNT: float = 1_000_000  # jetton units
+    WHALE_STREAM_PATH: str = "/sse/accounts/transactions"
+    WHALE_STREAM_IDLE_TIMEOUT: int = 60  # seconds without data before reconnecting
+    WHALE_QUEUE_SIZE: int = 1000  # undecoded events buffered before the stream is paused
+    WHALE_WORKERS: int = 4
+    WHALE_DATA_FILE: Path = DATA_DIR / "whale_subscriptions.json"
+    
+    # Notifications (Telegram allows ~30 msg/s overall, ~1 msg/s per chat, 20 msg/min per group)
+    NOTIFY_GLOBAL_RATE: float = 25
+    NOTIFY_CHAT_INTERVAL: float = 1.0  # seconds
+    NOTIFY_GROUP_INTERVAL: float = 3.0  # seconds
+    NOTIFY_MAX_PENDING_PER_CHAT: int = 50
+    NOTIFY_CONCURRENCY: int = 16
+    
     # Error Messages
     ERROR_MESSAGES: ClassVar[Dict[str, str]] = {
         "wallet_limit": "You've reached the maximum number of tracked wallets (5)",
         "invalid_address": "Invalid TON address provided",
         "api_error": "Error connecting to TON API. Please try again later",
-        "timeout": "Request timed out. Please try again"
+        "timeout": "Request timed out. Please try again",
+        "rate_limited": "The bot is busy right now. Please try again in a moment"
     }
     
     # API URLs (Public APIs - safe to keep)
     TON_API_BASE_URL: str = "https://tonapi.io/v2"
     PRICE_API_BASE_URL: str = "https://api.coingecko.com/api/v3"
+    BOT_API_BASE_URL: str = "https://api.telegram.org/bot"  # or a local Bot API server
 
     class Config:
         env_file = ".env"
@@ -1,33 +1,109 @@
+import importlib
+from typing import Any, Callable
 from dependency_injector import containers, providers
 from ..infrastructure.storage.json_storage import JsonRepository
 from ..infrastructure.ton_api.client import TonApiClient
 from ..infrastructure.price_api.client import PriceApiClient
 from ..services.user_service import UserService
 from ..services.price_service import PriceService
-from ..features.tracking.handlers import TrackingHandlers
+from ..services.wallet_service import WalletService
+from ..services.alert_service import AlertService
+from ..services.whale_service import WhaleService
+from ..services.notification_service import NotificationDispatcher
 from ..core.models.user import User
+from ..core.models.alert import Alert
+from ..core.models.whale import WhaleSubscription
 from .config import get_settings
-from ..features.prices.handlers import PriceHandlers
 from ..utils.logging import logger
-from ..features.wallet_info.handlers import WalletInfoHandlers
-from ..features.community.handlers import CommunityHandlers
+from ..utils.rendering import ScreenCache
 from ..core.state_manager import StateManager
+from ..infrastructure.state.memory import MemoryStateBackend
 from ..infrastructure.cache.memory_cache import MemoryCache
+from ..infrastructure.price_history.store import PriceHistory
 from ..core.commands.registry import CommandRegistry
+from ..core.commands.router import Router
+
+def deferred(path: str) -> Callable[..., Any]:
+    """Factory for ``module:Class`` (relative to ``src``) that imports the module on first use"""
+    module, name = path.split(":")
+
+    def create(*args, **kwargs):
+        return getattr(importlib.import_module(module, "src"), name)(*args, **kwargs)
+    create.__qualname__ = create.__name__ = name
+    return create
 
 class Container(containers.DeclarativeContainer):
     config = providers.Singleton(get_settings)
     
     # Infrastructure
-    user_repository = providers.Singleton(
-        JsonRepository,
-        file_path=config().USER_DATA_FILE,
-        model_class=User
+    user_repository = providers.Selector(
+        providers.Callable(lambda: get_settings().STORAGE_BACKEND),
+        json=providers.Singleton(
+            JsonRepository,
+            file_path=config.provided.USER_DATA_FILE,
+            model_class=User
+        ),
+        sql=providers.Singleton(
+            deferred(".infrastructure.storage.sql_storage:SqlRepository"),
+            url=config.provided.DATABASE_URL,
+            model_class=User,
+            pool_size=config.provided.DB_POOL_SIZE
+        )
+    )
+    
+    alert_repository = providers.Selector(
+        providers.Callable(lambda: get_settings().STORAGE_BACKEND),
+        json=providers.Singleton(
+            JsonRepository,
+            file_path=config.provided.ALERT_DATA_FILE,
+            model_class=Alert
+        ),
+        sql=providers.Singleton(
+            deferred(".infrastructure.storage.sql_storage:SqlRepository"),
+            url=config.provided.DATABASE_URL,
+            model_class=Alert,
+            table_name="alerts",
+            pool_size=config.provided.DB_POOL_SIZE
+        )
+    )
+    
+    whale_subscription_repository = providers.Selector(
+        providers.Callable(lambda: get_settings().STORAGE_BACKEND),
+        json=providers.Singleton(
+            JsonRepository,
+            file_path=config.provided.WHALE_DATA_FILE,
+            model_class=WhaleSubscription
+        ),
+        sql=providers.Singleton(
+            deferred(".infrastructure.storage.sql_storage:SqlRepository"),
+            url=config.provided.DATABASE_URL,
+            model_class=WhaleSubscription,
+            table_name="whale_subscriptions",
+            pool_size=config.provided.DB_POOL_SIZE
+        )
+    )
+    
+    cache = providers.Singleton(
+        MemoryCache,
+        default_ttl=config.provided.CACHE_TTL,
+        namespace_ttls=providers.Dict(
+            price=config.provided.PRICE_CACHE_TTL,
+            wallet=config.provided.WALLET_CACHE_TTL
+        ),
+        max_entries=config.provided.CACHE_MAX_ENTRIES,
+        max_bytes=config.provided.CACHE_MAX_BYTES,
+        sweep_interval=config.provided.CACHE_SWEEP_INTERVAL
     )
     
-    ton_client = providers.Singleton(TonApiClient)
+    ton_client = providers.Singleton(TonApiClient, cache=cache)
     price_client = providers.Singleton(PriceApiClient)
     
+    price_history = providers.Singleton(
+        PriceHistory,
+        directory=config.provided.PRICE_HISTORY_DIR,
+        tick_capacity=config.provided.PRICE_HISTORY_TICKS
+    )
+    
     # Services
     user_service = providers.Singleton(
         UserService,
@@ -36,41 +112,104 @@ class Container(containers.DeclarativeContainer):
     
     price_service = providers.Singleton(
         PriceService,
-        price_client=price_client
+        price_client=price_client,
+        ton_client=ton_client,
+        history=price_history
+    )
+    
+    wallet_service = providers.Singleton(
+        WalletService,
+        ton_client=ton_client,
+        price_service=price_service,
+        cache=cache
+    )
+    
+    alert_service = providers.Singleton(
+        AlertService,
+        alert_repository=alert_repository,
+        price_service=price_service
     )
     
-    # Feature Handlers
+    notification_dispatcher = providers.Singleton(NotificationDispatcher)
+    
+    whale_service = providers.Singleton(
+        WhaleService,
+        ton_client=ton_client,
+        subscription_repository=whale_subscription_repository
+    )
+    
+    # Feature Handlers, imported when first resolved
+    screen_cache = providers.Singleton(ScreenCache)
+    
     tracking_handlers = providers.Singleton(
-        TrackingHandlers,
+        deferred(".features.tracking.handlers:TrackingHandlers"),
         user_service=user_service,
         price_service=price_service,
-        ton_client=ton_client
+        wallet_service=wallet_service,
+        screens=screen_cache
     )
     
     logger = providers.Object(logger)
     
     price_handlers = providers.Singleton(
-        PriceHandlers,
-        price_service=price_service
+        deferred(".features.prices.handlers:PriceHandlers"),
+        price_service=price_service,
+        screens=screen_cache
     )
     
     wallet_info_handlers = providers.Singleton(
-        WalletInfoHandlers,
+        deferred(".features.wallet_info.handlers:WalletInfoHandlers"),
         user_service=user_service,
         price_service=price_service,
-        ton_client=ton_client
+        wallet_service=wallet_service,
+        screens=screen_cache
     )
     
     community_handlers = providers.Singleton(
-        CommunityHandlers
+        deferred(".features.community.handlers:CommunityHandlers"),
+        screens=screen_cache
+    )
+    
+    portfolio_handlers = providers.Singleton(
+        deferred(".features.portfolio.handlers:PortfolioHandlers"),
+        wallet_service=wallet_service,
+        price_service=price_service
+    )
+    
+    alert_handlers = providers.Singleton(
+        deferred(".features.alerts.handlers:AlertHandlers"),
+        alert_service=alert_service,
+        notifications=notification_dispatcher,
+        screens=screen_cache
+    )
+    
+    whale_handlers = providers.Singleton(
+        deferred(".features.whales.handlers:WhaleHandlers"),
+        whale_service=whale_service,
+        notifications=notification_dispatcher
     )
     
     # New providers
     state_manager = providers.Singleton(
         StateManager,
-        expiry_minutes=config().STATE_EXPIRY_MINUTES
+        expiry_minutes=config.provided.STATE_EXPIRY_MINUTES,
+        max_states=config.provided.STATE_MAX_ENTRIES,
+        reap_interval=config.provided.STATE_REAP_INTERVAL
     )
     
-    cache = providers.Singleton(MemoryCache)
+    state_backend = providers.Selector(
+        providers.Callable(lambda: get_settings().STATE_BACKEND),
+        memory=providers.Singleton(MemoryStateBackend, state_manager=state_manager),
+        sqlite=providers.Singleton(
+            deferred(".infrastructure.state.sqlite:SqliteStateBackend"),
+            path=config.provided.STATE_DB_PATH,
+            expiry_minutes=config.provided.STATE_EXPIRY_MINUTES,
+            reap_interval=config.provided.STATE_REAP_INTERVAL
+        )
+    )
     
-    command_registry = providers.Singleton(CommandRegistry) 
\ No newline at end of file
+    command_registry = providers.Singleton(CommandRegistry)
+    router = providers.Singleton(
+        Router,
+        log_sample_rate=config.provided.LOG_UPDATE_SAMPLE_RATE
+    )
@@ -0,0 +1,102 @@
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, Optional
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+from ..utils.logging import logger
+
+class KeyedUpdateProcessor(BaseUpdateProcessor):
+    """
+    Concurrent update processing that keeps each chat's updates in order
+
+    Up to ``max_concurrent_updates`` updates run at once, but never two from
+    the same chat (or user, for updates without a chat). The first update of a
+    chat runs in its slot and then drains whatever arrived for that chat
+    meanwhile, in arrival order. Later updates only enqueue themselves and
+    return, so a busy chat's backlog never holds slots other chats could use.
+    """
+
+    def __init__(self, max_concurrent_updates: int, max_pending_per_key: int = 50):
+        super().__init__(max_concurrent_updates)
+        self.max_pending_per_key = max_pending_per_key
+        # A key is present while one of its updates is running
+        self._queues: Dict[Hashable, Deque[Awaitable[Any]]] = {}
+        self.in_flight = 0
+        self.processed = 0
+        self.deferred = 0
+        self.dropped = 0
+        # Called once, when the first update arrives
+        self.on_first_update: Optional[Callable[[], None]] = None
+
+    @staticmethod
+    def key_for(update: object) -> Optional[Hashable]:
+        """Ordering key of an update; None means it can run in any order"""
+        if isinstance(update, Update):
+            if update.effective_chat:
+                return ("chat", update.effective_chat.id)
+            if update.effective_user:
+                return ("user", update.effective_user.id)
+        return None
+
+    async def do_process_update(self, update: object, coroutine: Awaitable[Any]) -> None:
+        if self.on_first_update:
+            first_update, self.on_first_update = self.on_first_update, None
+            first_update()
+        key = self.key_for(update)
+        if key is None:
+            await self._run(coroutine)
+            return
+
+        queue = self._queues.get(key)
+        if queue is not None:
+            if len(queue) >= self.max_pending_per_key:
+                logger.warning("Dropping update for %s: %d already pending", key, len(queue), sample=0.1)
+                self.dropped += 1
+                coroutine.close()
+                return
+            queue.append(coroutine)
+            self.deferred += 1
+            return
+
+        queue = self._queues[key] = deque()
+        try:
+            await self._run(coroutine)
+            while queue:
+                await self._run(queue.popleft())
+        finally:
+            del self._queues[key]
+            # Only left over when cancelled during shutdown
+            for pending in queue:
+                pending.close()
+
+    async def _run(self, coroutine: Awaitable[Any]) -> None:
+        self.in_flight += 1
+        try:
+            await coroutine
+        except Exception as e:
+            logger.error("Update processing failed: %s", e, exc_info=e)
+        finally:
+            self.in_flight -= 1
+            self.processed += 1
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
+
+    def queue_lengths(self) -> Dict[Hashable, int]:
+        """Updates waiting behind the running one, per busy key"""
+        return {key: len(queue) for key, queue in self._queues.items()}
+
+    def stats(self) -> Dict[str, int]:
+        lengths = [len(queue) for queue in self._queues.values()]
+        return {
+            "in_flight": self.in_flight,
+            "max_concurrent": self.max_concurrent_updates,
+            "busy_keys": len(lengths),
+            "queued": sum(lengths),
+            "max_queue": max(lengths, default=0),
+            "processed": self.processed,
+            "deferred": self.deferred,
+            "dropped": self.dropped
+        }
@@ -0,0 +1,87 @@
+import hmac
+import json
+from typing import Dict, Optional
+from aiohttp import web
+from telegram import Update
+from telegram.ext import Application
+from ..utils.logging import logger
+
+SECRET_HEADER = "X-Telegram-Bot-Api-Secret-Token"
+
+class WebhookServer:
+    """
+    Embedded aiohttp server receiving Telegram updates
+
+    Requests must carry the secret token registered with ``setWebhook``
+    (compared in constant time) and bodies are capped at ``max_body`` bytes.
+    Accepted updates are handed to the application's update queue and
+    acknowledged right away, so Telegram never waits on a handler.
+    """
+
+    def __init__(
+        self,
+        application: Application,
+        secret_token: str,
+        path: str = "/telegram/webhook",
+        host: str = "0.0.0.0",
+        port: int = 8443,
+        max_body: int = 1024 * 1024
+    ):
+        self.application = application
+        self.secret_token = secret_token.encode()
+        self.path = path
+        self.host = host
+        self.port = port
+        self.max_body = max_body
+        self.web_app = web.Application(client_max_size=max_body)
+        self.web_app.router.add_post(path, self.handle_update)
+        self._runner: Optional[web.AppRunner] = None
+        self.received = 0
+        self.rejected = 0
+
+    async def start(self) -> None:
+        self._runner = web.AppRunner(self.web_app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        # Resolve the real port when 0 was requested
+        self.port = site._server.sockets[0].getsockname()[1]
+        logger.info("Webhook server listening on %s:%s%s", self.host, self.port, self.path)
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def handle_update(self, request: web.Request) -> web.Response:
+        token = request.headers.get(SECRET_HEADER, "").encode()
+        if not hmac.compare_digest(token, self.secret_token):
+            self.rejected += 1
+            raise web.HTTPForbidden()
+        if request.content_length is not None and request.content_length > self.max_body:
+            self.rejected += 1
+            raise web.HTTPRequestEntityTooLarge(max_size=self.max_body, actual_size=request.content_length)
+
+        try:
+            # Raises 413 itself when a chunked body outgrows client_max_size
+            data = json.loads(await request.read())
+            if not isinstance(data, dict):
+                raise ValueError("update must be a JSON object")
+            update = Update.de_json(data, self.application.bot)
+        except web.HTTPException:
+            self.rejected += 1
+            raise
+        except (ValueError, TypeError, KeyError) as e:
+            self.rejected += 1
+            logger.warning("Rejected malformed webhook update: %s", e)
+            raise web.HTTPBadRequest()
+        if update is None:
+            self.rejected += 1
+            raise web.HTTPBadRequest()
+
+        self.received += 1
+        await self.application.update_queue.put(update)
+        return web.Response()
+
+    def stats(self) -> Dict[str, int]:
+        return {"received": self.received, "rejected": self.rejected}
@@ -0,0 +1,126 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Dict, Iterable, List, Optional, Tuple
+from .models.alert import Alert, ABOVE, BELOW
+
+
+class _ThresholdList:
+    """Alerts ordered by threshold, with thresholds in a flat array for bisect"""
+
+    __slots__ = ("thresholds", "alerts")
+
+    def __init__(self):
+        self.thresholds = array('d')
+        self.alerts: List[Alert] = []
+
+    def __len__(self) -> int:
+        return len(self.alerts)
+
+    def load(self, alerts: List[Alert]) -> None:
+        alerts.sort(key=lambda alert: alert.threshold)
+        self.alerts = alerts
+        self.thresholds = array('d', (alert.threshold for alert in alerts))
+
+    def add(self, alert: Alert) -> None:
+        i = bisect_right(self.thresholds, alert.threshold)
+        self.thresholds.insert(i, alert.threshold)
+        self.alerts.insert(i, alert)
+
+    def remove(self, alert: Alert) -> bool:
+        i = bisect_left(self.thresholds, alert.threshold)
+        while i < len(self.alerts) and self.thresholds[i] == alert.threshold:
+            if self.alerts[i].id == alert.id:
+                del self.thresholds[i]
+                del self.alerts[i]
+                return True
+            i += 1
+        return False
+
+    def between(self, lo: int, hi: int) -> List[Alert]:
+        return self.alerts[lo:hi]
+
+    def take_once(self, lo: int, hi: int) -> Tuple[List[Alert], int]:
+        """Alerts in ``[lo:hi]``, removing the one-shot ones with one slice update per list"""
+        taken = self.alerts[lo:hi]
+        kept = [alert for alert in taken if alert.repeat]
+        if len(kept) < len(taken):
+            self.alerts[lo:hi] = kept
+            self.thresholds[lo:hi] = array('d', (alert.threshold for alert in kept))
+        return taken, len(taken) - len(kept)
+
+
+class AlertIndex:
+    """
+    Per-symbol alert thresholds kept sorted for crossing lookups
+
+    An ``above`` alert fires when the price moves from below its threshold to
+    at or over it, i.e. the threshold lies in ``(previous, current]``; a
+    ``below`` alert fires for thresholds in ``[current, previous)``. Both are
+    two binary searches plus the matched slice, so a tick costs
+    O(log n + k) no matter how many alerts are registered. Fired one-shot
+    alerts leave the index in one slice update rather than one by one.
+    """
+
+    def __init__(self):
+        self._lists: Dict[str, Dict[str, _ThresholdList]] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _list(self, symbol: str, direction: str) -> _ThresholdList:
+        sides = self._lists.get(symbol)
+        if sides is None:
+            sides = self._lists[symbol] = {ABOVE: _ThresholdList(), BELOW: _ThresholdList()}
+        return sides[direction]
+
+    def load(self, alerts: Iterable[Alert]) -> None:
+        """Replace the index contents, sorting each list once"""
+        grouped: Dict[tuple, List[Alert]] = {}
+        for alert in alerts:
+            grouped.setdefault((alert.symbol, alert.direction), []).append(alert)
+        self._lists.clear()
+        self._size = 0
+        for (symbol, direction), group in grouped.items():
+            self._list(symbol, direction).load(group)
+            self._size += len(group)
+
+    def add(self, alert: Alert) -> None:
+        self._list(alert.symbol, alert.direction).add(alert)
+        self._size += 1
+
+    def remove(self, alert: Alert) -> bool:
+        sides = self._lists.get(alert.symbol)
+        if sides and sides[alert.direction].remove(alert):
+            self._size -= 1
+            return True
+        return False
+
+    def _crossed_range(
+        self,
+        symbol: str,
+        previous: Optional[float],
+        current: float
+    ) -> Optional[Tuple[_ThresholdList, int, int]]:
+        sides = self._lists.get(symbol)
+        if not sides or previous is None or previous == current:
+            return None
+        if current > previous:
+            above = sides[ABOVE]
+            return above, bisect_right(above.thresholds, previous), bisect_right(above.thresholds, current)
+        below = sides[BELOW]
+        return below, bisect_left(below.thresholds, current), bisect_left(below.thresholds, previous)
+
+    def crossed(self, symbol: str, previous: Optional[float], current: float) -> List[Alert]:
+        """Alerts whose threshold the price passed between two ticks"""
+        found = self._crossed_range(symbol, previous, current)
+        return found[0].between(found[1], found[2]) if found else []
+
+    def take_crossed(self, symbol: str, previous: Optional[float], current: float) -> List[Alert]:
+        """Crossed alerts, with the one-shot ones removed from the index in a single step"""
+        found = self._crossed_range(symbol, previous, current)
+        if not found:
+            return []
+        taken, removed = found[0].take_once(found[1], found[2])
+        self._size -= removed
+        return taken
@@ -5,20 +5,20 @@ from ...utils.logging import logger
 class CommandRegistry:
     def __init__(self):
         self.commands: Dict[str, Command] = {}
+        # Command names and aliases, lowercased
+        self._index: Dict[str, Command] = {}
         
     def register(self, command: Command) -> None:
         """Register a command"""
         self.commands[command.name] = command
-        logger.info(f"Registered command: {command.name}")
+        for name in [command.name, *command.aliases]:
+            self._index[name.lower()] = command
+        logger.info("Registered command: %s", command.name)
         
     def get_command(self, text: str) -> Optional[Command]:
         """Get command that matches text"""
-        text = text.lower()
-        for command in self.commands.values():
-            if command.matches(text):
-                return command
-        return None
+        return self._index.get(text.lower())
         
     def get_all_commands(self) -> List[Command]:
         """Get all registered commands"""
-        return list(self.commands.values()) 
\ No newline at end of file
+        return list(self.commands.values()) 
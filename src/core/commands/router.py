@@ -0,0 +1,159 @@
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Pattern, Tuple, Union
+from telegram import Update
+from telegram.ext import Application, BaseHandler, CallbackContext
+from .registry import CommandRegistry
+from ...utils.logging import logger
+from ...utils.metrics import registry
+from ...utils.middleware import HANDLER_ERRORS
+
+HANDLER_DURATION = registry.histogram(
+    "bot_handler_duration_seconds",
+    "Time spent in a routed handler",
+    ["handler"]
+)
+
+Callback = Callable[[Update, CallbackContext], Awaitable[Any]]
+Route = Tuple[Callback, List[str]]
+
+CALLBACK_SEPARATOR = ":"
+
+def callback_data(prefix: str, *args: Any) -> str:
+    """Build ``prefix:arg1:arg2`` callback data understood by the router"""
+    data = CALLBACK_SEPARATOR.join([prefix, *map(str, args)])
+    if len(data.encode()) > 64:
+        raise ValueError(f"Callback data too long: {data!r}")
+    return data
+
+class Router(BaseHandler[Update, CallbackContext]):
+    """
+    Single handler dispatching text commands and callback queries
+
+    Messages are routed by their first word (``/start``, ``!болт``,
+    ``!портфель``) and callback queries by the data before the first ``:``,
+    each through one dict lookup however many routes exist. The remaining
+    words or ``:``-separated parts are passed on as ``context.args``.
+    Messages matching no command fall through to the regex routes in
+    registration order.
+    """
+
+    def __init__(self, block: bool = True, log_sample_rate: float = 0.01):
+        super().__init__(self.dispatch, block=block)
+        self.log_sample_rate = log_sample_rate
+        self.commands: Dict[str, Callback] = {}
+        self.callbacks: Dict[str, Callback] = {}
+        self.patterns: List[Tuple[Pattern, Callback]] = []
+
+    def command(self, names: Union[str, Iterable[str]], callback: Callback) -> None:
+        """Route messages starting with any of ``names`` (``/cmd`` or ``!alias``)"""
+        for name in [names] if isinstance(names, str) else names:
+            key = name.lower()
+            if key in self.commands:
+                raise ValueError(f"Command already routed: {name}")
+            self.commands[key] = callback
+
+    def callback_query(self, prefix: str, callback: Callback) -> None:
+        """Route callback queries whose data is ``prefix`` or ``prefix:args``"""
+        if CALLBACK_SEPARATOR in prefix:
+            raise ValueError(f"Callback prefix may not contain {CALLBACK_SEPARATOR!r}: {prefix}")
+        if prefix in self.callbacks:
+            raise ValueError(f"Callback already routed: {prefix}")
+        self.callbacks[prefix] = callback
+
+    def include(self, registry: CommandRegistry) -> None:
+        """Route every command of a registry by its name and aliases"""
+        for command in registry.get_all_commands():
+            self.command([command.name, *command.aliases], command.execute)
+
+    def pattern(self, pattern: Union[str, Pattern], callback: Callback) -> None:
+        """Route messages matching a regex when no command matched"""
+        self.patterns.append((re.compile(pattern), callback))
+
+    def resolve_text(self, text: str, bot_username: Optional[str] = None) -> Optional[Route]:
+        """Find the route for message text"""
+        words = text.split()
+        if not words:
+            return None
+        name = words[0].lower()
+        if name.startswith("/") and "@" in name:
+            # /cmd@OtherBot in a group is meant for another bot
+            name, mention = name.split("@", 1)
+            if bot_username and mention != bot_username.lower():
+                return None
+        callback = self.commands.get(name)
+        if callback:
+            return callback, words[1:]
+        for pattern, callback in self.patterns:
+            if pattern.search(text):
+                return callback, []
+        return None
+
+    def resolve_callback(self, data: str) -> Optional[Route]:
+        """Find the route for callback data"""
+        prefix, *args = data.split(CALLBACK_SEPARATOR)
+        callback = self.callbacks.get(prefix)
+        return (callback, args) if callback else None
+
+    def check_update(self, update: object) -> Optional[Route]:
+        if not isinstance(update, Update):
+            return None
+        if update.callback_query:
+            if update.callback_query.data is None:
+                return None
+            route = self.resolve_callback(update.callback_query.data)
+            if route is None:
+                logger.warning("No route for callback data %r", update.callback_query.data)
+            return route
+        message = update.message or update.edited_message
+        if message and message.text:
+            return self.resolve_text(message.text, message.get_bot().username if "@" in message.text else None)
+        return None
+
+    def collect_additional_context(
+        self,
+        context: CallbackContext,
+        update: Update,
+        application: Application,
+        check_result: Route
+    ) -> None:
+        context.args = check_result[1]
+
+    async def handle_update(
+        self,
+        update: Update,
+        application: Application,
+        check_result: Route,
+        context: CallbackContext
+    ) -> Any:
+        """Run the route found by ``check_update`` without resolving it again"""
+        self.collect_additional_context(context, update, application, check_result)
+        return await self._run(check_result[0], update, context)
+
+    async def dispatch(self, update: Update, context: CallbackContext) -> Any:
+        """Resolve and run the route for an update; a no-op if nothing matches"""
+        route = self.check_update(update)
+        if route is None:
+            return None
+        context.args = route[1]
+        return await self._run(route[0], update, context)
+
+    async def _run(self, callback: Callback, update: Update, context: CallbackContext) -> Any:
+        name = getattr(callback, "__name__", type(callback).__name__)
+        started = time.perf_counter()
+        try:
+            return await callback(update, context)
+        except Exception:
+            HANDLER_ERRORS.labels(name).inc()
+            raise
+        finally:
+            elapsed = time.perf_counter() - started
+            HANDLER_DURATION.labels(name).observe(elapsed)
+            logger.debug(
+                "Handled update %s",
+                update.update_id,
+                sample=self.log_sample_rate,
+                handler=name,
+                chat=update.effective_chat.id if update.effective_chat else None,
+                latency_ms=round(elapsed * 1000, 1)
+            )
@@ -0,0 +1,23 @@
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+ABOVE = "above"
+BELOW = "below"
+
+@dataclass
+class Alert:
+    """A price threshold a user wants to be notified about"""
+    id: str
+    user_id: str
+    chat_id: int
+    symbol: str
+    direction: str  # ABOVE or BELOW
+    threshold: float
+    repeat: bool = False
+    cooldown: float = 0.0  # seconds between repeated notifications
+    created_at: float = field(default_factory=time.time)
+    last_triggered: Optional[float] = None
+
+    def cooling_down(self, now: float) -> bool:
+        return self.last_triggered is not None and now - self.last_triggered < self.cooldown
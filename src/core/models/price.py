@@ -0,0 +1,20 @@
+import time
+from dataclasses import dataclass
+
+@dataclass(frozen=True)
+class PriceQuote:
+    """A USD price observation for one asset"""
+    __slots__ = ("symbol", "value", "updated_at", "source", "stale_after")
+    symbol: str
+    value: float
+    updated_at: float  # unix timestamp
+    source: str
+    stale_after: float
+
+    @property
+    def age(self) -> float:
+        return max(0.0, time.time() - self.updated_at)
+
+    @property
+    def is_stale(self) -> bool:
+        return self.age > self.stale_after
@@ -0,0 +1,129 @@
+import re
+import time
+import base64
+import binascii
+from dataclasses import dataclass, field
+from typing import List, Optional, Dict, Any, Iterable, Tuple
+
+NANO = 10 ** 9
+
+# Friendly (EQ/UQ/kQ/0Q, 48 chars) or raw (workchain:hex) TON address
+ADDRESS_PATTERN = re.compile(r'^([EUk0]Q[A-Za-z0-9_-]{46}|-?\d+:[0-9a-fA-F]{64})$')
+
+def to_raw_address(address: str) -> str:
+    """Normalize a friendly or raw address to ``workchain:hex`` form"""
+    if ':' in address:
+        workchain, account = address.split(':', 1)
+        return f"{int(workchain)}:{account.lower()}"
+    try:
+        data = base64.urlsafe_b64decode(address.replace('+', '-').replace('/', '_'))
+    except (binascii.Error, ValueError):
+        raise ValueError(f"Invalid TON address: {address}")
+    if len(data) != 36:
+        raise ValueError(f"Invalid TON address: {address}")
+    workchain = int.from_bytes(data[1:2], 'big', signed=True)
+    return f"{workchain}:{data[2:34].hex()}"
+
+@dataclass
+class JettonBalance:
+    symbol: str
+    name: str
+    address: str
+    amount: float
+    price_usd: Optional[float] = None
+
+    @property
+    def value_usd(self) -> Optional[float]:
+        return self.amount * self.price_usd if self.price_usd is not None else None
+
+@dataclass
+class WalletSnapshot:
+    """Public wallet data assembled from one round of tonapi calls"""
+    address: str
+    found: bool = True
+    status: Optional[str] = None
+    ton_balance: Optional[float] = None
+    jettons: Optional[List[JettonBalance]] = None
+    missing: List[str] = field(default_factory=list)
+    fetched_at: float = field(default_factory=time.time)
+
+    @property
+    def partial(self) -> bool:
+        """Some parts timed out or failed and are absent"""
+        return bool(self.missing)
+
+    @property
+    def age(self) -> float:
+        return max(0.0, time.time() - self.fetched_at)
+
+    @staticmethod
+    def parse_ton_balance(account: Dict[str, Any]) -> float:
+        return int(account.get('balance', 0)) / NANO
+
+    @staticmethod
+    def parse_jettons(data: Dict[str, Any]) -> List[JettonBalance]:
+        """Parse a tonapi ``/accounts/{id}/jettons`` response"""
+        balances = []
+        for item in data.get('balances', []):
+            jetton = item.get('jetton', {})
+            decimals = int(jetton.get('decimals', 9))
+            price = item.get('price', {}).get('prices', {}).get('USD')
+            balances.append(JettonBalance(
+                symbol=jetton.get('symbol', '').upper(),
+                name=jetton.get('name', ''),
+                address=jetton.get('address', ''),
+                amount=int(item.get('balance', 0)) / 10 ** decimals,
+                price_usd=float(price) if price is not None else None
+            ))
+        return balances
+
+@dataclass
+class JettonTotal:
+    symbol: str
+    amount: float
+    value_usd: Optional[float]
+    holders: int
+
+@dataclass
+class Portfolio:
+    """Aggregated balances across several wallets"""
+    wallets: List[WalletSnapshot]
+    total_ton: float = 0.0
+    jettons: List[JettonTotal] = field(default_factory=list)
+
+    @property
+    def not_found(self) -> List[str]:
+        return [wallet.address for wallet in self.wallets if not wallet.found]
+
+    @property
+    def partial(self) -> List[str]:
+        return [wallet.address for wallet in self.wallets if wallet.found and wallet.partial]
+
+    @classmethod
+    def aggregate(cls, wallets: Iterable[WalletSnapshot]) -> "Portfolio":
+        """Sum TON and jetton balances in a single pass over all wallets"""
+        wallets = list(wallets)
+        total_ton = 0.0
+        # jetton key -> [symbol, amount, value, priced, holders]
+        totals: Dict[Tuple[str, str], list] = {}
+        for wallet in wallets:
+            if wallet.ton_balance:
+                total_ton += wallet.ton_balance
+            for jetton in wallet.jettons or ():
+                key = (jetton.address or jetton.symbol, jetton.symbol)
+                entry = totals.get(key)
+                if entry is None:
+                    entry = totals[key] = [jetton.symbol, 0.0, 0.0, True, 0]
+                entry[1] += jetton.amount
+                entry[4] += 1
+                if jetton.price_usd is None:
+                    entry[3] = False
+                else:
+                    entry[2] += jetton.amount * jetton.price_usd
+
+        jettons = [
+            JettonTotal(symbol, amount, value if priced else None, holders)
+            for symbol, amount, value, priced, holders in totals.values()
+        ]
+        jettons.sort(key=lambda total: (total.value_usd or 0.0, total.amount), reverse=True)
+        return cls(wallets=wallets, total_ton=total_ton, jettons=jettons)
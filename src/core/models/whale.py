@@ -0,0 +1,56 @@
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from .wallet import to_raw_address
+
+@dataclass
+class WhaleTransfer:
+    """A large jetton transfer decoded from a tonapi event"""
+    event_id: str
+    action_index: int
+    symbol: str
+    amount: float
+    sender: Optional[str]
+    recipient: Optional[str]
+    timestamp: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.event_id}:{self.action_index}"
+
+    @staticmethod
+    def parse(event: Dict[str, Any], jetton: str, min_amount: float) -> List["WhaleTransfer"]:
+        """Extract transfers of ``jetton`` of at least ``min_amount`` from a tonapi event"""
+        jetton = to_raw_address(jetton)
+        transfers = []
+        for index, action in enumerate(event.get("actions", ())):
+            if action.get("type") != "JettonTransfer" or action.get("status", "ok") != "ok":
+                continue
+            details = action.get("JettonTransfer", {})
+            info = details.get("jetton", {})
+            try:
+                if to_raw_address(info.get("address", "")) != jetton:
+                    continue
+            except ValueError:
+                continue
+            amount = int(details.get("amount", 0)) / 10 ** int(info.get("decimals", 9))
+            if amount < min_amount:
+                continue
+            transfers.append(WhaleTransfer(
+                event_id=event.get("event_id", ""),
+                action_index=index,
+                symbol=info.get("symbol", "").upper(),
+                amount=amount,
+                sender=(details.get("sender") or {}).get("address"),
+                recipient=(details.get("recipient") or {}).get("address"),
+                timestamp=float(event.get("timestamp", time.time()))
+            ))
+        return transfers
+
+@dataclass
+class WhaleSubscription:
+    """A chat that receives whale transfer notifications"""
+    id: str
+    chat_id: int
+    min_amount: float
+    created_at: float = field(default_factory=time.time)
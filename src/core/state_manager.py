@@ -1,49 +1,187 @@
-from dataclasses import dataclass
-from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+import asyncio
+import itertools
+import time
+from collections import deque
+from typing import Deque, Dict, Any, List, Optional, Tuple
+from ..utils.logging import logger
 
-@dataclass
 class ConversationState:
     """Represents the state of a conversation"""
-    state: str
-    data: Dict[str, Any]
-    started_at: datetime
-    expires_at: datetime
+    __slots__ = ("state", "_data", "started_at", "expires_at", "version")
+
+    def __init__(
+        self,
+        state: str,
+        data: Optional[Dict[str, Any]],
+        started_at: float,
+        expires_at: float,
+        version: int = 0
+    ):
+        self.state = state
+        # Most states carry no data; the dict is only created when needed
+        self._data = data or None
+        self.started_at = started_at  # clock of the backend that stored it
+        self.expires_at = expires_at
+        # Changes on every write, for compare-and-set
+        self.version = version
+
+    @property
+    def data(self) -> Dict[str, Any]:
+        if self._data is None:
+            self._data = {}
+        return self._data
 
 class StateManager:
-    def __init__(self, expiry_minutes: int = 30):
+    """
+    Per-user conversation states with a background reaper
+
+    Expiry is tracked by a timing wheel: slots ``resolution`` seconds wide,
+    each listing the users whose state expires within it. Since every state
+    lives exactly ``expiry_minutes``, slots fill in time order and the wheel
+    is a deque; the reaper pops whole slots once they have passed and never
+    looks at live states. Setting a state again leaves a stale entry in its
+    old slot, which is skipped when that slot is reaped. At most
+    ``max_states`` are kept, evicting the ones closest to expiry. Timestamps
+    come from the monotonic clock, so wall-clock jumps neither expire nor
+    extend conversations.
+    """
+
+    def __init__(
+        self,
+        expiry_minutes: int = 30,
+        max_states: int = 100_000,
+        reap_interval: float = 60,
+        resolution: float = 10
+    ):
         self.states: Dict[str, ConversationState] = {}
         self.expiry_minutes = expiry_minutes
-        
-    def set_state(self, user_id: str, state: str, data: Dict[str, Any] = None) -> None:
-        """Set state for a user"""
-        now = datetime.now()
-        self.states[user_id] = ConversationState(
-            state=state,
-            data=data or {},
-            started_at=now,
-            expires_at=now + timedelta(minutes=self.expiry_minutes)
-        )
-        
+        self.max_states = max_states
+        self.reap_interval = reap_interval
+        self.resolution = resolution
+        self._wheel: Deque[Tuple[int, List[str]]] = deque()
+        # Never reused, so a version read before expiry can't match a newer state
+        self._versions = itertools.count(1)
+        self.expired = 0
+        self.evicted = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def _slot(self, expires_at: float) -> int:
+        return int(expires_at // self.resolution)
+
+    def set_state(self, user_id: str, state: str, data: Dict[str, Any] = None) -> int:
+        """Set state for a user; returns its new version"""
+        now = time.monotonic()
+        expires_at = now + self.expiry_minutes * 60
+        if user_id not in self.states and len(self.states) >= self.max_states:
+            self._evict()
+        version = next(self._versions)
+        self.states[user_id] = ConversationState(state, data, now, expires_at, version)
+
+        slot = self._slot(expires_at)
+        if self._wheel and self._wheel[-1][0] == slot:
+            self._wheel[-1][1].append(user_id)
+        else:
+            self._wheel.append((slot, [user_id]))
+        return version
+
+    def compare_and_set(
+        self,
+        user_id: str,
+        expected_version: int,
+        state: str,
+        data: Dict[str, Any] = None
+    ) -> Optional[int]:
+        """Set state only if its version is still ``expected_version`` (0: no live state)"""
+        current = self.get_state(user_id)
+        if (current.version if current else 0) != expected_version:
+            return None
+        return self.set_state(user_id, state, data)
+
     def get_state(self, user_id: str) -> Optional[ConversationState]:
         """Get current state for a user"""
         state = self.states.get(user_id)
         if not state:
             return None
-            
+
         # Check expiry
-        if datetime.now() > state.expires_at:
+        if time.monotonic() >= state.expires_at:
             self.clear_state(user_id)
+            self.expired += 1
             return None
-            
+
         return state
-        
+
     def clear_state(self, user_id: str) -> None:
         """Clear state for a user"""
-        if user_id in self.states:
-            del self.states[user_id]
-            
+        self.states.pop(user_id, None)
+
     def update_data(self, user_id: str, data: Dict[str, Any]) -> None:
         """Update state data for a user"""
         if state := self.get_state(user_id):
-            state.data.update(data) 
\ No newline at end of file
+            state.data.update(data)
+            state.version = next(self._versions)
+
+    def _owns(self, user_id: str, slot: int) -> bool:
+        """Whether the user's current state is the one filed under ``slot``"""
+        state = self.states.get(user_id)
+        return state is not None and self._slot(state.expires_at) == slot
+
+    def _evict(self) -> None:
+        """Drop one state from the earliest slot"""
+        while self._wheel:
+            slot, user_ids = self._wheel[0]
+            while user_ids:
+                user_id = user_ids.pop()
+                if self._owns(user_id, slot):
+                    del self.states[user_id]
+                    self.evicted += 1
+                    return
+            self._wheel.popleft()
+
+    def reap(self) -> int:
+        """Drop the states of every slot that has fully passed"""
+        current = self._slot(time.monotonic())
+        removed = 0
+        while self._wheel and self._wheel[0][0] < current:
+            slot, user_ids = self._wheel.popleft()
+            for user_id in user_ids:
+                if self._owns(user_id, slot):
+                    del self.states[user_id]
+                    removed += 1
+        self.expired += removed
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "states": len(self.states),
+            "max_states": self.max_states,
+            "wheel_slots": len(self._wheel),
+            "expired": self.expired,
+            "evicted": self.evicted
+        }
+
+    async def start(self) -> None:
+        """Start background reaping"""
+        if not self._task:
+            self._task = asyncio.create_task(self._reap_loop())
+
+    async def stop(self) -> None:
+        """Stop background reaping"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _reap_loop(self) -> None:
+        """Periodically drop expired states"""
+        while True:
+            await asyncio.sleep(self.reap_interval)
+            try:
+                removed = self.reap()
+                if removed:
+                    logger.debug("Reaped %d expired conversation states", removed)
+            except Exception as e:
+                logger.error("Error reaping conversation states: %s", e)
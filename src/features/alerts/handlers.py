@@ -0,0 +1,126 @@
+from typing import List, Optional, Tuple
+from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
+from telegram.ext import CallbackContext
+from ...core.commands.router import callback_data
+from ...core.models.alert import Alert, ABOVE, BELOW
+from ...services.alert_service import AlertService
+from ...services.notification_service import NotificationDispatcher
+from ...utils.errors import ValidationError
+from ...utils.middleware import error_handler
+from ...utils.rendering import Screen, ScreenCache
+
+USAGE = (
+    "🔔 *Price alerts*\n\n"
+    "`/alert BOLT 0.02` — notify once when BOLT crosses $0.02\n"
+    "`/alert TON >3 repeat` — notify every time TON rises above $3\n"
+    "`/alerts [page]` — list your alerts\n"
+    "`/unalert <id>` — delete an alert"
+)
+
+ALERTS_PER_PAGE = 10
+
+class AlertHandlers:
+    def __init__(self, alert_service: AlertService, notifications: NotificationDispatcher, screens: ScreenCache):
+        self.alert_service = alert_service
+        self.notifications = notifications
+        self.screens = screens
+
+    @staticmethod
+    def parse_threshold(text: str) -> Tuple[float, Optional[str]]:
+        """Parse ``0.02``, ``>0.02`` or ``<0.02`` into a price and direction"""
+        direction = None
+        if text[:1] in "><":
+            direction = ABOVE if text[0] == ">" else BELOW
+            text = text[1:]
+        try:
+            return float(text.replace(",", ".")), direction
+        except ValueError:
+            raise ValidationError(f"Invalid price {text!r}", "❌ Invalid price.")
+
+    @error_handler
+    async def handle_alert_command(self, update: Update, context: CallbackContext) -> None:
+        """Create an alert: /alert SYMBOL [>|<]PRICE [repeat]"""
+        args = context.args or []
+        if len(args) < 2:
+            await update.message.reply_text(USAGE, parse_mode='Markdown')
+            return
+
+        try:
+            threshold, direction = self.parse_threshold(args[1])
+            alert = await self.alert_service.create_alert(
+                user_id=str(update.effective_user.id),
+                chat_id=update.effective_chat.id,
+                symbol=args[0],
+                threshold=threshold,
+                direction=direction,
+                repeat=len(args) > 2 and args[2].lower() == "repeat"
+            )
+        except ValidationError as e:
+            await update.message.reply_text(e.user_message)
+            return
+
+        await update.message.reply_text(
+            f"✅ Alert `{alert.id}` set: {self.describe(alert)}",
+            parse_mode='Markdown'
+        )
+
+    @error_handler
+    async def handle_list_command(self, update: Update, context: CallbackContext) -> None:
+        """List the user's alerts, a page at a time; also serves the alerts:<page> buttons"""
+        alerts = self.alert_service.list_alerts(str(update.effective_user.id))
+        query = update.callback_query
+        if query:
+            await query.answer()
+        if not alerts:
+            if query:
+                await self.screens.edit(query, Screen(USAGE))
+            else:
+                await update.message.reply_text(USAGE, parse_mode='Markdown')
+            return
+
+        args = context.args or []
+        page = int(args[0]) - 1 if args and args[0].isdigit() else 0
+        text, markup = self.render_page(alerts, page)
+        if query:
+            await self.screens.edit(query, Screen(text, markup))
+        else:
+            await update.message.reply_text(text, reply_markup=markup, parse_mode='Markdown')
+
+    def render_page(self, alerts: List[Alert], page: int) -> Tuple[str, Optional[InlineKeyboardMarkup]]:
+        """Text and navigation buttons for one page of alerts (0-based)"""
+        pages = (len(alerts) + ALERTS_PER_PAGE - 1) // ALERTS_PER_PAGE
+        page = min(max(page, 0), pages - 1)
+        start = page * ALERTS_PER_PAGE
+        lines = ["🔔 *Your alerts*" + (f" ({page + 1}/{pages})" if pages > 1 else "") + "\n"]
+        lines.extend(f"`{alert.id}` {self.describe(alert)}" for alert in alerts[start:start + ALERTS_PER_PAGE])
+
+        buttons = []
+        if page > 0:
+            buttons.append(InlineKeyboardButton("⬅️", callback_data=callback_data("alerts", page)))
+        if page < pages - 1:
+            buttons.append(InlineKeyboardButton("➡️", callback_data=callback_data("alerts", page + 2)))
+        return "\n".join(lines), InlineKeyboardMarkup([buttons]) if buttons else None
+
+    @error_handler
+    async def handle_delete_command(self, update: Update, context: CallbackContext) -> None:
+        """Delete an alert by id"""
+        if not context.args:
+            await update.message.reply_text("Usage: `/unalert <id>`", parse_mode='Markdown')
+            return
+        deleted = await self.alert_service.delete_alert(str(update.effective_user.id), context.args[0])
+        await update.message.reply_text("🗑 Alert deleted." if deleted else "❌ Alert not found.")
+
+    async def send_alert(self, alert: Alert, price: float) -> None:
+        """Alert listener: notify the chat that set the alert"""
+        arrow = "📈" if alert.direction == ABOVE else "📉"
+        self.notifications.notify(
+            alert.chat_id,
+            f"{arrow} *{alert.symbol}* is {alert.direction} ${alert.threshold:g}: now ${price:.6g}"
+        )
+
+    @staticmethod
+    def describe(alert: Alert) -> str:
+        text = f"{alert.symbol} {alert.direction} ${alert.threshold:g}"
+        if alert.repeat:
+            text += f" (repeats, every {int(alert.cooldown // 60)} min at most)"
+        return text
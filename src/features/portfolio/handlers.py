@@ -0,0 +1,97 @@
+import re
+import time
+from typing import List
+from telegram import Update
+from telegram.ext import CallbackContext
+from ...app.config import get_settings
+from ...core.models.wallet import ADDRESS_PATTERN, Portfolio, to_raw_address
+from ...services.price_service import PriceService
+from ...services.wallet_service import WalletService
+from ...utils.middleware import error_handler
+
+class PortfolioHandlers:
+    PROGRESS_INTERVAL = 1.0  # seconds between progress edits
+    MAX_JETTON_LINES = 25
+    
+    def __init__(self, wallet_service: WalletService, price_service: PriceService):
+        self.wallet_service = wallet_service
+        self.price_service = price_service
+        self.settings = get_settings()
+        
+    @staticmethod
+    def parse_addresses(text: str) -> List[str]:
+        """Extract unique valid addresses, keeping their original order"""
+        addresses, seen = [], set()
+        for token in re.split(r'[\s,;]+', text):
+            if not ADDRESS_PATTERN.match(token):
+                continue
+            raw = to_raw_address(token)
+            if raw not in seen:
+                seen.add(raw)
+                addresses.append(token)
+        return addresses
+        
+    @error_handler
+    async def handle_portfolio_command(self, update: Update, context: CallbackContext) -> None:
+        """Aggregate TON and jetton balances across the given addresses"""
+        addresses = self.parse_addresses(update.message.text)
+        limit = self.settings.PORTFOLIO_MAX_ADDRESSES
+        
+        if not addresses:
+            await update.message.reply_text(
+                "📊 *Portfolio*\n\n"
+                f"Send up to {limit} TON addresses after the command:\n"
+                "`!портфель EQ... EQ...`",
+                parse_mode='Markdown'
+            )
+            return
+        if len(addresses) > limit:
+            await update.message.reply_text(f"❌ Too many addresses: the limit is {limit}.")
+            return
+            
+        total = len(addresses)
+        progress = await update.message.reply_text(f"⏳ Fetching portfolio: 0/{total} wallets...")
+        
+        snapshots = []
+        last_edit = time.monotonic()
+        async for snapshot in self.wallet_service.stream_snapshots(addresses):
+            snapshots.append(snapshot)
+            now = time.monotonic()
+            if len(snapshots) < total and now - last_edit >= self.PROGRESS_INTERVAL:
+                await progress.edit_text(f"⏳ Fetching portfolio: {len(snapshots)}/{total} wallets...")
+                last_edit = now
+                
+        await progress.edit_text(
+            self.render_portfolio(Portfolio.aggregate(snapshots)),
+            parse_mode='Markdown',
+            disable_web_page_preview=True
+        )
+        
+    def render_portfolio(self, portfolio: Portfolio) -> str:
+        """Build the aggregated portfolio message"""
+        ton_price = self.price_service.get_price('TON')
+        ton_value = portfolio.total_ton * ton_price if ton_price else 0
+        found = len(portfolio.wallets) - len(portfolio.not_found)
+        
+        lines = [
+            f"*📊 Portfolio of {found} wallets*\n",
+            f"💎 *{portfolio.total_ton:,.2f} TON* (${ton_value:,.2f})\n"
+        ]
+        
+        if portfolio.jettons:
+            lines.append("*Jetton Balances:*")
+            for jetton in portfolio.jettons[:self.MAX_JETTON_LINES]:
+                value = f" (${jetton.value_usd:,.2f})" if jetton.value_usd is not None else ""
+                lines.append(f"• {jetton.symbol or '?'}: *{jetton.amount:,.2f}*{value}")
+            hidden = len(portfolio.jettons) - self.MAX_JETTON_LINES
+            if hidden > 0:
+                lines.append(f"_…and {hidden} more_")
+                
+        jetton_value = sum(j.value_usd for j in portfolio.jettons if j.value_usd is not None)
+        lines.append(f"\n💰 *Total value:* ${ton_value + jetton_value:,.2f}")
+        
+        if portfolio.not_found:
+            lines.append(f"\n⚠️ {len(portfolio.not_found)} addresses not found")
+        if portfolio.partial:
+            lines.append(f"⚠️ Jettons unavailable for {len(portfolio.partial)} wallets")
+        return "\n".join(lines)
@@ -1,56 +1,83 @@
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import CallbackContext
+from typing import Hashable, Optional
+from ...core.models.price import PriceQuote
 from ...services.price_service import PriceService
+from ...utils.rendering import Screen, ScreenCache
+
+SYMBOLS = {
+    "!болт": ("🔩 BOLT", "BOLT", "https://dedust.io/swap/TON/BOLT"),
+    "!тон": ("💎 TON", "TON", "https://dedust.io/swap/USDT/TON")
+}
 
 class PriceHandlers:
-    def __init__(self, price_service: PriceService):
+    def __init__(self, price_service: PriceService, screens: ScreenCache):
         self.price_service = price_service
+        self.screens = screens
+        
+    def _screen_key(self, *symbols: str) -> Hashable:
+        """Cache key of a price screen: the price version plus the minutes shown by stale warnings"""
+        quotes = [self.price_service.get_quote(symbol) for symbol in symbols]
+        stale = tuple(int(q.age // 60) if q and q.is_stale else None for q in quotes)
+        return self.price_service.version, stale
         
     async def handle_price_menu(self, update: Update, context: CallbackContext) -> None:
         """Display price menu"""
         query = update.callback_query
         await query.answer()
+        screen = self.screens.get("price_menu", self._screen_key('TON', 'BOLT'), self.render_price_menu)
+        await self.screens.edit(query, screen)
         
+    def render_price_menu(self) -> Screen:
         message = "*💰 Current Token Prices*\n\n"
         
         # Get prices
-        ton_price = self.price_service.get_price('TON')
-        bolt_price = self.price_service.get_price('BOLT')
+        ton_quote = self.price_service.get_quote('TON')
+        bolt_quote = self.price_service.get_quote('BOLT')
         
-        if ton_price:
-            message += f"💎 *TON*: ${ton_price:.3f}\n"
-        if bolt_price:
-            message += f"🔩 *BOLT*: ${bolt_price:.6f}\n"
+        if ton_quote:
+            message += f"💎 *TON*: ${ton_quote.value:.3f}{self._change('TON')}{self._staleness(ton_quote)}\n"
+        if bolt_quote:
+            message += f"🔩 *BOLT*: ${bolt_quote.value:.6f}{self._change('BOLT')}{self._staleness(bolt_quote)}\n"
             
         keyboard = [[
             InlineKeyboardButton("⬅️ Back to Menu", callback_data="main_menu")
         ]]
-        
-        await query.message.edit_text(
-            message,
-            reply_markup=InlineKeyboardMarkup(keyboard),
-            parse_mode='Markdown'
-        )
+        return Screen(message, InlineKeyboardMarkup(keyboard))
         
     async def handle_price_command(self, update: Update, context: CallbackContext) -> None:
         """Handle !price commands"""
-        command = update.message.text.lower()
-        message = ""
-        trade_url = ""
-        
-        if command == "!болт":
-            price = self.price_service.get_price('BOLT')
-            message = f"🔩 BOLT: *${price:.4f}*"
-            trade_url = "https://dedust.io/swap/TON/BOLT"
-        elif command == "!тон":
-            price = self.price_service.get_price('TON')
-            message = f"💎 TON: *${price:.4f}*"
-            trade_url = "https://dedust.io/swap/USDT/TON"
+        command = update.message.text.split()[0].lower()
+        if command not in SYMBOLS:
+            return
+        label, symbol, trade_url = SYMBOLS[command]
+        
+        screen = self.screens.get(
+            f"price:{symbol}",
+            self._screen_key(symbol),
+            lambda: Screen(
+                self._format_quote(label, self.price_service.get_quote(symbol)),
+                InlineKeyboardMarkup([[InlineKeyboardButton("💱 TRADE", url=trade_url)]])
+            )
+        )
+        await update.message.reply_text(screen.text, **screen.options())
             
-        if message:
-            keyboard = [[InlineKeyboardButton("💱 TRADE", url=trade_url)]]
-            await update.message.reply_text(
-                message,
-                reply_markup=InlineKeyboardMarkup(keyboard),
-                parse_mode='Markdown'
-            ) 
\ No newline at end of file
+    def _format_quote(self, label: str, quote: Optional[PriceQuote]) -> str:
+        """Format a price line for the !price commands"""
+        if not quote:
+            return f"{label}: price is not available yet"
+        return f"{label}: *${quote.value:.4f}*{self._change(quote.symbol)}{self._staleness(quote)}"
+        
+    def _change(self, symbol: str) -> str:
+        """24h change suffix, empty until enough history is recorded"""
+        change = self.price_service.get_change(symbol, 24)
+        if change is None:
+            return ""
+        return f" ({change:+.2f}% 24h)"
+        
+    @staticmethod
+    def _staleness(quote: PriceQuote) -> str:
+        """Warn when a price hasn't been refreshed recently"""
+        if not quote.is_stale:
+            return ""
+        return f" ⚠️ _updated {int(quote.age // 60)} min ago_"
@@ -2,53 +2,89 @@ from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import CallbackContext
 from ...services.user_service import UserService
 from ...services.price_service import PriceService
-from ...infrastructure.ton_api.client import TonApiClient
+from ...services.wallet_service import WalletService
+from ...utils.middleware import error_handler
+from ...utils.rendering import Screen, ScreenCache
 
 class TrackingHandlers:
     def __init__(
         self,
         user_service: UserService,
         price_service: PriceService,
-        ton_client: TonApiClient
+        wallet_service: WalletService,
+        screens: ScreenCache
     ):
         self.user_service = user_service
         self.price_service = price_service
-        self.ton_client = ton_client
+        self.wallet_service = wallet_service
+        self.screens = screens
+        screens.register("main_menu", self.render_main_menu())
+        screens.register("wallet_query_menu", self.render_wallet_query_menu())
         
-    async def handle_wallet_query_menu(self, update: Update, context: CallbackContext) -> None:
-        """Display wallet query menu (no tracking, just queries)"""
+    @staticmethod
+    def render_main_menu() -> Screen:
+        """Main menu, shown for /start and the Back to Menu buttons"""
+        keyboard = [
+            [InlineKeyboardButton("💰 Prices", callback_data="price_menu")],
+            [InlineKeyboardButton("🔍 Wallet Info", callback_data="wallet_info")],
+            [InlineKeyboardButton("🌐 Community", callback_data="community_menu")]
+        ]
+        return Screen(
+            "⚡️ *BOLT Bot*\n\n"
+            "Prices, public wallet data and community links for BOLT on TON.",
+            InlineKeyboardMarkup(keyboard)
+        )
+        
+    @error_handler
+    async def handle_main_menu(self, update: Update, context: CallbackContext) -> None:
+        """Display the main menu, for /start or the Back to Menu buttons"""
+        screen = self.screens.static("main_menu")
         query = update.callback_query
-        await query.answer()
+        if query:
+            await query.answer()
+            await self.screens.edit(query, screen)
+        else:
+            await self.screens.reply(update.message, screen)
         
+    @staticmethod
+    def render_wallet_query_menu() -> Screen:
         keyboard = [
             [InlineKeyboardButton("🔍 Query Wallet", callback_data="query_wallet")],
             [InlineKeyboardButton("⬅️ Back to Menu", callback_data="main_menu")]
         ]
-        
-        await query.message.edit_text(
+        return Screen(
             "🔍 *Wallet Query*\n\n"
             "Query wallet information without tracking:",
-            reply_markup=InlineKeyboardMarkup(keyboard),
-            parse_mode='Markdown'
+            InlineKeyboardMarkup(keyboard)
         )
         
+    async def handle_wallet_query_menu(self, update: Update, context: CallbackContext) -> None:
+        """Display wallet query menu (no tracking, just queries)"""
+        query = update.callback_query
+        await query.answer()
+        await self.screens.edit(query, self.screens.static("wallet_query_menu"))
+        
+    @error_handler
     async def handle_wallet_query(self, update: Update, context: CallbackContext) -> None:
         """Handle wallet query (temporary, no storage)"""
         address = update.message.text.strip()
         
         # Validate address exists
-        account_info = await self.ton_client.get_account_info(address)
-        if not account_info:
+        snapshot = await self.wallet_service.get_snapshot(address)
+        if not snapshot.found:
             await update.message.reply_text(
                 "❌ Invalid address or account not found."
             )
             return
             
         # Show wallet info without storing
-        balance = float(account_info.get('balance', 0))
+        balance = (
+            f"{snapshot.ton_balance:.2f} TON"
+            if snapshot.ton_balance is not None else "temporarily unavailable"
+        )
         await update.message.reply_text(
             f"✅ Wallet Query Result:\n"
-            f"💎 Balance: {balance:.2f} TON\n"
+            f"💎 Balance: {balance}\n"
             f"📍 Address: `{address}`\n\n"
             f"*Note: This is a temporary query. No data is stored.*",
             parse_mode='Markdown'
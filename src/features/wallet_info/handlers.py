@@ -1,90 +1,110 @@
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import CallbackContext
+from ...core.models.wallet import WalletSnapshot, ADDRESS_PATTERN
 from ...services.user_service import UserService
 from ...services.price_service import PriceService
-from ...infrastructure.ton_api.client import TonApiClient
+from ...services.wallet_service import WalletService
 from ...utils.logging import logger
+from ...utils.errors import BotError
+from ...utils.rendering import Screen, ScreenCache
 
 class WalletInfoHandlers:
     def __init__(
         self,
         user_service: UserService,
         price_service: PriceService,
-        ton_client: TonApiClient
+        wallet_service: WalletService,
+        screens: ScreenCache
     ):
         self.user_service = user_service
         self.price_service = price_service
-        self.ton_client = ton_client
+        self.wallet_service = wallet_service
+        self.screens = screens
+        screens.register("wallet_info_menu", self.render_wallet_info_menu())
         
-    async def handle_wallet_info_menu(self, update: Update, context: CallbackContext) -> None:
-        """Display wallet info menu (public queries only)"""
-        query = update.callback_query
-        await query.answer()
-        
-        await query.message.edit_text(
+    @staticmethod
+    def render_wallet_info_menu() -> Screen:
+        return Screen(
             "🔍 *Wallet Information*\n\n"
             "Enter a TON wallet address to get public information.\n"
             "*No personal data is stored.*",
-            reply_markup=InlineKeyboardMarkup([[
+            InlineKeyboardMarkup([[
                 InlineKeyboardButton("⬅️ Back to Menu", callback_data="main_menu")
-            ]]),
-            parse_mode='Markdown'
+            ]])
         )
         
+    async def handle_wallet_info_menu(self, update: Update, context: CallbackContext) -> None:
+        """Display wallet info menu (public queries only)"""
+        query = update.callback_query
+        await query.answer()
+        await self.screens.edit(query, self.screens.static("wallet_info_menu"))
+        
+    async def handle_wallet_message(self, update: Update, context: CallbackContext) -> None:
+        """Handle a message consisting of a TON address"""
+        await self.handle_public_wallet_query(update, context, update.message.text.strip())
+        
     async def handle_public_wallet_query(self, update: Update, context: CallbackContext, address: str) -> None:
         """Display public wallet information without storing user data"""
         try:
-            # Get wallet info
-            account_info = await self.ton_client.get_account_info(address)
-            if not account_info:
+            snapshot = await self.wallet_service.get_snapshot(address)
+            if not snapshot.found:
                 raise ValueError("Could not fetch wallet data")
                 
-            # Build message
-            message = "*Public Wallet Information*\n\n"
-            
-            # Add TON balance
-            ton_balance = float(account_info.get('balance', 0))
-            ton_price = self.price_service.get_price('TON')
-            ton_value = ton_balance * ton_price if ton_price else 0
-            message += f"💎 *{ton_balance:.2f} TON* (${ton_value:.2f})\n\n"
-            
-            # Add jettons
-            jettons = await self.ton_client.get_jettons(address)
-            if jettons:
-                message += "*Jetton Balances:*\n"
-                for token in jettons:
-                    balance = float(token.get('balance', 0))
-                    symbol = token.get('symbol', '').upper()
-                    
-                    # Add price info for known tokens
-                    price = self.price_service.get_price(symbol)
-                    if price:
-                        value = balance * price
-                        message += f"• {symbol}: *{balance:.2f}* (${value:.2f})\n"
-                    else:
-                        message += f"• {symbol}: *{balance:.2f}*\n"
-                        
-            # Add wallet address
-            message += f"\n*Wallet Address:*\n`{address}`\n"
-            message += f"[View on Explorer](https://tonviewer.com/{address})\n\n"
-            message += "*Note: This is public blockchain data. No personal information is stored.*"
-            
-            keyboard = [[
-                InlineKeyboardButton("⬅️ Back", callback_data="main_menu")
-            ]]
-            
             await update.message.reply_text(
-                message,
-                reply_markup=InlineKeyboardMarkup(keyboard),
+                self.render_snapshot(snapshot),
+                reply_markup=InlineKeyboardMarkup([[
+                    InlineKeyboardButton("⬅️ Back", callback_data="main_menu")
+                ]]),
                 parse_mode='Markdown',
                 disable_web_page_preview=True
             )
             
         except Exception as e:
-            logger.error(f"Error in wallet query: {e}")
+            logger.error("Error in wallet query: %s", e)
+            reason = f"\n{e.user_message}" if isinstance(e, BotError) else ""
             await update.message.reply_text(
-                "❌ Error fetching wallet information.",
+                f"❌ Error fetching wallet information.{reason}",
                 reply_markup=InlineKeyboardMarkup([[
                     InlineKeyboardButton("⬅️ Back", callback_data="main_menu")
                 ]])
-            ) 
\ No newline at end of file
+            )
+            
+    def render_snapshot(self, snapshot: WalletSnapshot) -> str:
+        """Build the public wallet message"""
+        message = "*Public Wallet Information*\n\n"
+        
+        # Add TON balance
+        if snapshot.ton_balance is not None:
+            ton_price = self.price_service.get_price('TON')
+            ton_value = snapshot.ton_balance * ton_price if ton_price else 0
+            message += f"💎 *{snapshot.ton_balance:.2f} TON* (${ton_value:.2f})\n\n"
+        else:
+            message += "⚠️ _TON balance is temporarily unavailable_\n\n"
+            
+        # Add jettons
+        if snapshot.jettons:
+            message += "*Jetton Balances:*\n"
+            for jetton in snapshot.jettons:
+                value = jetton.value_usd
+                if value is not None:
+                    message += f"• {jetton.symbol}: *{jetton.amount:.2f}* (${value:.2f})\n"
+                else:
+                    message += f"• {jetton.symbol}: *{jetton.amount:.2f}*\n"
+        elif snapshot.jettons is None:
+            message += "⚠️ _Jetton balances are temporarily unavailable_\n"
+            
+        # Add wallet address
+        message += f"\n*Wallet Address:*\n`{snapshot.address}`\n"
+        message += f"[View on Explorer](https://tonviewer.com/{snapshot.address})\n"
+        message += f"🕒 _Updated {self.format_age(snapshot.age)}_\n\n"
+        message += "*Note: This is public blockchain data. No personal information is stored.*"
+        return message
+
+    @staticmethod
+    def format_age(seconds: float) -> str:
+        """Describe how old a snapshot is"""
+        if seconds < 10:
+            return "just now"
+        if seconds < 60:
+            return f"{int(seconds)}s ago"
+        return f"{int(seconds // 60)} min ago"
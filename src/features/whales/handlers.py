@@ -0,0 +1,60 @@
+from typing import List, Optional
+from telegram import Update
+from telegram.ext import CallbackContext
+from ...core.models.whale import WhaleTransfer
+from ...services.whale_service import WhaleService
+from ...services.notification_service import NotificationDispatcher
+from ...utils.middleware import error_handler
+
+class WhaleHandlers:
+    def __init__(self, whale_service: WhaleService, notifications: NotificationDispatcher):
+        self.whale_service = whale_service
+        self.notifications = notifications
+
+    @error_handler
+    async def handle_whales_command(self, update: Update, context: CallbackContext) -> None:
+        """Toggle whale notifications: /whales on [min amount] | off"""
+        args = context.args or []
+        chat_id = update.effective_chat.id
+        action = args[0].lower() if args else ""
+
+        if action == "on":
+            min_amount = self._parse_amount(args[1]) if len(args) > 1 else None
+            subscription = await self.whale_service.subscribe(chat_id, min_amount)
+            await update.message.reply_text(
+                f"🐋 Whale alerts on: transfers of {subscription.min_amount:,.0f}+ will be posted here."
+            )
+        elif action == "off":
+            removed = await self.whale_service.unsubscribe(chat_id)
+            await update.message.reply_text("🐋 Whale alerts off." if removed else "Whale alerts were not enabled.")
+        else:
+            subscription = self.whale_service.subscriptions.get(chat_id)
+            status = f"on, from {subscription.min_amount:,.0f}" if subscription else "off"
+            await update.message.reply_text(
+                f"🐋 *Whale alerts*: {status}\n\n"
+                "`/whales on [min amount]` — post large transfers here\n"
+                "`/whales off` — stop",
+                parse_mode='Markdown'
+            )
+
+    async def send_transfer(self, transfer: WhaleTransfer, chat_ids: List[int]) -> None:
+        """Whale listener: queue the transfer for every subscribed chat"""
+        text = self.format_transfer(transfer)
+        for chat_id in chat_ids:
+            self.notifications.notify(chat_id, text)
+
+    @staticmethod
+    def format_transfer(transfer: WhaleTransfer) -> str:
+        return (
+            f"🐋 *{transfer.amount:,.0f} {transfer.symbol}* moved\n"
+            f"From: `{transfer.sender or 'unknown'}`\n"
+            f"To: `{transfer.recipient or 'unknown'}`\n"
+            f"[View on Tonviewer](https://tonviewer.com/transaction/{transfer.event_id})"
+        )
+
+    @staticmethod
+    def _parse_amount(text: str) -> Optional[float]:
+        try:
+            return float(text.replace(",", "").replace("_", ""))
+        except ValueError:
+            return None
@@ -0,0 +1,247 @@
+import asyncio
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional, Tuple
+from ...utils.logging import logger
+
+
+@dataclass
+class CacheStats:
+    """Counters for a single cache namespace"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    entries: int = 0
+    bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
+class _CacheEntry:
+    __slots__ = ("value", "expires_at", "size")
+
+    def __init__(self, value: Any, expires_at: float, size: int):
+        self.value = value
+        self.expires_at = expires_at
+        self.size = size
+
+
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """Approximate memory footprint of a value in bytes"""
+    size = sys.getsizeof(value)
+    if _depth > 4:
+        return size
+    if isinstance(value, dict):
+        for k, v in value.items():
+            size += estimate_size(k, _depth + 1) + estimate_size(v, _depth + 1)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size(item, _depth + 1)
+    elif hasattr(value, "__dict__"):
+        size += estimate_size(vars(value), _depth + 1)
+    return size
+
+
+class _Namespace:
+    """LRU store with its own TTL and budget"""
+
+    def __init__(self, ttl: float, max_entries: int, max_bytes: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self.bytes = 0
+        self.stats = CacheStats()
+
+    def remove(self, key: str) -> None:
+        entry = self.entries.pop(key)
+        self.bytes -= entry.size
+
+    def evict_overflow(self) -> None:
+        while self.entries and (
+            len(self.entries) > self.max_entries or self.bytes > self.max_bytes
+        ):
+            _, entry = self.entries.popitem(last=False)
+            self.bytes -= entry.size
+            self.stats.evictions += 1
+
+
+class MemoryCache:
+    """
+    Bounded in-memory cache with per-namespace TTLs and LRU eviction
+
+    Every namespace keeps its own LRU ordering and budget (entry count and
+    approximate bytes), so a burst of wallet lookups can't push price data
+    out. Expired entries are dropped lazily on read and by a periodic sweep
+    that inspects at most ``sweep_batch`` entries per namespace.
+    """
+
+    DEFAULT_NAMESPACE = "default"
+
+    def __init__(
+        self,
+        default_ttl: float = 300,
+        namespace_ttls: Optional[Dict[str, float]] = None,
+        max_entries: int = 10_000,
+        max_bytes: int = 16 * 1024 * 1024,
+        sweep_interval: float = 30,
+        sweep_batch: int = 1000
+    ):
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.sweep_interval = sweep_interval
+        self.sweep_batch = sweep_batch
+        self._namespaces: Dict[str, _Namespace] = {}
+        self._task: Optional[asyncio.Task] = None
+        for name, ttl in (namespace_ttls or {}).items():
+            self.configure_namespace(name, ttl=ttl)
+
+    def configure_namespace(
+        self,
+        name: str,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None
+    ) -> None:
+        """Create or reconfigure a namespace budget"""
+        namespace = self._namespaces.get(name)
+        if namespace is None:
+            namespace = _Namespace(self.default_ttl, self.max_entries, self.max_bytes)
+            self._namespaces[name] = namespace
+        if ttl is not None:
+            namespace.ttl = ttl
+        if max_entries is not None:
+            namespace.max_entries = max_entries
+        if max_bytes is not None:
+            namespace.max_bytes = max_bytes
+        namespace.evict_overflow()
+
+    def _namespace(self, name: str) -> _Namespace:
+        namespace = self._namespaces.get(name)
+        if namespace is None:
+            self.configure_namespace(name)
+            namespace = self._namespaces[name]
+        return namespace
+
+    def get(self, key: str, namespace: str = DEFAULT_NAMESPACE, default: Any = None) -> Any:
+        """Get a cached value, or default if missing or expired"""
+        ns = self._namespace(namespace)
+        entry = ns.entries.get(key)
+        if entry is None:
+            ns.stats.misses += 1
+            return default
+        if entry.expires_at <= time.monotonic():
+            ns.remove(key)
+            ns.stats.expirations += 1
+            ns.stats.misses += 1
+            return default
+        ns.entries.move_to_end(key)
+        ns.stats.hits += 1
+        return entry.value
+
+    def contains(self, key: str, namespace: str = DEFAULT_NAMESPACE) -> bool:
+        """Check for a live entry without touching LRU order or counters"""
+        entry = self._namespace(namespace).entries.get(key)
+        return entry is not None and entry.expires_at > time.monotonic()
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        namespace: str = DEFAULT_NAMESPACE,
+        ttl: Optional[float] = None
+    ) -> bool:
+        """Store a value; returns False if it exceeds the namespace byte budget"""
+        ns = self._namespace(namespace)
+        size = estimate_size(value)
+        if key in ns.entries:
+            ns.remove(key)
+        if size > ns.max_bytes:
+            return False
+        expires_at = time.monotonic() + (ns.ttl if ttl is None else ttl)
+        ns.entries[key] = _CacheEntry(value, expires_at, size)
+        ns.bytes += size
+        ns.evict_overflow()
+        return True
+
+    def delete(self, key: str, namespace: str = DEFAULT_NAMESPACE) -> bool:
+        """Remove a value from the cache"""
+        ns = self._namespace(namespace)
+        if key in ns.entries:
+            ns.remove(key)
+            return True
+        return False
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Drop all entries in one namespace, or everywhere"""
+        targets = [self._namespace(namespace)] if namespace else self._namespaces.values()
+        for ns in targets:
+            ns.entries.clear()
+            ns.bytes = 0
+
+    def sweep(self) -> int:
+        """Remove expired entries, inspecting a bounded batch per namespace"""
+        now = time.monotonic()
+        removed = 0
+        for ns in self._namespaces.values():
+            expired = []
+            for index, (key, entry) in enumerate(ns.entries.items()):
+                if index >= self.sweep_batch:
+                    break
+                if entry.expires_at <= now:
+                    expired.append(key)
+            for key in expired:
+                ns.remove(key)
+            ns.stats.expirations += len(expired)
+            removed += len(expired)
+        return removed
+
+    def stats(self) -> Dict[str, CacheStats]:
+        """Snapshot of per-namespace counters"""
+        result = {}
+        for name, ns in self._namespaces.items():
+            ns.stats.entries = len(ns.entries)
+            ns.stats.bytes = ns.bytes
+            result[name] = replace(ns.stats)
+        return result
+
+    def totals(self) -> Tuple[int, int]:
+        """Total entry count and approximate bytes across namespaces"""
+        entries = sum(len(ns.entries) for ns in self._namespaces.values())
+        size = sum(ns.bytes for ns in self._namespaces.values())
+        return entries, size
+
+    async def start(self):
+        """Start background sweeping"""
+        if not self._task:
+            self._task = asyncio.create_task(self._sweep_loop())
+
+    async def stop(self):
+        """Stop background sweeping"""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _sweep_loop(self):
+        """Periodically drop expired entries"""
+        while True:
+            try:
+                await asyncio.sleep(self.sweep_interval)
+                removed = self.sweep()
+                if removed:
+                    logger.debug("Cache sweep removed %d expired entries", removed)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error("Cache sweep failed: %s", e)
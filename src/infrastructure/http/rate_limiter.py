@@ -0,0 +1,197 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Dict, Optional, List, Any
+from ...app.config import get_settings
+from ...utils.errors import RateLimitError
+
+
+class Priority(IntEnum):
+    """Scheduling class of an outbound request; lower is served first"""
+    INTERACTIVE = 0
+    BACKGROUND = 10
+
+
+# Callers mark background work with ``background_priority()``; the transport
+# reads this when it asks the limiter for a token.
+request_priority: ContextVar[Priority] = ContextVar("request_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def background_priority():
+    """Run the enclosed requests at background priority"""
+    token = request_priority.set(Priority.BACKGROUND)
+    try:
+        yield
+    finally:
+        request_priority.reset(token)
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at ``rate`` tokens per second"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        self._refill()
+        if self.tokens >= tokens:
+            self.tokens -= tokens
+            return True
+        return False
+
+    def time_until_available(self, tokens: float = 1) -> float:
+        self._refill()
+        if self.tokens >= tokens:
+            return 0.0
+        return (tokens - self.tokens) / self.rate
+
+    def penalize(self, seconds: float) -> None:
+        """Drain the bucket so nothing is granted for roughly ``seconds``"""
+        self._refill()
+        self.tokens = min(self.tokens, 0) - seconds * self.rate
+
+
+@dataclass
+class QueueStats:
+    """Wait-time counters for one priority class"""
+    granted: int = 0
+    timeouts: int = 0
+    queued: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+    @property
+    def avg_wait(self) -> float:
+        return self.total_wait / self.granted if self.granted else 0.0
+
+
+class RateLimiter:
+    """
+    Token-bucket scheduler for one upstream
+
+    Requests take a token straight away when the bucket has one and nobody
+    is queued. Otherwise they wait in a priority queue (interactive before
+    background, FIFO within a class) that is drained as tokens refill. Each
+    waiter has a queue deadline after which it gives up with
+    ``RateLimitError`` instead of holding a coroutine indefinitely.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rate: float,
+        burst: float,
+        max_wait: Optional[Dict[Priority, float]] = None
+    ):
+        self.name = name
+        self.bucket = TokenBucket(rate, burst)
+        self.max_wait = max_wait or {Priority.INTERACTIVE: 5.0, Priority.BACKGROUND: 30.0}
+        self._queue: List[list] = []
+        self._counter = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._stats: Dict[Priority, QueueStats] = {priority: QueueStats() for priority in Priority}
+
+    @classmethod
+    def from_settings(cls, name: str, rate: float, burst: float) -> "RateLimiter":
+        settings = get_settings()
+        return cls(name, rate, burst, max_wait={
+            Priority.INTERACTIVE: settings.INTERACTIVE_QUEUE_TIMEOUT,
+            Priority.BACKGROUND: settings.BACKGROUND_QUEUE_TIMEOUT
+        })
+
+    async def acquire(self, priority: Optional[Priority] = None, timeout: Optional[float] = None) -> float:
+        """Wait for a token; returns the time spent queued"""
+        priority = request_priority.get() if priority is None else priority
+        stats = self._stats[priority]
+        if not self._queue and self.bucket.try_acquire():
+            stats.granted += 1
+            return 0.0
+
+        limit = self.max_wait.get(priority)
+        if timeout is not None:
+            limit = timeout if limit is None else min(limit, timeout)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        enqueued = loop.time()
+        heapq.heappush(self._queue, [priority, next(self._counter), future])
+        stats.queued += 1
+        self._schedule()
+        try:
+            await asyncio.wait_for(future, limit)
+        except asyncio.TimeoutError:
+            stats.timeouts += 1
+            raise RateLimitError(
+                f"{self.name}: waited over {limit:.1f}s for a request slot",
+                get_settings().ERROR_MESSAGES["rate_limited"]
+            )
+        finally:
+            stats.queued -= 1
+
+        waited = loop.time() - enqueued
+        stats.granted += 1
+        stats.total_wait += waited
+        stats.max_wait = max(stats.max_wait, waited)
+        return waited
+
+    def penalize(self, seconds: float) -> None:
+        """Back off after the upstream signalled throttling"""
+        self.bucket.penalize(seconds)
+
+    def _schedule(self) -> None:
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_soon(self._dispatch)
+
+    def _dispatch(self) -> None:
+        """Grant tokens to queued waiters in priority order"""
+        self._timer = None
+        queue = self._queue
+        while queue:
+            future = queue[0][2]
+            if future.done():
+                heapq.heappop(queue)
+                continue
+            if not self.bucket.try_acquire():
+                break
+            heapq.heappop(queue)
+            future.set_result(None)
+
+        if queue:
+            delay = self.bucket.time_until_available()
+            self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(stats.queued for stats in self._stats.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth and wait-time metrics per priority"""
+        return {
+            "name": self.name,
+            "tokens": self.bucket.tokens,
+            "queue_depth": self.queue_depth,
+            "priorities": {
+                priority.name.lower(): {
+                    "queued": stats.queued,
+                    "granted": stats.granted,
+                    "timeouts": stats.timeouts,
+                    "avg_wait": stats.avg_wait,
+                    "max_wait": stats.max_wait
+                }
+                for priority, stats in self._stats.items()
+            }
+        }
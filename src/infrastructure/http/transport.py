@@ -0,0 +1,260 @@
+import asyncio
+import random
+from typing import Optional, Dict, Any
+from urllib.parse import urlsplit
+import aiohttp
+from ...app.config import get_settings
+from ...utils.errors import APIError, CircuitOpenError
+from ...utils.logging import logger
+from ...utils.metrics import registry
+from .circuit_breaker import CircuitBreaker
+from .rate_limiter import RateLimiter
+
+UPSTREAM_DURATION = registry.histogram(
+    "bot_upstream_request_duration_seconds",
+    "Duration of one upstream HTTP attempt, including reading the body",
+    ["upstream"]
+)
+UPSTREAM_REQUESTS = registry.counter(
+    "bot_upstream_requests_total",
+    "Upstream HTTP attempts by response status, or timeout/error/cancelled",
+    ["upstream", "status"]
+)
+
+class HttpTransport:
+    """
+    Shared HTTP transport for upstream API clients
+
+    Wraps one ``aiohttp.ClientSession`` with a tuned connector (per-host
+    limits, keepalive, DNS cache) and gives every call an overall deadline.
+    Idempotent requests are retried on timeouts, connection errors, 429 and
+    5xx with jittered exponential backoff, and each host gets a circuit
+    breaker so a failing upstream is cut off instead of piling up waiters.
+    When a ``RateLimiter`` is attached every attempt waits for a token first,
+    and 429 responses drain the bucket for the advertised Retry-After.
+
+    ``get_json`` returns ``None`` for 404 and raises ``APIError`` for every
+    other failure.
+    """
+
+    RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+    IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+    def __init__(
+        self,
+        base_url: str,
+        headers: Optional[Dict[str, str]] = None,
+        timeout: float = 10,
+        connect_timeout: float = 5,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 10,
+        limit: int = 100,
+        limit_per_host: int = 20,
+        keepalive_timeout: float = 30,
+        dns_cache_ttl: int = 300,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30,
+        rate_limiter: Optional[RateLimiter] = None
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.headers = headers or {}
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.rate_limiter = rate_limiter
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.retries = 0
+
+    @classmethod
+    def from_settings(
+        cls,
+        base_url: str,
+        headers: Optional[Dict[str, str]] = None,
+        rate_limiter: Optional[RateLimiter] = None
+    ) -> "HttpTransport":
+        """Build a transport configured from application settings"""
+        settings = get_settings()
+        return cls(
+            base_url,
+            headers=headers,
+            timeout=settings.REQUEST_TIMEOUT,
+            connect_timeout=settings.CONNECT_TIMEOUT,
+            max_retries=settings.MAX_RETRIES,
+            backoff_base=settings.RETRY_BACKOFF_BASE,
+            backoff_max=settings.RETRY_BACKOFF_MAX,
+            limit=settings.HTTP_POOL_LIMIT,
+            limit_per_host=settings.HTTP_POOL_LIMIT_PER_HOST,
+            keepalive_timeout=settings.HTTP_KEEPALIVE_TIMEOUT,
+            dns_cache_ttl=settings.DNS_CACHE_TTL,
+            failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+            reset_timeout=settings.CIRCUIT_RESET_TIMEOUT,
+            rate_limiter=rate_limiter
+        )
+
+    async def initialize(self):
+        """Open the pooled session"""
+        if not self.session:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+                use_dns_cache=True
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(
+                    total=self.timeout,
+                    sock_connect=self.connect_timeout
+                )
+            )
+
+    async def close(self):
+        """Close the pooled session"""
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        breaker = self.breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+            self.breakers[host] = breaker
+        return breaker
+
+    async def get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """GET a JSON document"""
+        return await self.request_json("GET", path, params=params)
+
+    async def request_json(
+        self,
+        method: str,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        json: Optional[Any] = None,
+        idempotent: Optional[bool] = None
+    ) -> Optional[Any]:
+        """Send a request with deadline, retries and circuit breaking"""
+        if not self.session:
+            await self.initialize()
+
+        method = method.upper()
+        url = path if path.startswith("http") else f"{self.base_url}{path}"
+        host = urlsplit(url).netloc
+        breaker = self.breaker(host)
+        if idempotent is None:
+            idempotent = method in self.IDEMPOTENT_METHODS
+        attempts = 1 + (self.max_retries if idempotent else 0)
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        settings = get_settings()
+
+        for attempt in range(attempts):
+            if self.rate_limiter:
+                await self.rate_limiter.acquire(timeout=max(0.0, deadline - loop.time()))
+
+            if not breaker.allow():
+                raise CircuitOpenError(
+                    f"Circuit open for {host}, retry in {breaker.retry_after:.1f}s",
+                    settings.ERROR_MESSAGES["api_error"]
+                )
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                breaker.release()
+                raise APIError(f"{method} {url} exceeded deadline", settings.ERROR_MESSAGES["timeout"])
+
+            retry_after = None
+            status = "error"
+            started = loop.time()
+            try:
+                async with self.session.request(
+                    method,
+                    url,
+                    params=params,
+                    json=json,
+                    timeout=aiohttp.ClientTimeout(total=remaining, sock_connect=self.connect_timeout)
+                ) as response:
+                    status = str(response.status)
+                    if response.status == 404:
+                        breaker.record_success()
+                        return None
+                    if response.status < 400:
+                        data = await response.json(content_type=None)
+                        breaker.record_success()
+                        return data
+                    if response.status not in self.RETRYABLE_STATUSES:
+                        breaker.record_success()
+                        raise APIError(
+                            f"{method} {url} returned {response.status}",
+                            settings.ERROR_MESSAGES["api_error"]
+                        )
+                    error = APIError(
+                        f"{method} {url} returned {response.status}",
+                        settings.ERROR_MESSAGES["api_error"]
+                    )
+                    retry_after = self._parse_retry_after(response.headers.get("Retry-After"))
+                    if response.status == 429:
+                        breaker.release()
+                        if self.rate_limiter:
+                            self.rate_limiter.penalize(retry_after or self.backoff_base)
+                    else:
+                        breaker.record_failure()
+            except APIError:
+                raise
+            except asyncio.TimeoutError:
+                status = "timeout"
+                breaker.record_failure()
+                error = APIError(f"{method} {url} timed out", settings.ERROR_MESSAGES["timeout"])
+            except (aiohttp.ClientError, ValueError) as e:
+                breaker.record_failure()
+                error = APIError(f"{method} {url} failed: {e}", settings.ERROR_MESSAGES["api_error"])
+            except asyncio.CancelledError:
+                status = "cancelled"
+                breaker.release()
+                raise
+            finally:
+                UPSTREAM_DURATION.labels(host).observe(loop.time() - started)
+                UPSTREAM_REQUESTS.labels(host, status).inc()
+
+            if attempt + 1 >= attempts:
+                break
+
+            delay = retry_after if retry_after is not None else self._backoff(attempt)
+            if loop.time() + delay >= deadline:
+                break
+            self.retries += 1
+            logger.warning("%s; retrying in %.2fs (%s/%s)", error, delay, attempt + 1, self.max_retries)
+            await asyncio.sleep(delay)
+
+        raise error
+
+    def _backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+    @staticmethod
+    def _parse_retry_after(value: Optional[str]) -> Optional[float]:
+        try:
+            return max(0.0, float(value)) if value is not None else None
+        except ValueError:
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "retries": self.retries,
+            "rate_limiter": self.rate_limiter.stats() if self.rate_limiter else None,
+            "breakers": {host: breaker.stats() for host, breaker in self.breakers.items()}
+        }
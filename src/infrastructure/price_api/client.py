@@ -1,40 +1,54 @@
-import aiohttp
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, List
 from ...app.config import get_settings
+from ...utils.singleflight import SingleFlight
+from ..http.rate_limiter import RateLimiter
+from ..http.transport import HttpTransport
 
 class PriceApiClient:
     def __init__(self):
         self.settings = get_settings()
-        self.session: Optional[aiohttp.ClientSession] = None
-        self.base_url = "https://api.coingecko.com/api/v3"
-        
+        self.base_url = self.settings.PRICE_API_BASE_URL
+        self.transport = HttpTransport.from_settings(
+            self.base_url,
+            rate_limiter=RateLimiter.from_settings(
+                "coingecko",
+                rate=self.settings.PRICE_API_RATE_LIMIT,
+                burst=self.settings.PRICE_API_BURST
+            )
+        )
+        self.flight = SingleFlight()
+
     async def initialize(self):
         """Initialize API client"""
-        if not self.session:
-            self.session = aiohttp.ClientSession()
-            
+        await self.transport.initialize()
+
     async def close(self):
         """Close API client"""
-        if self.session:
-            await self.session.close()
-            self.session = None
-            
+        await self.transport.close()
+
     async def get_ton_price(self) -> Optional[float]:
         """Get TON price in USD"""
-        if not self.session:
-            await self.initialize()
-            
-        try:
-            async with self.session.get(
-                f"{self.base_url}/simple/price",
-                params={
-                    "ids": "the-open-network",
-                    "vs_currencies": "usd"
-                }
-            ) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    return data["the-open-network"]["usd"]
-                return None
-        except Exception:
-            return None 
\ No newline at end of file
+        prices = await self.get_prices(["the-open-network"])
+        return prices.get("the-open-network")
+
+    async def get_prices(self, coin_ids: List[str]) -> Dict[str, float]:
+        """Get USD prices for several CoinGecko ids in one request"""
+        ids = ",".join(sorted(set(coin_ids)))
+        return await self.flight.do(("get_prices", ids), lambda: self._fetch_prices(ids))
+
+    async def _fetch_prices(self, ids: str) -> Dict[str, float]:
+        """Fetch prices from CoinGecko simple/price"""
+        data = await self.transport.get_json(
+            "/simple/price",
+            params={
+                "ids": ids,
+                "vs_currencies": "usd"
+            }
+        )
+        if not data:
+            return {}
+        return {
+            coin_id: float(price["usd"])
+            for coin_id, price in data.items()
+            if price.get("usd") is not None
+        }
@@ -0,0 +1,378 @@
+import asyncio
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple, Sequence
+from ...utils.logging import logger
+
+# One tick on disk: unix timestamp and USD price, little-endian doubles
+TICK = struct.Struct('<dd')
+
+# Tier snapshot: first timestamp, then per tier its bucket size and candle
+# count followed by the start, open, high, low and close columns
+SNAPSHOT_HEADER = struct.Struct('<d')
+TIER_HEADER = struct.Struct('<qq')
+
+# name, bucket size (seconds), buckets kept
+DEFAULT_TIERS: Sequence[Tuple[str, int, int]] = (
+    ("1m", 60, 2 * 24 * 60),      # two days of minutes
+    ("1h", 3600, 90 * 24),        # ninety days of hours
+    ("1d", 86400, 5 * 365)        # five years of days
+)
+
+
+class Candle(NamedTuple):
+    start: float
+    open: float
+    high: float
+    low: float
+    close: float
+
+
+class _Columns:
+    """
+    Parallel ``array('d')`` columns with a retention limit
+
+    Old rows are dropped in blocks once the buffer holds twice the retention,
+    which keeps appends amortized O(1) while the arrays stay sorted for
+    ``bisect``.
+    """
+
+    def __init__(self, names: Sequence[str], retention: int):
+        self.retention = retention
+        self.columns = [array('d') for _ in names]
+
+    def __len__(self) -> int:
+        return len(self.columns[0])
+
+    def append(self, *values: float) -> None:
+        for column, value in zip(self.columns, values):
+            column.append(value)
+        if len(self) > 2 * self.retention:
+            drop = len(self) - self.retention
+            for column in self.columns:
+                del column[:drop]
+
+
+class OhlcTier:
+    """Fixed-interval OHLC candles"""
+
+    def __init__(self, name: str, interval: int, retention: int):
+        self.name = name
+        self.interval = interval
+        self._data = _Columns(("start", "open", "high", "low", "close"), retention)
+        self.start, self.open, self.high, self.low, self.close = self._data.columns
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def add(self, timestamp: float, price: float) -> None:
+        bucket = timestamp - timestamp % self.interval
+        if self.start and self.start[-1] == bucket:
+            if price > self.high[-1]:
+                self.high[-1] = price
+            if price < self.low[-1]:
+                self.low[-1] = price
+            self.close[-1] = price
+        elif not self.start or bucket > self.start[-1]:
+            self._data.append(bucket, price, price, price, price)
+
+    def candles(self, start: float, end: float) -> List[Candle]:
+        """Candles whose bucket overlaps [start, end]"""
+        lo = max(0, bisect_right(self.start, start) - 1)
+        if lo < len(self.start) and self.start[lo] + self.interval <= start:
+            lo += 1
+        hi = bisect_right(self.start, end)
+        return [
+            Candle(self.start[i], self.open[i], self.high[i], self.low[i], self.close[i])
+            for i in range(lo, hi)
+        ]
+
+    def price_at(self, timestamp: float) -> Optional[float]:
+        """Close of the last bucket starting at or before timestamp"""
+        i = bisect_right(self.start, timestamp) - 1
+        return self.close[i] if i >= 0 else None
+
+    @property
+    def covers_from(self) -> Optional[float]:
+        return self.start[0] if self.start else None
+
+    def dump(self) -> bytes:
+        return TIER_HEADER.pack(self.interval, len(self)) + b''.join(c.tobytes() for c in self._data.columns)
+
+    def restore(self, data: memoryview, count: int) -> None:
+        """Replace the candles with ``count`` rows in ``dump`` column layout"""
+        width = count * self.start.itemsize
+        drop = max(0, count - self._data.retention)
+        for i, column in enumerate(self._data.columns):
+            del column[:]
+            column.frombytes(data[i * width:(i + 1) * width])
+            del column[:drop]
+
+    def clear(self) -> None:
+        for column in self._data.columns:
+            del column[:]
+
+
+class _TimestampView:
+    """Sequence of timestamps over a flat ``[ts, price, ts, price, ...]`` buffer"""
+
+    def __init__(self, values: memoryview):
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.values) // 2
+
+    def __getitem__(self, index: int) -> float:
+        return self.values[2 * index]
+
+
+def _replace(path: Path, data: bytes) -> None:
+    """Atomically replace a file's contents"""
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+class PriceSeries:
+    """
+    History of one symbol: recent tick ring, OHLC tiers and the on-disk log
+
+    Ticks are buffered in memory until ``flush``. Once the log holds twice
+    the ring's capacity, the tiers are saved next to it and the log is cut
+    back to the ticks in the ring, so a restart reads the saved tiers and
+    replays a bounded number of ticks.
+    """
+
+    def __init__(self, symbol: str, path: Path, tick_capacity: int, tiers: Sequence[Tuple[str, int, int]]):
+        self.symbol = symbol
+        self.path = path
+        self.tiers_path = path.with_suffix('.tiers')
+        self._ticks = _Columns(("timestamp", "price"), tick_capacity)
+        self.timestamps, self.prices = self._ticks.columns
+        self.tiers: Dict[str, OhlcTier] = {name: OhlcTier(name, interval, keep) for name, interval, keep in tiers}
+        self._max_retention = max(interval * keep for _, interval, keep in tiers)
+        self.first_timestamp: Optional[float] = None
+        self._pending = bytearray()
+        self._logged = 0  # ticks in the log file
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        """Restore saved tiers and replay the on-disk log into memory"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        restored = self._load_tiers()
+        if self.path.exists():
+            size = self.path.stat().st_size
+            valid = size - size % TICK.size
+            if valid != size:
+                logger.warning("Truncating torn tick at the end of %s", self.path)
+                os.truncate(self.path, valid)
+            self._logged = valid // TICK.size
+            if valid:
+                with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    values = memoryview(mm).cast('d')
+                    try:
+                        timestamps = _TimestampView(values)
+                        latest = timestamps[len(timestamps) - 1]
+                        # Ticks already in the saved tiers are skipped by OhlcTier.add
+                        first = 0 if restored else bisect_left(timestamps, latest - self._max_retention)
+                        for i in range(first, len(timestamps)):
+                            self._apply(values[2 * i], values[2 * i + 1])
+                    finally:
+                        values.release()
+
+    def _load_tiers(self) -> bool:
+        """Restore the tiers saved at the last compaction"""
+        if not self.tiers_path.exists():
+            return False
+        data = memoryview(self.tiers_path.read_bytes())
+        try:
+            first_timestamp, = SNAPSHOT_HEADER.unpack_from(data)
+            offset = SNAPSHOT_HEADER.size
+            for tier in self.tiers.values():
+                interval, count = TIER_HEADER.unpack_from(data, offset)
+                offset += TIER_HEADER.size
+                size = count * 5 * tier.start.itemsize
+                if interval != tier.interval or offset + size > len(data):
+                    raise ValueError(f"tier {tier.name} does not match the saved one")
+                tier.restore(data[offset:offset + size], count)
+                offset += size
+        except (struct.error, ValueError) as e:
+            logger.warning("Ignoring saved tiers in %s: %s", self.tiers_path, e)
+            for tier in self.tiers.values():
+                tier.clear()
+            return False
+        self.first_timestamp = first_timestamp
+        return True
+
+    def _apply(self, timestamp: float, price: float) -> None:
+        if self.first_timestamp is None:
+            self.first_timestamp = timestamp
+        self._ticks.append(timestamp, price)
+        for tier in self.tiers.values():
+            tier.add(timestamp, price)
+
+    def record(self, timestamp: float, price: float) -> bool:
+        """Append a tick; out-of-order ticks are ignored to keep series sorted"""
+        if self.timestamps and timestamp < self.timestamps[-1]:
+            return False
+        self._apply(timestamp, price)
+        self._pending += TICK.pack(timestamp, price)
+        self._logged += 1
+        return True
+
+    def take_pending(self) -> Tuple[bytes, Optional[tuple]]:
+        """Detach buffered ticks, with a compaction snapshot once the log outgrows the ring"""
+        data = bytes(self._pending)
+        self._pending.clear()
+        snapshot = None
+        if self._logged > 2 * self._ticks.retention:
+            tiers = SNAPSHOT_HEADER.pack(self.first_timestamp) + b''.join(t.dump() for t in self.tiers.values())
+            snapshot = (tiers, array('d', self.timestamps), array('d', self.prices))
+            self._logged = len(self.timestamps)
+        return data, snapshot
+
+    def write(self, data: bytes, snapshot: Optional[tuple]) -> None:
+        """Append ticks to the log, or replace the tiers and log with a snapshot; thread safe"""
+        with self._lock:
+            if snapshot:
+                tiers, timestamps, prices = snapshot
+                ticks = array('d', bytes(2 * len(timestamps) * timestamps.itemsize))
+                ticks[0::2] = timestamps
+                ticks[1::2] = prices
+                # Tiers first: after a crash in between, the longer log replays idempotently
+                _replace(self.tiers_path, tiers)
+                _replace(self.path, ticks.tobytes())
+            elif data:
+                with open(self.path, 'ab') as f:
+                    f.write(data)
+
+    def flush(self) -> None:
+        """Write buffered ticks from the calling thread"""
+        self.write(*self.take_pending())
+
+    def latest(self) -> Optional[Tuple[float, float]]:
+        if not self.timestamps:
+            return None
+        return self.timestamps[-1], self.prices[-1]
+
+    def ticks(self, start: float, end: float) -> List[Tuple[float, float]]:
+        """Raw ticks in [start, end], from memory and, before the ring, the mapped log file"""
+        in_memory = []
+        if self.timestamps:
+            lo = bisect_left(self.timestamps, start)
+            hi = bisect_right(self.timestamps, end)
+            in_memory = list(zip(self.timestamps[lo:hi], self.prices[lo:hi]))
+            if start >= self.timestamps[0]:
+                return in_memory
+            # The ring holds every tick from its start on, including those not written yet
+            end = min(end, self.timestamps[0])
+
+        if not self.path.exists() or self.path.stat().st_size < TICK.size:
+            return in_memory
+        with open(self.path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            values = memoryview(mm).cast('d')
+            try:
+                timestamps = _TimestampView(values)
+                lo = bisect_left(timestamps, start)
+                hi = bisect_left(timestamps, end) if in_memory else bisect_right(timestamps, end)
+                return [(values[2 * i], values[2 * i + 1]) for i in range(lo, hi)] + in_memory
+            finally:
+                values.release()
+
+    def price_at(self, timestamp: float) -> Optional[float]:
+        """Best known price at a moment, using the finest tier that covers it"""
+        if self.first_timestamp is None or timestamp < self.first_timestamp:
+            return None
+        if self.timestamps and timestamp >= self.timestamps[0]:
+            i = bisect_right(self.timestamps, timestamp) - 1
+            return self.prices[i] if i >= 0 else None
+        for tier in self.tiers.values():
+            if tier.covers_from is not None and timestamp >= tier.covers_from:
+                return tier.price_at(timestamp)
+        return None
+
+
+class PriceHistory:
+    """
+    Persistent price history for all tracked symbols
+
+    Every tick goes to an in-memory ring and to an append-only binary log
+    (``<symbol>.bin``, 16 bytes per tick). The ticks are also rolled up into
+    1m/1h/1d OHLC tiers, each with its own retention, which are saved to
+    ``<symbol>.tiers`` whenever the log is compacted to the ring. All series
+    are sorted by time, so point lookups and range queries are binary
+    searches. Raw ticks older than the ring are read straight from the
+    memory-mapped log while it still holds them.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        tick_capacity: int = 10_000,
+        tiers: Sequence[Tuple[str, int, int]] = DEFAULT_TIERS
+    ):
+        self.directory = Path(directory)
+        self.tick_capacity = tick_capacity
+        self.tier_spec = tuple(tiers)
+        self._series: Dict[str, PriceSeries] = {}
+        self._persisting = asyncio.Lock()
+
+    def series(self, symbol: str) -> PriceSeries:
+        symbol = symbol.upper()
+        series = self._series.get(symbol)
+        if series is None:
+            filename = re.sub(r'[^A-Z0-9_-]', '_', symbol) + ".bin"
+            series = PriceSeries(symbol, self.directory / filename, self.tick_capacity, self.tier_spec)
+            self._series[symbol] = series
+        return series
+
+    def record(self, symbol: str, price: float, timestamp: Optional[float] = None) -> bool:
+        """Record a price tick"""
+        return self.series(symbol).record(time.time() if timestamp is None else timestamp, price)
+
+    def flush(self) -> None:
+        """Write buffered ticks to the log files from the calling thread"""
+        for series in self._series.values():
+            series.flush()
+
+    async def persist(self) -> None:
+        """Write buffered ticks, compacting logs as needed, off the event loop"""
+        async with self._persisting:
+            batches = [(series, series.take_pending()) for series in self._series.values()]
+            await asyncio.to_thread(lambda: [series.write(*batch) for series, batch in batches])
+
+    def close(self) -> None:
+        self.flush()
+        self._series.clear()
+
+    def latest(self, symbol: str) -> Optional[Tuple[float, float]]:
+        return self.series(symbol).latest()
+
+    def ticks(self, symbol: str, start: float, end: float) -> List[Tuple[float, float]]:
+        return self.series(symbol).ticks(start, end)
+
+    def candles(self, symbol: str, tier: str, start: float, end: float) -> List[Candle]:
+        return self.series(symbol).tiers[tier].candles(start, end)
+
+    def price_at(self, symbol: str, timestamp: float) -> Optional[float]:
+        return self.series(symbol).price_at(timestamp)
+
+    def change_percent(self, symbol: str, hours: float, now: Optional[float] = None) -> Optional[float]:
+        """Percent change of the latest price versus ``hours`` ago"""
+        series = self.series(symbol)
+        latest = series.latest()
+        if latest is None:
+            return None
+        now = latest[0] if now is None else now
+        past = series.price_at(now - hours * 3600)
+        if not past:
+            return None
+        return (latest[1] - past) / past * 100
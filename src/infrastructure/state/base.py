@@ -0,0 +1,68 @@
+import asyncio
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Optional, Tuple
+from ...core.state_manager import ConversationState
+from ...utils.errors import StorageError
+
+StateUpdate = Callable[[Optional[ConversationState]], Tuple[str, Dict[str, Any]]]
+
+class StateBackend(ABC):
+    """
+    Conversation state store shared by whoever holds the same backend
+
+    Every write gives the state a new version. ``compare_and_set`` only writes
+    when the stored version is still the one the caller read (0 when there is
+    no live state), which lets workers update a state without locks.
+    """
+
+    @abstractmethod
+    async def get(self, user_id: str) -> Optional[ConversationState]:
+        """Get the live state of a user"""
+        pass
+
+    @abstractmethod
+    async def set(self, user_id: str, state: str, data: Optional[Dict[str, Any]] = None) -> int:
+        """Set a state unconditionally; returns its version"""
+        pass
+
+    @abstractmethod
+    async def compare_and_set(
+        self,
+        user_id: str,
+        expected_version: int,
+        state: str,
+        data: Optional[Dict[str, Any]] = None
+    ) -> Optional[int]:
+        """Set a state if its version is unchanged; returns the new version or None"""
+        pass
+
+    @abstractmethod
+    async def delete(self, user_id: str) -> None:
+        """Clear the state of a user"""
+        pass
+
+    async def update(self, user_id: str, fn: StateUpdate, attempts: int = 20) -> int:
+        """Read-modify-write through compare-and-set, retrying on conflicts"""
+        for attempt in range(attempts):
+            current = await self.get(user_id)
+            state, data = fn(current)
+            version = await self.compare_and_set(
+                user_id, current.version if current else 0, state, data
+            )
+            if version is not None:
+                return version
+            # Back off a little so contending workers interleave
+            await asyncio.sleep(0.001 * attempt)
+        raise StorageError(f"State of {user_id} kept changing; gave up after {attempts} attempts")
+
+    async def start(self) -> None:
+        """Start background expiry"""
+        pass
+
+    async def stop(self) -> None:
+        """Stop background expiry"""
+        pass
+
+    async def close(self) -> None:
+        """Stop expiry and release resources"""
+        await self.stop()
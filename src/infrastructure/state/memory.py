@@ -0,0 +1,38 @@
+from typing import Any, Dict, Optional
+from .base import StateBackend
+from ...core.state_manager import ConversationState, StateManager
+
+class MemoryStateBackend(StateBackend):
+    """
+    In-process backend over a StateManager
+
+    The default for a single worker: every call completes synchronously and
+    hands out the stored record itself rather than a copy.
+    """
+
+    def __init__(self, state_manager: StateManager):
+        self.state_manager = state_manager
+
+    async def get(self, user_id: str) -> Optional[ConversationState]:
+        return self.state_manager.get_state(user_id)
+
+    async def set(self, user_id: str, state: str, data: Optional[Dict[str, Any]] = None) -> int:
+        return self.state_manager.set_state(user_id, state, data)
+
+    async def compare_and_set(
+        self,
+        user_id: str,
+        expected_version: int,
+        state: str,
+        data: Optional[Dict[str, Any]] = None
+    ) -> Optional[int]:
+        return self.state_manager.compare_and_set(user_id, expected_version, state, data)
+
+    async def delete(self, user_id: str) -> None:
+        self.state_manager.clear_state(user_id)
+
+    async def start(self) -> None:
+        await self.state_manager.start()
+
+    async def stop(self) -> None:
+        await self.state_manager.stop()
@@ -0,0 +1,169 @@
+import asyncio
+import json
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional
+from .base import StateBackend
+from ...core.state_manager import ConversationState
+from ...utils.errors import StorageError
+from ...utils.logging import logger
+
+SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS conversation_states (
+        user_id TEXT PRIMARY KEY,
+        state TEXT NOT NULL,
+        data TEXT,
+        version INTEGER NOT NULL,
+        started_at REAL NOT NULL,
+        expires_at REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS ix_conversation_states_expires_at ON conversation_states (expires_at)",
+    "CREATE TABLE IF NOT EXISTS state_versions (id INTEGER PRIMARY KEY CHECK (id = 1), value INTEGER NOT NULL)",
+    "INSERT OR IGNORE INTO state_versions (id, value) VALUES (1, 0)"
+)
+
+class SqliteStateBackend(StateBackend):
+    """
+    Conversation states in a SQLite file shared by the workers of one host
+
+    Writes run in ``BEGIN IMMEDIATE`` transactions, so the version check of
+    ``compare_and_set`` and the write that follows are atomic across
+    processes. Versions come from a single counter row and are never reused.
+    Expiry uses wall-clock time, the only clock every process and a restart
+    agree on; expired rows read as absent and are deleted by the reaper.
+    Queries run on one thread per process to keep them off the event loop.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        expiry_minutes: int = 30,
+        reap_interval: float = 60,
+        busy_timeout: float = 30
+    ):
+        self.path = path
+        self.ttl = expiry_minutes * 60
+        self.reap_interval = reap_interval
+        if path != ":memory:":
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+        # isolation_level=None: transactions are opened explicitly below
+        self._conn = sqlite3.connect(
+            path, timeout=busy_timeout, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in SCHEMA:
+            self._conn.execute(statement)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="state-sqlite")
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self, fn, *args):
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        except sqlite3.Error as e:
+            raise StorageError(f"State backend failed: {e}")
+
+    async def get(self, user_id: str) -> Optional[ConversationState]:
+        return await self._run(self._select, user_id)
+
+    def _select(self, user_id: str) -> Optional[ConversationState]:
+        row = self._conn.execute(
+            "SELECT state, data, started_at, expires_at, version FROM conversation_states "
+            "WHERE user_id = ? AND expires_at > ?",
+            (user_id, time.time())
+        ).fetchone()
+        if row is None:
+            return None
+        state, data, started_at, expires_at, version = row
+        return ConversationState(state, json.loads(data) if data else None, started_at, expires_at, version)
+
+    async def set(self, user_id: str, state: str, data: Optional[Dict[str, Any]] = None) -> int:
+        return await self._run(self._write, user_id, None, state, self._encode(data))
+
+    async def compare_and_set(
+        self,
+        user_id: str,
+        expected_version: int,
+        state: str,
+        data: Optional[Dict[str, Any]] = None
+    ) -> Optional[int]:
+        return await self._run(self._write, user_id, expected_version, state, self._encode(data))
+
+    @staticmethod
+    def _encode(data: Optional[Dict[str, Any]]) -> Optional[str]:
+        return json.dumps(data, ensure_ascii=False) if data else None
+
+    def _write(self, user_id: str, expected_version: Optional[int], state: str, data: Optional[str]) -> Optional[int]:
+        conn = self._conn
+        now = time.time()
+        # Takes the write lock up front so no other process can interleave
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if expected_version is not None:
+                row = conn.execute(
+                    "SELECT version FROM conversation_states WHERE user_id = ? AND expires_at > ?",
+                    (user_id, now)
+                ).fetchone()
+                if (row[0] if row else 0) != expected_version:
+                    conn.execute("ROLLBACK")
+                    return None
+            conn.execute("UPDATE state_versions SET value = value + 1 WHERE id = 1")
+            version = conn.execute("SELECT value FROM state_versions WHERE id = 1").fetchone()[0]
+            conn.execute(
+                "INSERT INTO conversation_states (user_id, state, data, version, started_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (user_id) DO UPDATE SET state = excluded.state, data = excluded.data, "
+                "version = excluded.version, started_at = excluded.started_at, expires_at = excluded.expires_at",
+                (user_id, state, data, version, now, now + self.ttl)
+            )
+            conn.execute("COMMIT")
+            return version
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    async def delete(self, user_id: str) -> None:
+        await self._run(self._delete, user_id)
+
+    def _delete(self, user_id: str) -> None:
+        self._conn.execute("DELETE FROM conversation_states WHERE user_id = ?", (user_id,))
+
+    async def reap(self) -> int:
+        """Delete expired states"""
+        return await self._run(self._reap)
+
+    def _reap(self) -> int:
+        return self._conn.execute(
+            "DELETE FROM conversation_states WHERE expires_at <= ?", (time.time(),)
+        ).rowcount
+
+    async def start(self) -> None:
+        if not self._task:
+            self._task = asyncio.create_task(self._reap_loop())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _reap_loop(self) -> None:
+        """Periodically delete expired states; any worker may do it"""
+        while True:
+            await asyncio.sleep(self.reap_interval)
+            try:
+                await self.reap()
+            except Exception as e:
+                logger.error("Error reaping conversation states: %s", e)
+
+    async def close(self) -> None:
+        await self.stop()
+        self._executor.shutdown(wait=True)
+        self._conn.close()
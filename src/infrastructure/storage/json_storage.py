@@ -1,59 +1,225 @@
 import json
+import os
 import asyncio
-from typing import Optional, List, TypeVar, Generic, Dict
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, TypeVar, Dict, IO, Set
 from pathlib import Path
 from .base import Repository
-from ...core.models.user import User
+from ...utils.errors import StorageError
+from ...utils.logging import logger
 
 T = TypeVar('T')
 
 class JsonRepository(Repository[T]):
-    def __init__(self, file_path: Path, model_class: type):
-        self.file_path = file_path
+    """
+    JSON repository backed by an in-memory index and an append-only journal
+
+    The snapshot file is loaded once and the journal replayed on top of it.
+    Reads are served from the index; writes update the index immediately and
+    append a journal record that a single writer task group-commits (one
+    write + fsync per batch) on a dedicated thread. Once the journal holds
+    at least ``compact_threshold`` records and as many records as the last
+    snapshot has entries, it is folded into a fresh snapshot written via atomic
+    rename, so each rewrite of the snapshot is paid for by as many appends.
+    """
+
+    def __init__(self, file_path: Path, model_class: type, compact_threshold: int = 10_000):
+        self.file_path = Path(file_path)
+        self.journal_path = self.file_path.with_name(self.file_path.name + ".journal")
         self.model_class = model_class
-        self.lock = asyncio.Lock()
+        self.compact_threshold = compact_threshold
+        self._index: Dict[str, str] = {}
+        self._journal: Optional[IO[bytes]] = None
+        self._journal_records = 0
+        self._snapshot_size = 0
+        self._pending: List[str] = []
+        self._waiters: List[asyncio.Future] = []
+        self._unflushed: Set[asyncio.Future] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="json-storage")
         self._ensure_file_exists()
-        
+        self._load()
+
     def _ensure_file_exists(self):
         """Create storage file if it doesn't exist"""
         self.file_path.parent.mkdir(parents=True, exist_ok=True)
         if not self.file_path.exists():
             with open(self.file_path, 'w', encoding='utf-8') as f:
-                json.dump({}, f, indent=4)
-                
-    async def _read_data(self) -> Dict:
-        """Read data from file with lock"""
-        async with self.lock:
+                json.dump({}, f)
+
+    def _load(self):
+        """Load the snapshot and replay the journal into the index"""
+        try:
             with open(self.file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-                
-    async def _write_data(self, data: Dict):
-        """Write data to file with lock"""
-        async with self.lock:
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
-                
+                snapshot = json.load(f)
+        except (OSError, ValueError) as e:
+            raise StorageError(f"Cannot read {self.file_path}: {e}")
+
+        self._index = {
+            id: json.dumps(data, ensure_ascii=False)
+            for id, data in snapshot.items()
+        }
+        self._snapshot_size = len(snapshot)
+        self._replay_journal()
+        self._journal = open(self.journal_path, 'ab')
+
+    def _replay_journal(self):
+        """Apply journal records, truncating a torn tail left by a crash"""
+        if not self.journal_path.exists():
+            return
+
+        valid_bytes = 0
+        with open(self.journal_path, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("incomplete record")
+                    record = json.loads(line)
+                except ValueError:
+                    logger.warning(
+                        "Discarding torn journal tail in %s at byte %d",
+                        self.journal_path, valid_bytes,
+                    )
+                    break
+
+                if record["op"] == "put":
+                    self._index[record["id"]] = json.dumps(record["data"], ensure_ascii=False)
+                else:
+                    self._index.pop(record["id"], None)
+                valid_bytes += len(line)
+                self._journal_records += 1
+
+        if valid_bytes != self.journal_path.stat().st_size:
+            os.truncate(self.journal_path, valid_bytes)
+
     async def get(self, id: str) -> Optional[T]:
-        data = await self._read_data()
-        if id in data:
-            return self.model_class(**data[id])
-        return None
-        
+        raw = self._index.get(id)
+        if raw is None:
+            return None
+        return self.model_class(**json.loads(raw))
+
     async def save(self, id: str, entity: T) -> T:
-        data = await self._read_data()
-        data[id] = entity.__dict__
-        await self._write_data(data)
+        raw = json.dumps(entity.__dict__, ensure_ascii=False)
+        self._index[id] = raw
+        await self._append(f'{{"op": "put", "id": {json.dumps(id)}, "data": {raw}}}\n')
         return entity
-        
+
     async def delete(self, id: str) -> bool:
-        data = await self._read_data()
-        if id in data:
-            del data[id]
-            await self._write_data(data)
-            return True
-        return False
-        
+        if self._index.pop(id, None) is None:
+            return False
+        await self._append(f'{{"op": "del", "id": {json.dumps(id)}}}\n')
+        return True
+
     async def list(self) -> List[T]:
-        data = await self._read_data()
-        return [self.model_class(**item) for item in data.values()] 
\ No newline at end of file
+        return [self.model_class(**json.loads(raw)) for raw in self._index.values()]
+
+    async def close(self) -> None:
+        """Flush pending records, compact and release the journal"""
+        if self._writer:
+            await self.flush()
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+        if self._journal:
+            if self._journal_records:
+                await self._compact()
+            self._journal.close()
+            self._journal = None
+        self._executor.shutdown(wait=True)
+
+    async def flush(self) -> None:
+        """Wait until every pending record is durable"""
+        if self._unflushed:
+            await asyncio.gather(*self._unflushed, return_exceptions=True)
+
+    async def _append(self, record: str) -> None:
+        """Queue a journal record and wait for its group commit"""
+        if self._journal is None:
+            raise StorageError(f"{self.file_path} repository is closed")
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(record)
+        self._waiters.append(future)
+        self._unflushed.add(future)
+        future.add_done_callback(self._unflushed.discard)
+        if self._writer is None:
+            self._wakeup = asyncio.Event()
+            self._writer = asyncio.create_task(self._write_loop())
+        self._wakeup.set()
+        await future
+
+    async def _write_loop(self):
+        """Group-commit pending records off the event loop"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            batch, waiters = self._pending, self._waiters
+            self._pending, self._waiters = [], []
+            if not batch:
+                continue
+
+            try:
+                await loop.run_in_executor(self._executor, self._write_batch, "".join(batch))
+            except Exception as e:
+                error = StorageError(f"Journal write failed: {e}")
+                for waiter in waiters:
+                    if not waiter.done():
+                        waiter.set_exception(error)
+                continue
+
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
+
+            self._journal_records += len(batch)
+            if self._journal_records >= max(self.compact_threshold, self._snapshot_size):
+                try:
+                    await self._compact()
+                except Exception as e:
+                    logger.error("Journal compaction failed: %s", e)
+
+    def _write_batch(self, data: str):
+        self._journal.write(data.encode('utf-8'))
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+
+    async def _compact(self):
+        """Fold the journal into a new snapshot"""
+        snapshot = dict(self._index)
+        await asyncio.get_running_loop().run_in_executor(
+            self._executor, self._write_snapshot, snapshot
+        )
+        self._journal_records = 0
+        self._snapshot_size = len(snapshot)
+
+    def _write_snapshot(self, snapshot: Dict[str, str]):
+        tmp_path = self.file_path.with_name(self.file_path.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write("{")
+            f.write(",\n".join(f"{json.dumps(id)}: {raw}" for id, raw in snapshot.items()))
+            f.write("}")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.file_path)
+        self._fsync_dir()
+
+        # Records written after the snapshot copy are still pending in memory,
+        # so the journal can be truncated before the next batch is appended.
+        self._journal.truncate(0)
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+
+    def _fsync_dir(self):
+        try:
+            fd = os.open(self.file_path.parent, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
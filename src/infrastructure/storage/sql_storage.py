@@ -0,0 +1,261 @@
+import json
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, List, TypeVar, Dict, AsyncIterator, Set
+from sqlalchemy import (
+    Column,
+    Float,
+    MetaData,
+    String,
+    Table,
+    Text,
+    create_engine,
+    delete,
+    event,
+    func,
+    select
+)
+from sqlalchemy.engine import Engine, URL, make_url
+from sqlalchemy.pool import StaticPool
+from .base import Repository
+from ...utils.errors import StorageError
+from ...utils.logging import logger
+
+T = TypeVar('T')
+
+_DELETED = None
+
+class SqlRepository(Repository[T]):
+    """
+    SQLAlchemy repository that keeps blocking database work off the event loop
+
+    Queries run on a dedicated thread pool sized to the connection pool.
+    Writes are buffered per id and a single writer task commits everything
+    that accumulated since the last commit in one transaction, so bursts of
+    session updates cost one round trip. Pending writes are visible to
+    ``get`` immediately. SQLite databases are switched to WAL mode; an
+    in-memory SQLite database lives on one shared connection used by a
+    single worker thread.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        model_class: type,
+        table_name: str = "users",
+        pool_size: int = 5,
+        page_size: int = 500
+    ):
+        self.model_class = model_class
+        self.page_size = page_size
+        parsed = make_url(url)
+        if self._is_memory_sqlite(parsed):
+            pool_size = 1
+        elif parsed.get_backend_name() == "sqlite":
+            Path(parsed.database).parent.mkdir(parents=True, exist_ok=True)
+        self.engine = self._create_engine(parsed, pool_size)
+        self.table = Table(
+            table_name,
+            MetaData(),
+            Column("id", String(128), primary_key=True),
+            Column("data", Text, nullable=False),
+            Column("updated_at", Float, nullable=False, index=True)
+        )
+        self.table.metadata.create_all(self.engine)
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="sql-storage")
+        self._pending: Dict[str, Optional[str]] = {}
+        self._waiters: List[asyncio.Future] = []
+        self._unflushed: Set[asyncio.Future] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._writer: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _is_memory_sqlite(url: URL) -> bool:
+        return url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:")
+
+    @classmethod
+    def _create_engine(cls, url: URL, pool_size: int) -> Engine:
+        """Create an engine, enabling WAL for file-backed SQLite"""
+        is_sqlite = url.get_backend_name() == "sqlite"
+        kwargs = {"pool_pre_ping": not is_sqlite}
+        if cls._is_memory_sqlite(url):
+            # Every connection would open its own empty database, so all threads share one
+            kwargs["poolclass"] = StaticPool
+        else:
+            kwargs.update(pool_size=pool_size, max_overflow=0)
+        if is_sqlite:
+            kwargs["connect_args"] = {"check_same_thread": False, "timeout": 30}
+
+        engine = create_engine(url, **kwargs)
+        if is_sqlite:
+            @event.listens_for(engine, "connect")
+            def _set_sqlite_pragmas(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                cursor.execute("PRAGMA journal_mode=WAL")
+                cursor.execute("PRAGMA synchronous=NORMAL")
+                cursor.close()
+        return engine
+
+    async def _run(self, fn, *args):
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+
+    def _decode(self, raw: str) -> T:
+        return self.model_class(**json.loads(raw))
+
+    async def get(self, id: str) -> Optional[T]:
+        if id in self._pending:
+            raw = self._pending[id]
+            return self._decode(raw) if raw is not _DELETED else None
+
+        raw = await self._run(self._select_one, id)
+        return self._decode(raw) if raw is not None else None
+
+    def _select_one(self, id: str) -> Optional[str]:
+        with self.engine.connect() as conn:
+            return conn.execute(
+                select(self.table.c.data).where(self.table.c.id == id)
+            ).scalar_one_or_none()
+
+    async def save(self, id: str, entity: T) -> T:
+        await self._enqueue(id, json.dumps(entity.__dict__, ensure_ascii=False))
+        return entity
+
+    async def delete(self, id: str) -> bool:
+        existed = await self.get(id) is not None
+        if existed:
+            await self._enqueue(id, _DELETED)
+        return existed
+
+    async def list(self) -> List[T]:
+        return [entity async for entity in self.iterate()]
+
+    async def iterate(self, batch_size: Optional[int] = None) -> AsyncIterator[T]:
+        """Stream entities page by page using keyset pagination on id"""
+        await self.flush()
+        batch_size = batch_size or self.page_size
+        last_id = None
+        while True:
+            rows = await self._run(self._select_page, last_id, batch_size)
+            for _, raw in rows:
+                yield self._decode(raw)
+            if len(rows) < batch_size:
+                break
+            last_id = rows[-1][0]
+
+    def _select_page(self, after_id: Optional[str], limit: int) -> List[tuple]:
+        query = select(self.table.c.id, self.table.c.data).order_by(self.table.c.id).limit(limit)
+        if after_id is not None:
+            query = query.where(self.table.c.id > after_id)
+        with self.engine.connect() as conn:
+            return [tuple(row) for row in conn.execute(query)]
+
+    async def count(self) -> int:
+        """Number of stored entities"""
+        await self.flush()
+        return await self._run(self._count)
+
+    def _count(self) -> int:
+        with self.engine.connect() as conn:
+            return conn.execute(select(func.count()).select_from(self.table)).scalar_one()
+
+    async def flush(self) -> None:
+        """Wait until every buffered write is committed"""
+        if self._unflushed:
+            await asyncio.gather(*self._unflushed, return_exceptions=True)
+
+    async def close(self) -> None:
+        """Commit buffered writes and dispose of the connection pool"""
+        await self.flush()
+        if self._writer:
+            self._writer.cancel()
+            try:
+                await self._writer
+            except asyncio.CancelledError:
+                pass
+            self._writer = None
+        self._executor.shutdown(wait=True)
+        self.engine.dispose()
+
+    async def _enqueue(self, id: str, raw: Optional[str]) -> None:
+        """Buffer a write and wait for the transaction that commits it"""
+        future = asyncio.get_running_loop().create_future()
+        self._pending[id] = raw
+        self._waiters.append(future)
+        self._unflushed.add(future)
+        future.add_done_callback(self._unflushed.discard)
+        if self._writer is None:
+            self._wakeup = asyncio.Event()
+            self._writer = asyncio.create_task(self._write_loop())
+        self._wakeup.set()
+        await future
+
+    async def _write_loop(self):
+        """Commit buffered writes in batched transactions"""
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            batch, waiters = dict(self._pending), self._waiters
+            self._waiters = []
+
+            error = None
+            try:
+                if batch:
+                    await self._run(self._commit_batch, batch)
+            except Exception as e:
+                logger.error("SQL batch commit failed: %s", e)
+                error = StorageError(f"Batch commit failed: {e}")
+
+            # Drop committed values unless they were overwritten meanwhile; after a
+            # failure they stay pending, visible to get() and retried with the next write
+            if not error:
+                for id, raw in batch.items():
+                    if self._pending.get(id, raw) is raw:
+                        self._pending.pop(id, None)
+
+            for waiter in waiters:
+                if waiter.done():
+                    continue
+                if error:
+                    waiter.set_exception(error)
+                else:
+                    waiter.set_result(None)
+
+    def _commit_batch(self, batch: Dict[str, Optional[str]]) -> None:
+        now = time.time()
+        upserts = [
+            {"id": id, "data": raw, "updated_at": now}
+            for id, raw in batch.items() if raw is not _DELETED
+        ]
+        deletes = [id for id, raw in batch.items() if raw is _DELETED]
+
+        with self.engine.begin() as conn:
+            if deletes:
+                conn.execute(delete(self.table).where(self.table.c.id.in_(deletes)))
+            if upserts:
+                conn.execute(self._upsert_statement(), upserts)
+
+    def _upsert_statement(self):
+        dialect = self.engine.dialect.name
+        if dialect in ("sqlite", "postgresql"):
+            if dialect == "sqlite":
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            statement = dialect_insert(self.table)
+            return statement.on_conflict_do_update(
+                index_elements=[self.table.c.id],
+                set_={
+                    "data": statement.excluded.data,
+                    "updated_at": statement.excluded.updated_at
+                }
+            )
+        if dialect == "mysql":
+            from sqlalchemy.dialects.mysql import insert as dialect_insert
+            statement = dialect_insert(self.table)
+            return statement.on_duplicate_key_update(
+                data=statement.inserted.data,
+                updated_at=statement.inserted.updated_at
+            )
+        raise StorageError(f"Upsert is not supported for dialect {dialect}")
@@ -1,52 +1,178 @@
-import aiohttp
-from typing import Optional, Dict, Any
+import asyncio
+from typing import Optional, Dict, Any, List
 from ...app.config import get_settings
+from ...core.models.wallet import to_raw_address
+from ...utils.errors import APIError
+from ...utils.logging import logger
+from ...utils.singleflight import SingleFlight
+from ..cache.memory_cache import MemoryCache
+from ..http.rate_limiter import RateLimiter
+from ..http.transport import HttpTransport
+from .sse import SseStream
 
 class TonApiClient:
-    def __init__(self):
+    CACHE_NAMESPACE = "wallet"
+
+    def __init__(self, cache: Optional[MemoryCache] = None):
         self.settings = get_settings()
-        self.session: Optional[aiohttp.ClientSession] = None
-        self.base_url = "https://tonapi.io/v2"
-        
+        self.cache = cache
+        self.base_url = self.settings.TON_API_BASE_URL
+        self.transport = HttpTransport.from_settings(
+            self.base_url,
+            headers={"Authorization": f"Bearer {self.settings.TON_API_KEY}"},
+            rate_limiter=RateLimiter.from_settings(
+                "tonapi",
+                rate=self.settings.TON_API_RATE_LIMIT,
+                burst=self.settings.TON_API_BURST
+            )
+        )
+        self.flight = SingleFlight()
+
     async def initialize(self):
         """Initialize API client"""
-        if not self.session:
-            self.session = aiohttp.ClientSession(
-                headers={"Authorization": f"Bearer {self.settings.TON_API_KEY}"}
-            )
-            
+        await self.transport.initialize()
+
     async def close(self):
         """Close API client"""
-        if self.session:
-            await self.session.close()
-            self.session = None
-            
-    async def get_account_info(self, address: str) -> Optional[Dict[str, Any]]:
+        await self.transport.close()
+
+    async def get_account_info(self, address: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
         """Get account information including balance and tokens"""
-        if not self.session:
-            await self.initialize()
-            
-        try:
-            async with self.session.get(
-                f"{self.base_url}/accounts/{address}"
-            ) as response:
-                if response.status == 200:
-                    return await response.json()
-                return None
-        except Exception:
-            return None
-            
-    async def get_jettons(self, address: str) -> Optional[Dict[str, Any]]:
-        """Get jetton balances for address"""
-        if not self.session:
-            await self.initialize()
-            
+        return await self._cached_get(
+            f"account:{address}",
+            ("get_account_info", address),
+            f"/accounts/{address}",
+            use_cache
+        )
+
+    async def get_jettons(self, address: str, use_cache: bool = True) -> Optional[Dict[str, Any]]:
+        """Get jetton balances for address, with USD prices where tonapi has them"""
+        return await self._cached_get(
+            f"jettons:{address}",
+            ("get_jettons", address),
+            f"/accounts/{address}/jettons?currencies=usd",
+            use_cache
+        )
+
+    async def get_accounts_bulk(self, addresses: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Get account information for many addresses
+
+        Uses tonapi's bulk endpoint in chunks of ``TON_API_BULK_LIMIT`` and
+        falls back to bounded-concurrency single lookups if it's unavailable.
+        Returns a mapping of every requested address to its account, or None
+        when the account doesn't exist.
+        """
+        result: Dict[str, Optional[Dict[str, Any]]] = {}
+        pending = []
+        for address in addresses:
+            cached = self.cache.get(f"account:{address}", self.CACHE_NAMESPACE) if self.cache else None
+            if cached:
+                result[address] = cached
+            else:
+                pending.append(address)
+
+        limit = self.settings.TON_API_BULK_LIMIT
+        for start in range(0, len(pending), limit):
+            chunk = pending[start:start + limit]
+            try:
+                result.update(await self._fetch_accounts_bulk(chunk))
+            except APIError as e:
+                logger.warning("Bulk account lookup failed, falling back to single requests: %s", e)
+                result.update(await self._fetch_accounts_each(chunk))
+        return result
+
+    async def _fetch_accounts_bulk(self, addresses: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        data = await self.transport.request_json(
+            "POST",
+            "/accounts/_bulk",
+            json={"account_ids": addresses},
+            idempotent=True
+        )
+        if data is None:
+            raise APIError("Bulk accounts endpoint not available")
+
+        by_raw = {
+            to_raw_address(account["address"]): account
+            for account in data.get("accounts", [])
+            if account.get("address")
+        }
+        result = {}
+        for address in addresses:
+            account = by_raw.get(to_raw_address(address))
+            result[address] = account
+            if account and self.cache:
+                self.cache.set(f"account:{address}", account, self.CACHE_NAMESPACE)
+        return result
+
+    async def _fetch_accounts_each(self, addresses: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        semaphore = asyncio.Semaphore(self.settings.TON_API_FANOUT_CONCURRENCY)
+
+        async def fetch(address: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await self.get_account_info(address)
+
+        accounts = await asyncio.gather(*(fetch(address) for address in addresses))
+        return dict(zip(addresses, accounts))
+
+    async def get_event(self, event_id: str) -> Optional[Dict[str, Any]]:
+        """Get a decoded event (trace actions) by event id or transaction hash"""
+        return await self.flight.do(("get_event", event_id), lambda: self._get(f"/events/{event_id}"))
+
+    def open_stream(self, path: str, params: Optional[Dict[str, str]] = None) -> SseStream:
+        """Create a resumable SSE stream against a tonapi streaming endpoint"""
+        return SseStream(
+            f"{self.transport.base_url}{path}",
+            headers=self.transport.headers,
+            params=params,
+            idle_timeout=self.settings.WHALE_STREAM_IDLE_TIMEOUT,
+            connect_timeout=self.settings.CONNECT_TIMEOUT,
+            backoff_base=self.settings.RETRY_BACKOFF_BASE,
+            backoff_max=self.settings.RETRY_BACKOFF_MAX
+        )
+
+    async def get_rates(self, tokens: List[str], currency: str = "usd") -> Dict[str, float]:
+        """Get token prices from tonapi rates, keyed by the requested token"""
+        key = ",".join(tokens)
+        data = await self.flight.do(
+            ("get_rates", key, currency),
+            lambda: self.transport.get_json("/rates", params={"tokens": key, "currencies": currency})
+        )
+        prices = {}
+        for token, rate in (data or {}).get("rates", {}).items():
+            price = rate.get("prices", {}).get(currency.upper())
+            if price is not None:
+                prices[self._token_key(token)] = float(price)
+        return {
+            token: prices[self._token_key(token)]
+            for token in tokens
+            if self._token_key(token) in prices
+        }
+
+    @staticmethod
+    def _token_key(token: str) -> str:
+        """Normalize jetton addresses so friendly and raw forms match"""
         try:
-            async with self.session.get(
-                f"{self.base_url}/accounts/{address}/jettons"
-            ) as response:
-                if response.status == 200:
-                    return await response.json()
-                return None
-        except Exception:
-            return None 
\ No newline at end of file
+            return to_raw_address(token)
+        except ValueError:
+            return token.lower()
+
+    async def _cached_get(
+        self,
+        cache_key: str,
+        flight_key: tuple,
+        path: str,
+        use_cache: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """Serve from cache, otherwise share one in-flight request per key; the result is cached either way"""
+        if use_cache and self.cache and (cached := self.cache.get(cache_key, self.CACHE_NAMESPACE)):
+            return cached
+
+        data = await self.flight.do(flight_key, lambda: self._get(path))
+        if data and self.cache:
+            self.cache.set(cache_key, data, self.CACHE_NAMESPACE)
+        return data
+
+    async def _get(self, path: str) -> Optional[Dict[str, Any]]:
+        """Perform a GET request against tonapi; None means not found"""
+        return await self.transport.get_json(path)
@@ -0,0 +1,112 @@
+import asyncio
+import random
+from typing import AsyncIterator, Dict, NamedTuple, Optional
+import aiohttp
+from ...utils.errors import APIError
+from ...utils.logging import logger
+
+
+class SseEvent(NamedTuple):
+    id: Optional[str]
+    event: str
+    data: str
+
+
+class SseStream:
+    """
+    Server-sent events consumer that reconnects and resumes
+
+    ``events()`` yields events forever. After a dropped connection, an idle
+    timeout or an error status it reconnects with jittered exponential
+    backoff (or the server's ``retry:`` hint), sending the last seen event id
+    as ``Last-Event-ID`` so the server can resume where it left off. Events
+    are pulled one at a time, so a slow consumer stops reads from the socket
+    instead of buffering the stream in memory.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, str]] = None,
+        idle_timeout: float = 60,
+        connect_timeout: float = 5,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30,
+        max_line: int = 1024 * 1024
+    ):
+        self.url = url
+        self.headers = headers or {}
+        self.params = params or {}
+        self.idle_timeout = idle_timeout
+        self.connect_timeout = connect_timeout
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_line = max_line
+        self.last_event_id: Optional[str] = None
+        self.retry_delay: Optional[float] = None
+        self.connects = 0
+        self.session: Optional[aiohttp.ClientSession] = None
+
+    async def close(self) -> None:
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    async def events(self) -> AsyncIterator[SseEvent]:
+        """Yield events, reconnecting until the consumer stops iterating"""
+        failures = 0
+        while True:
+            try:
+                async for event in self._stream():
+                    failures = 0
+                    yield event
+                logger.warning("SSE stream %s closed by server", self.url)
+            except (aiohttp.ClientError, asyncio.TimeoutError, APIError, ValueError) as e:
+                logger.warning("SSE stream %s failed: %r", self.url, e)
+            failures += 1
+            await asyncio.sleep(self._backoff(failures))
+
+    def _backoff(self, failures: int) -> float:
+        if self.retry_delay is not None and failures == 1:
+            return self.retry_delay
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (failures - 1)))
+
+    async def _stream(self) -> AsyncIterator[SseEvent]:
+        """One connection: parse the event stream until it ends"""
+        if self.session is None:
+            self.session = aiohttp.ClientSession(read_bufsize=self.max_line)
+
+        headers = {"Accept": "text/event-stream", **self.headers}
+        if self.last_event_id is not None:
+            headers["Last-Event-ID"] = self.last_event_id
+        timeout = aiohttp.ClientTimeout(total=None, connect=self.connect_timeout, sock_read=self.idle_timeout)
+
+        async with self.session.get(self.url, params=self.params, headers=headers, timeout=timeout) as response:
+            if response.status != 200:
+                raise APIError(f"SSE stream returned HTTP {response.status}")
+            self.connects += 1
+
+            event_id, event_type, data = None, "message", []
+            async for raw in response.content:
+                line = raw.decode("utf-8").rstrip("\r\n")
+                if not line:
+                    if data:
+                        if event_id is not None:
+                            self.last_event_id = event_id
+                        yield SseEvent(self.last_event_id, event_type, "\n".join(data))
+                    event_id, event_type, data = None, "message", []
+                    continue
+                if line.startswith(":"):
+                    continue
+                field, _, value = line.partition(":")
+                if value.startswith(" "):
+                    value = value[1:]
+                if field == "data":
+                    data.append(value)
+                elif field == "event":
+                    event_type = value
+                elif field == "id":
+                    event_id = value
+                elif field == "retry" and value.isdigit():
+                    self.retry_delay = int(value) / 1000
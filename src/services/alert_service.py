@@ -0,0 +1,170 @@
+import asyncio
+import secrets
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+from ..core.alert_index import AlertIndex
+from ..core.models.alert import Alert, ABOVE, BELOW
+from ..core.models.price import PriceQuote
+from ..infrastructure.storage.base import Repository
+from .price_service import PriceService
+from ..app.config import get_settings
+from ..utils.errors import ValidationError
+from ..utils.logging import logger
+
+AlertListener = Callable[[Alert, float], Awaitable[None]]
+
+class AlertService:
+    """
+    Price alerts evaluated on every price refresh
+
+    Alerts live in an :class:`AlertIndex` so a tick only touches the alerts it
+    crosses. One-shot alerts are removed once they fire; repeating alerts stay
+    armed and are muted for ``cooldown`` seconds after each notification.
+    """
+
+    def __init__(self, alert_repository: Repository[Alert], price_service: PriceService):
+        self.alert_repository = alert_repository
+        self.price_service = price_service
+        self.settings = get_settings()
+        self.index = AlertIndex()
+        self._alerts: Dict[str, Alert] = {}
+        self._by_user: Dict[str, Set[str]] = {}
+        self._last_prices: Dict[str, float] = {}
+        self._listeners: List[AlertListener] = []
+        price_service.add_listener(self.on_prices)
+
+    async def load(self) -> None:
+        """Load persisted alerts into the index"""
+        alerts = [alert async for alert in self.alert_repository.iterate()]
+        self._alerts = {alert.id: alert for alert in alerts}
+        self._by_user = {}
+        for alert in alerts:
+            self._by_user.setdefault(alert.user_id, set()).add(alert.id)
+        self.index.load(alerts)
+        for symbol, quote in self.price_service.prices.items():
+            self._last_prices[symbol] = quote.value
+        logger.info("Loaded %s price alerts", len(alerts))
+
+    def add_listener(self, listener: AlertListener) -> None:
+        """Call ``listener(alert, price)`` for every fired alert"""
+        self._listeners.append(listener)
+
+    async def create_alert(
+        self,
+        user_id: str,
+        chat_id: int,
+        symbol: str,
+        threshold: float,
+        direction: Optional[str] = None,
+        repeat: bool = False,
+        cooldown: Optional[float] = None
+    ) -> Alert:
+        """Create an alert; the direction defaults to the side opposite the current price"""
+        symbol = symbol.upper()
+        if threshold <= 0:
+            raise ValidationError(f"Invalid threshold {threshold}", "❌ The price must be positive.")
+        if len(self._by_user.get(user_id, ())) >= self.settings.MAX_ALERTS_PER_USER:
+            raise ValidationError(
+                f"User {user_id} reached the alert limit",
+                f"❌ You can have at most {self.settings.MAX_ALERTS_PER_USER} alerts."
+            )
+
+        current = self.price_service.get_price(symbol)
+        if current is None:
+            raise ValidationError(f"No price for {symbol}", f"❌ {symbol} price is not available yet.")
+        if direction is None:
+            direction = ABOVE if threshold > current else BELOW
+        if (direction == ABOVE and current >= threshold) or (direction == BELOW and current <= threshold):
+            raise ValidationError(
+                f"{symbol} is already {direction} {threshold}",
+                f"❌ {symbol} is already {direction} ${threshold:g}."
+            )
+
+        alert = Alert(
+            id=secrets.token_hex(6),
+            user_id=user_id,
+            chat_id=chat_id,
+            symbol=symbol,
+            direction=direction,
+            threshold=threshold,
+            repeat=repeat,
+            cooldown=self.settings.ALERT_COOLDOWN if cooldown is None else cooldown
+        )
+        await self.alert_repository.save(alert.id, alert)
+        self._track(alert)
+        self._last_prices.setdefault(symbol, current)
+        return alert
+
+    async def delete_alert(self, user_id: str, alert_id: str) -> bool:
+        """Delete one of the user's alerts"""
+        alert = self._alerts.get(alert_id)
+        if alert is None or alert.user_id != user_id:
+            return False
+        self._untrack(alert)
+        await self.alert_repository.delete(alert.id)
+        return True
+
+    def list_alerts(self, user_id: str) -> List[Alert]:
+        alerts = [self._alerts[id] for id in self._by_user.get(user_id, ())]
+        return sorted(alerts, key=lambda alert: alert.created_at)
+
+    def __len__(self) -> int:
+        return len(self._alerts)
+
+    async def on_prices(self, quotes: Dict[str, PriceQuote]) -> None:
+        """Price listener: fire every alert crossed since the previous tick"""
+        fired = []
+        for symbol, quote in quotes.items():
+            previous = self._last_prices.get(symbol)
+            self._last_prices[symbol] = quote.value
+            fired.extend(self.evaluate(symbol, previous, quote.value, quote.updated_at))
+        if not fired:
+            return
+
+        writes = []
+        for alert, _ in fired:
+            if alert.repeat:
+                writes.append(self.alert_repository.save(alert.id, alert))
+            else:
+                writes.append(self.alert_repository.delete(alert.id))
+        # Concurrent writes share one group commit
+        await asyncio.gather(*writes)
+
+        for alert, price in fired:
+            for listener in self._listeners:
+                try:
+                    await listener(alert, price)
+                except Exception as e:
+                    logger.error("Alert listener failed for %s: %s", alert.id, e)
+
+    def evaluate(self, symbol: str, previous: Optional[float], current: float, now: Optional[float] = None):
+        """Update index state for one tick and return the ``(alert, price)`` pairs that fire"""
+        now = time.time() if now is None else now
+        fired = []
+        # One-shot alerts always fire and leave the index together
+        for alert in self.index.take_crossed(symbol, previous, current):
+            if alert.repeat and alert.cooling_down(now):
+                continue
+            alert.last_triggered = now
+            fired.append((alert, current))
+            if not alert.repeat:
+                self._forget(alert)
+        return fired
+
+    def _track(self, alert: Alert) -> None:
+        self._alerts[alert.id] = alert
+        self._by_user.setdefault(alert.user_id, set()).add(alert.id)
+        self.index.add(alert)
+
+    def _untrack(self, alert: Alert) -> None:
+        self._forget(alert)
+        self.index.remove(alert)
+
+    def _forget(self, alert: Alert) -> None:
+        """Drop an alert from the id and user maps, leaving the index alone"""
+        self._alerts.pop(alert.id, None)
+        ids = self._by_user.get(alert.user_id)
+        if ids:
+            ids.discard(alert.id)
+            if not ids:
+                del self._by_user[alert.user_id]
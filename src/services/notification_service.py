@@ -0,0 +1,264 @@
+import asyncio
+import heapq
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+from telegram import Bot
+from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter
+from ..app.config import get_settings
+from ..infrastructure.http.rate_limiter import TokenBucket
+from ..utils.logging import logger
+
+@dataclass
+class Notification:
+    chat_id: int
+    text: str
+    parse_mode: Optional[str] = 'Markdown'
+    queued_at: float = field(default_factory=time.monotonic)
+    attempts: int = 0
+
+class _ChatQueue:
+    __slots__ = ("chat_id", "pending", "next_send", "sending", "scheduled")
+
+    def __init__(self, chat_id: int):
+        self.chat_id = chat_id
+        self.pending: Deque[Notification] = deque()
+        self.next_send = 0.0
+        self.sending = False
+        self.scheduled = False
+
+class NotificationDispatcher:
+    """
+    Outbound message queue that stays inside Telegram's flood limits
+
+    Every chat has its own queue and may send at most once per
+    ``chat_interval`` (longer for groups). Chats whose turn has come are
+    served round-robin, so one busy chat can't starve the others, and each
+    send takes a token from a global bucket sized below Telegram's ~30
+    messages per second. Notifications that pile up for a chat while it waits
+    are merged into a single message. ``RetryAfter`` pauses the whole
+    dispatcher for the requested time and requeues the message.
+    """
+
+    MAX_MESSAGE_LENGTH = 4096
+    SEPARATOR = "\n\n"
+
+    def __init__(
+        self,
+        global_rate: Optional[float] = None,
+        chat_interval: Optional[float] = None,
+        group_interval: Optional[float] = None,
+        max_pending_per_chat: Optional[int] = None,
+        concurrency: Optional[int] = None,
+        max_attempts: int = 3
+    ):
+        settings = get_settings()
+        self.enabled = settings.ENABLE_NOTIFICATIONS
+        self.global_rate = global_rate or settings.NOTIFY_GLOBAL_RATE
+        self.chat_interval = chat_interval if chat_interval is not None else settings.NOTIFY_CHAT_INTERVAL
+        self.group_interval = group_interval if group_interval is not None else settings.NOTIFY_GROUP_INTERVAL
+        self.max_pending_per_chat = max_pending_per_chat or settings.NOTIFY_MAX_PENDING_PER_CHAT
+        self.concurrency = concurrency or settings.NOTIFY_CONCURRENCY
+        self.max_attempts = max_attempts
+        self.bucket = TokenBucket(self.global_rate, capacity=1)
+        self.bot: Optional[Bot] = None
+
+        self._chats: Dict[int, _ChatQueue] = {}
+        self._ready: Deque[int] = deque()
+        self._delayed: List[Tuple[float, int]] = []
+        self._inflight: Set[asyncio.Task] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._task: Optional[asyncio.Task] = None
+
+        self.sent_messages = 0
+        self.sent_notifications = 0
+        self.coalesced = 0
+        self.retry_after = 0
+        self.failed = 0
+        self.dropped = 0
+        self.total_delay = 0.0
+        self._sent_at: Deque[float] = deque(maxlen=1000)
+
+    async def start(self, bot: Bot) -> None:
+        """Start delivering through ``bot``"""
+        self.bot = bot
+        if not self._task:
+            self._wakeup = asyncio.Event()
+            self._slots = asyncio.Semaphore(self.concurrency)
+            self._task = asyncio.create_task(self._run())
+            if self._chats:
+                self._wakeup.set()
+
+    async def stop(self, drain_timeout: float = 5) -> None:
+        """Deliver what is queued within ``drain_timeout``, then stop"""
+        if not self._task:
+            return
+        try:
+            await asyncio.wait_for(self.drain(), drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Dropping %s undelivered notifications on shutdown", self.queued)
+        self._task.cancel()
+        for task in list(self._inflight):
+            task.cancel()
+        await asyncio.gather(self._task, *self._inflight, return_exceptions=True)
+        self._task = None
+
+    async def drain(self) -> None:
+        """Wait until every queued notification was delivered or dropped"""
+        while self._chats and any(chat.pending or chat.sending for chat in self._chats.values()):
+            await asyncio.sleep(0.05)
+
+    def notify(self, chat_id: int, text: str, parse_mode: Optional[str] = 'Markdown') -> bool:
+        """Queue a message for a chat; returns False when notifications are disabled"""
+        if not self.enabled:
+            return False
+        chat = self._chats.get(chat_id)
+        if chat is None:
+            chat = self._chats[chat_id] = _ChatQueue(chat_id)
+        if len(chat.pending) >= self.max_pending_per_chat:
+            chat.pending.popleft()
+            self.dropped += 1
+        chat.pending.append(Notification(chat_id, text, parse_mode))
+        self._schedule(chat)
+        return True
+
+    @property
+    def queued(self) -> int:
+        return sum(len(chat.pending) for chat in self._chats.values())
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        recent = sum(1 for sent in self._sent_at if now - sent <= 10)
+        return {
+            "sent_messages": self.sent_messages,
+            "sent_notifications": self.sent_notifications,
+            "coalesced": self.coalesced,
+            "retry_after": self.retry_after,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "queued": self.queued,
+            "chats": len(self._chats),
+            "messages_per_second": recent / 10,
+            "avg_delay": self.total_delay / self.sent_notifications if self.sent_notifications else 0.0
+        }
+
+    def _schedule(self, chat: _ChatQueue) -> None:
+        """Put an idle chat into the ready ring or the delay heap"""
+        if chat.scheduled or chat.sending:
+            return
+        chat.scheduled = True
+        if chat.next_send <= time.monotonic():
+            self._ready.append(chat.chat_id)
+        else:
+            heapq.heappush(self._delayed, (chat.next_send, chat.chat_id))
+        if self._wakeup:
+            self._wakeup.set()
+
+    def _promote_due(self) -> None:
+        now = time.monotonic()
+        while self._delayed and self._delayed[0][0] <= now:
+            _, chat_id = heapq.heappop(self._delayed)
+            chat = self._chats.get(chat_id)
+            if chat is None:
+                continue
+            chat.scheduled = False
+            if chat.pending:
+                self._schedule(chat)
+            elif not chat.sending:
+                # Interval elapsed with nothing to send: forget the chat
+                del self._chats[chat_id]
+
+    async def _run(self) -> None:
+        while True:
+            self._promote_due()
+            if not self._ready:
+                timeout = self._delayed[0][0] - time.monotonic() if self._delayed else None
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            delay = self.bucket.time_until_available()
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+            await self._slots.acquire()
+            if not self.bucket.try_acquire():
+                self._slots.release()
+                continue
+
+            chat = self._chats[self._ready.popleft()]
+            chat.scheduled = False
+            if not chat.pending:
+                self._slots.release()
+                continue
+            chat.sending = True
+            batch = self._take_batch(chat)
+            task = asyncio.create_task(self._send(chat, batch))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    def _take_batch(self, chat: _ChatQueue) -> List[Notification]:
+        """Merge queued notifications with the same parse mode into one message"""
+        batch = [chat.pending.popleft()]
+        length = len(batch[0].text)
+        while chat.pending:
+            candidate = chat.pending[0]
+            length += len(self.SEPARATOR) + len(candidate.text)
+            if candidate.parse_mode != batch[0].parse_mode or length > self.MAX_MESSAGE_LENGTH:
+                break
+            batch.append(chat.pending.popleft())
+        return batch
+
+    async def _send(self, chat: _ChatQueue, batch: List[Notification]) -> None:
+        interval = self.group_interval if chat.chat_id < 0 else self.chat_interval
+        chat.next_send = time.monotonic() + interval
+        try:
+            await self.bot.send_message(
+                chat.chat_id,
+                self.SEPARATOR.join(notification.text for notification in batch),
+                parse_mode=batch[0].parse_mode,
+                disable_web_page_preview=True
+            )
+            now = time.monotonic()
+            self.sent_messages += 1
+            self.sent_notifications += len(batch)
+            self.coalesced += len(batch) - 1
+            self.total_delay += sum(now - notification.queued_at for notification in batch)
+            self._sent_at.append(now)
+        except RetryAfter as e:
+            retry_after = float(e.retry_after)
+            logger.warning("Telegram flood control: pausing notifications for %ss", retry_after)
+            self.retry_after += 1
+            self.bucket.penalize(retry_after)
+            chat.next_send = max(chat.next_send, time.monotonic() + retry_after)
+            chat.pending.extendleft(reversed(batch))
+        except Forbidden as e:
+            logger.info("Dropping notifications for chat %s: %s", chat.chat_id, e)
+            self.failed += len(batch) + len(chat.pending)
+            chat.pending.clear()
+        except BadRequest as e:
+            logger.error("Telegram rejected a notification for chat %s: %s", chat.chat_id, e)
+            self.failed += len(batch)
+        except NetworkError as e:
+            retry = [notification for notification in batch if notification.attempts + 1 < self.max_attempts]
+            for notification in retry:
+                notification.attempts += 1
+            self.failed += len(batch) - len(retry)
+            chat.pending.extendleft(reversed(retry))
+            logger.warning("Notification to chat %s failed: %s", chat.chat_id, e)
+        except Exception as e:
+            logger.error("Notification to chat %s failed: %s", chat.chat_id, e)
+            self.failed += len(batch)
+        finally:
+            chat.sending = False
+            self._slots.release()
+            # Keep the chat until its interval passes so a new notification
+            # can't be sent early
+            chat.scheduled = True
+            heapq.heappush(self._delayed, (chat.next_send, chat.chat_id))
+            self._wakeup.set()
@@ -1,13 +1,30 @@
 import asyncio
-from typing import Dict, Optional
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+from ..core.models.price import PriceQuote
 from ..infrastructure.price_api.client import PriceApiClient
+from ..infrastructure.price_history.store import PriceHistory
+from ..infrastructure.ton_api.client import TonApiClient
+from ..infrastructure.http.rate_limiter import Priority, request_priority
 from ..app.config import get_settings
+from ..utils.logging import logger
+
+PriceListener = Callable[[Dict[str, PriceQuote]], Awaitable[None]]
 
 class PriceService:
-    def __init__(self, price_client: PriceApiClient):
+    def __init__(
+        self,
+        price_client: PriceApiClient,
+        ton_client: Optional[TonApiClient] = None,
+        history: Optional[PriceHistory] = None
+    ):
         self.price_client = price_client
+        self.ton_client = ton_client
+        self.history = history
         self.settings = get_settings()
-        self.prices: Dict[str, float] = {}
+        self.prices: Dict[str, PriceQuote] = {}
+        self.version = 0
+        self._listeners: List[PriceListener] = []
         self._task: Optional[asyncio.Task] = None
         
     async def start(self):
@@ -27,23 +44,97 @@ class PriceService:
             
     async def _track_prices(self):
         """Track prices in background"""
+        # Refreshes yield upstream quota to interactive handler requests
+        request_priority.set(Priority.BACKGROUND)
         while True:
             try:
-                # Get TON price
-                ton_price = await self.price_client.get_ton_price()
-                if ton_price:
-                    self.prices['TON'] = ton_price
-                    # Calculate BOLT price based on TON price
-                    self.prices['BOLT'] = ton_price * 0.012
-                    
+                await self.refresh()
+                
                 # Wait for next update
                 await asyncio.sleep(self.settings.PRICE_UPDATE_INTERVAL)
                 
             except asyncio.CancelledError:
                 break
-            except Exception:
+            except Exception as e:
+                logger.error("Price tracking failed: %s", e)
                 await asyncio.sleep(60)  # Wait on error
                 
+    async def refresh(self) -> Dict[str, float]:
+        """Refresh every tracked asset with one request per price source"""
+        results = await asyncio.gather(
+            self._fetch_market_prices(),
+            self._fetch_jetton_prices(),
+            return_exceptions=True
+        )
+        
+        now = time.time()
+        stale_after = self.settings.PRICE_STALE_AFTER
+        updated: Dict[str, float] = {}
+        quotes: Dict[str, PriceQuote] = {}
+        for source, result in zip(("coingecko", "tonapi"), results):
+            if isinstance(result, Exception):
+                logger.warning("Price refresh from %s failed: %s", source, result)
+                continue
+            for symbol, value in result.items():
+                quote = PriceQuote(symbol, value, now, source, stale_after)
+                self.prices[symbol] = quotes[symbol] = quote
+                updated[symbol] = value
+                if self.history:
+                    self.history.record(symbol, value, now)
+                
+        if updated:
+            self.version += 1
+            if self.history:
+                await self.history.persist()
+            await self._notify(quotes)
+        return updated
+        
+    def add_listener(self, listener: PriceListener) -> None:
+        """Call ``listener`` with the updated quotes after every refresh"""
+        self._listeners.append(listener)
+        
+    async def _notify(self, quotes: Dict[str, PriceQuote]) -> None:
+        for listener in self._listeners:
+            try:
+                await listener(quotes)
+            except Exception as e:
+                logger.error("Price listener %r failed: %s", listener, e)
+        
+    async def _fetch_market_prices(self) -> Dict[str, float]:
+        """Prices of CoinGecko-listed assets in one simple/price call"""
+        assets = self.settings.TRACKED_ASSETS
+        if not assets:
+            return {}
+        prices = await self.price_client.get_prices(list(assets.values()))
+        return {
+            symbol: prices[coin_id]
+            for symbol, coin_id in assets.items()
+            if coin_id in prices
+        }
+        
+    async def _fetch_jetton_prices(self) -> Dict[str, float]:
+        """Prices of tracked jettons from tonapi rates in one call"""
+        jettons = self.settings.TRACKED_JETTONS
+        if not jettons or not self.ton_client:
+            return {}
+        rates = await self.ton_client.get_rates(list(jettons.values()))
+        return {
+            symbol: rates[address]
+            for symbol, address in jettons.items()
+            if address in rates
+        }
+        
     def get_price(self, symbol: str) -> Optional[float]:
         """Get current price for symbol"""
-        return self.prices.get(symbol.upper()) 
\ No newline at end of file
+        quote = self.prices.get(symbol.upper())
+        return quote.value if quote else None
+        
+    def get_quote(self, symbol: str) -> Optional[PriceQuote]:
+        """Get current price with its timestamp and source"""
+        return self.prices.get(symbol.upper())
+        
+    def get_change(self, symbol: str, hours: float = 24) -> Optional[float]:
+        """Percent price change over the last N hours, if history covers it"""
+        if not self.history:
+            return None
+        return self.history.change_percent(symbol, hours)
@@ -0,0 +1,248 @@
+import asyncio
+import heapq
+from typing import Optional, List, AsyncIterator, Dict
+from ..core.models.wallet import WalletSnapshot
+from ..infrastructure.cache.memory_cache import MemoryCache
+from ..infrastructure.ton_api.client import TonApiClient
+from ..infrastructure.http.rate_limiter import Priority, request_priority
+from .price_service import PriceService
+from ..app.config import get_settings
+from ..utils.errors import APIError
+from ..utils.singleflight import SingleFlight
+from ..utils.logging import logger
+
+class WalletService:
+    """
+    Builds wallet snapshots shared by every handler that shows wallet data
+
+    Snapshots are fresh for ``WALLET_CACHE_TTL``. For ``WALLET_STALE_TTL``
+    after that they are still served immediately while one background task
+    revalidates them. Lookups are counted with exponential decay, and the
+    most requested addresses are refreshed before they go stale, so hot
+    wallets never wait on tonapi and refreshes cost at most a few requests
+    per address per TTL.
+    """
+
+    CACHE_NAMESPACE = "wallet"
+    DEMAND_DECAY = 0.5  # applied to lookup counts every prefetch interval
+    DEMAND_FLOOR = 0.25  # addresses whose count decays below this are forgotten
+    PREFETCH_MIN_DEMAND = 2.0  # decayed lookups before an address is prefetched
+
+    def __init__(
+        self,
+        ton_client: TonApiClient,
+        price_service: PriceService,
+        cache: Optional[MemoryCache] = None,
+        timeout: Optional[float] = None
+    ):
+        self.ton_client = ton_client
+        self.price_service = price_service
+        self.cache = cache
+        self.settings = get_settings()
+        self.timeout = timeout if timeout is not None else self.settings.WALLET_QUERY_TIMEOUT
+        self.fresh_ttl = self.settings.WALLET_CACHE_TTL
+        self.stale_ttl = self.settings.WALLET_STALE_TTL
+        self.prefetch_interval = self.settings.WALLET_PREFETCH_INTERVAL
+        self.flight = SingleFlight()
+        self.demand: Dict[str, float] = {}
+        self._refreshes: Dict[str, asyncio.Task] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_failures = 0
+
+    async def start(self):
+        """Start prefetching hot addresses"""
+        if self.cache and not self._task:
+            self._task = asyncio.create_task(self._prefetch_loop())
+
+    async def stop(self):
+        """Stop prefetching and cancel pending refreshes"""
+        tasks = list(self._refreshes.values())
+        if self._task:
+            tasks.append(self._task)
+            self._task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "fresh_hits": self.fresh_hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refresh_failures": self.refresh_failures,
+            "tracked_addresses": len(self.demand)
+        }
+
+    async def get_snapshot(self, address: str) -> WalletSnapshot:
+        """Get a wallet snapshot, serving a cached one and revalidating it once stale"""
+        self.demand[address] = self.demand.get(address, 0.0) + 1
+        if self.cache and (cached := self.cache.get(f"snapshot:{address}", self.CACHE_NAMESPACE)):
+            if cached.age < self.fresh_ttl:
+                self.fresh_hits += 1
+            else:
+                self.stale_hits += 1
+                self.refresh(address)
+            return cached
+
+        self.misses += 1
+        snapshot = await self.flight.do(("snapshot", address), lambda: self._fetch(address))
+        self._store(snapshot)
+        return snapshot
+
+    def refresh(self, address: str) -> asyncio.Task:
+        """Refetch a snapshot in the background, at most once at a time per address"""
+        task = self._refreshes.get(address)
+        if task is None:
+            task = asyncio.create_task(self._refresh(address))
+            self._refreshes[address] = task
+            task.add_done_callback(lambda _: self._refreshes.pop(address, None))
+        return task
+
+    async def _refresh(self, address: str) -> None:
+        # Refreshes yield upstream quota to interactive lookups
+        request_priority.set(Priority.BACKGROUND)
+        self.refreshes += 1
+        try:
+            snapshot = await self.flight.do(("snapshot", address), lambda: self._fetch(address))
+        except Exception as e:
+            # The stale snapshot keeps being served until its window ends
+            self.refresh_failures += 1
+            logger.warning("Wallet refresh for %s failed: %s", address, e, sample=0.1)
+            return
+        self._store(snapshot)
+
+    def _store(self, snapshot: WalletSnapshot) -> None:
+        """Cache a complete snapshot for its fresh and stale windows"""
+        if self.cache and snapshot.found and not snapshot.partial:
+            self.cache.set(
+                f"snapshot:{snapshot.address}", snapshot, self.CACHE_NAMESPACE,
+                ttl=self.fresh_ttl + self.stale_ttl
+            )
+
+    def hot_addresses(self) -> List[str]:
+        """Pinned addresses followed by the most requested ones"""
+        top = heapq.nlargest(self.settings.WALLET_PREFETCH_TOP, self.demand.items(), key=lambda item: item[1])
+        hot = [address for address, demand in top if demand >= self.PREFETCH_MIN_DEMAND]
+        pinned = self.settings.WALLET_PREFETCH_ADDRESSES
+        return pinned + [address for address in hot if address not in pinned]
+
+    async def prefetch(self) -> int:
+        """Refresh hot addresses that would go stale before the next pass"""
+        due = []
+        for address in self.hot_addresses():
+            cached = self.cache.get(f"snapshot:{address}", self.CACHE_NAMESPACE)
+            if cached is None or cached.age >= self.fresh_ttl - self.prefetch_interval:
+                due.append(address)
+        await asyncio.gather(*(self.refresh(address) for address in due))
+
+        # Old lookups fade out so the ranking follows current traffic
+        decayed = ((address, demand * self.DEMAND_DECAY) for address, demand in self.demand.items())
+        self.demand = {address: demand for address, demand in decayed if demand >= self.DEMAND_FLOOR}
+        return len(due)
+
+    async def _prefetch_loop(self):
+        """Keep hot addresses fresh in background"""
+        while True:
+            try:
+                refreshed = await self.prefetch()
+                if refreshed:
+                    logger.debug("Prefetched %d wallet snapshots", refreshed)
+                await asyncio.sleep(self.prefetch_interval)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error("Wallet prefetch failed: %s", e)
+                await asyncio.sleep(self.prefetch_interval)
+
+    async def _fetch(self, address: str) -> WalletSnapshot:
+        """Fetch account and jettons concurrently under one deadline"""
+        # Snapshots are cached here, so the client's raw cache would only hide how old the data is
+        account_task = asyncio.create_task(self.ton_client.get_account_info(address, use_cache=False))
+        jettons_task = asyncio.create_task(self.ton_client.get_jettons(address, use_cache=False))
+        done, pending = await asyncio.wait({account_task, jettons_task}, timeout=self.timeout)
+        for task in pending:
+            task.cancel()
+
+        # Stamped once the upstream responses are in, which is the age shown to users
+        snapshot = WalletSnapshot(address=address)
+        errors = []
+
+        if account_task in done and not account_task.exception():
+            account = account_task.result()
+            if account is None:
+                snapshot.found = False
+                return snapshot
+            snapshot.status = account.get('status')
+            snapshot.ton_balance = WalletSnapshot.parse_ton_balance(account)
+        else:
+            snapshot.missing.append('account')
+            if account_task in done:
+                errors.append(account_task.exception())
+
+        if jettons_task in done and not jettons_task.exception():
+            snapshot.jettons = WalletSnapshot.parse_jettons(jettons_task.result() or {})
+            self._fill_prices(snapshot)
+        else:
+            snapshot.missing.append('jettons')
+            if jettons_task in done:
+                errors.append(jettons_task.exception())
+
+        if len(snapshot.missing) == 2:
+            if errors:
+                raise errors[0]
+            raise APIError(
+                f"Wallet query for {address} timed out",
+                self.settings.ERROR_MESSAGES["timeout"]
+            )
+        if snapshot.partial:
+            logger.warning("Partial wallet snapshot for %s: missing %s", address, snapshot.missing)
+        return snapshot
+
+    async def stream_snapshots(self, addresses: List[str]) -> AsyncIterator[WalletSnapshot]:
+        """
+        Yield snapshots for many wallets as they complete
+
+        Accounts come from one bulk lookup; jetton balances are fetched with
+        bounded concurrency since tonapi has no bulk endpoint for them.
+        """
+        accounts = await self.ton_client.get_accounts_bulk(addresses)
+        semaphore = asyncio.Semaphore(self.settings.TON_API_FANOUT_CONCURRENCY)
+
+        async def build(address: str) -> WalletSnapshot:
+            account = accounts.get(address)
+            snapshot = WalletSnapshot(address=address)
+            if account is None:
+                snapshot.found = False
+                return snapshot
+            snapshot.status = account.get('status')
+            snapshot.ton_balance = WalletSnapshot.parse_ton_balance(account)
+            try:
+                async with semaphore:
+                    jettons = await asyncio.wait_for(
+                        self.ton_client.get_jettons(address), self.timeout
+                    )
+                snapshot.jettons = WalletSnapshot.parse_jettons(jettons or {})
+                self._fill_prices(snapshot)
+            except (APIError, asyncio.TimeoutError) as e:
+                logger.warning("Jettons unavailable for %s: %s", address, e)
+                snapshot.missing.append('jettons')
+            return snapshot
+
+        tasks = [asyncio.create_task(build(address)) for address in addresses]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _fill_prices(self, snapshot: WalletSnapshot) -> None:
+        """Use tracked prices for jettons tonapi didn't price"""
+        for jetton in snapshot.jettons:
+            if jetton.price_usd is None:
+                jetton.price_usd = self.price_service.get_price(jetton.symbol)
@@ -0,0 +1,175 @@
+import asyncio
+import json
+from collections import OrderedDict
+from typing import Awaitable, Callable, Dict, List, Optional
+from ..core.models.whale import WhaleSubscription, WhaleTransfer
+from ..infrastructure.http.rate_limiter import Priority, request_priority
+from ..infrastructure.storage.base import Repository
+from ..infrastructure.ton_api.client import TonApiClient
+from ..infrastructure.ton_api.sse import SseStream
+from ..app.config import get_settings
+from ..utils.errors import APIError
+from ..utils.logging import logger
+
+WhaleListener = Callable[[WhaleTransfer, List[int]], Awaitable[None]]
+
+class WhaleService:
+    """
+    Streams large jetton transfers to subscribed chats
+
+    One reader task consumes the tonapi transaction stream for the watched
+    accounts into a bounded queue; when the queue is full the reader stops
+    pulling from the socket, so bursts are absorbed by TCP flow control
+    rather than memory. Worker tasks decode events (fetching the trace
+    when the stream only carries a transaction hash), drop transfers below
+    the threshold and publish each remaining one once to every subscriber.
+    """
+
+    SEEN_LIMIT = 4096
+
+    def __init__(
+        self,
+        ton_client: TonApiClient,
+        subscription_repository: Repository[WhaleSubscription],
+        stream: Optional[SseStream] = None
+    ):
+        self.ton_client = ton_client
+        self.subscription_repository = subscription_repository
+        self.settings = get_settings()
+        self.stream = stream
+        self.jetton = self.settings.WHALE_JETTON
+        self.min_amount = self.settings.WHALE_MIN_AMOUNT
+        self.subscriptions: Dict[int, WhaleSubscription] = {}
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=self.settings.WHALE_QUEUE_SIZE)
+        self._seen: "OrderedDict[str, None]" = OrderedDict()
+        self._listeners: List[WhaleListener] = []
+        self._tasks: List[asyncio.Task] = []
+        self.received = 0
+        self.published = 0
+        self.failed = 0
+
+    async def load(self) -> None:
+        """Load persisted subscriptions"""
+        self.subscriptions = {
+            subscription.chat_id: subscription
+            async for subscription in self.subscription_repository.iterate()
+        }
+
+    def add_listener(self, listener: WhaleListener) -> None:
+        """Call ``listener(transfer, chat_ids)`` once per published transfer"""
+        self._listeners.append(listener)
+
+    async def start(self) -> None:
+        """Start the stream reader and decode workers"""
+        if self._tasks:
+            return
+        if self.stream is None:
+            accounts = self.settings.WHALE_WATCH_ACCOUNTS
+            if not accounts:
+                logger.warning("Whale tracking enabled but WHALE_WATCH_ACCOUNTS is empty")
+                return
+            self.stream = self.ton_client.open_stream(
+                self.settings.WHALE_STREAM_PATH,
+                params={"accounts": ",".join(accounts)}
+            )
+        self._tasks = [asyncio.create_task(self._read())]
+        self._tasks.extend(
+            asyncio.create_task(self._work()) for _ in range(self.settings.WHALE_WORKERS)
+        )
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self.stream:
+            await self.stream.close()
+
+    async def subscribe(self, chat_id: int, min_amount: Optional[float] = None) -> WhaleSubscription:
+        """Subscribe a chat; it never receives transfers below the global threshold"""
+        subscription = WhaleSubscription(
+            id=str(chat_id),
+            chat_id=chat_id,
+            min_amount=max(self.min_amount, min_amount or 0)
+        )
+        await self.subscription_repository.save(subscription.id, subscription)
+        self.subscriptions[chat_id] = subscription
+        return subscription
+
+    async def unsubscribe(self, chat_id: int) -> bool:
+        if self.subscriptions.pop(chat_id, None) is None:
+            return False
+        await self.subscription_repository.delete(str(chat_id))
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "received": self.received,
+            "published": self.published,
+            "failed": self.failed,
+            "queue_depth": self.queue.qsize(),
+            "subscribers": len(self.subscriptions),
+            "connects": self.stream.connects if self.stream else 0
+        }
+
+    async def _read(self) -> None:
+        """Move stream events into the bounded queue"""
+        async for event in self.stream.events():
+            if event.event != "message":
+                continue  # heartbeats
+            try:
+                payload = json.loads(event.data)
+            except ValueError:
+                logger.warning("Skipping undecodable stream event %s", event.id)
+                continue
+            self.received += 1
+            await self.queue.put(payload)
+
+    async def _work(self) -> None:
+        # Trace lookups yield upstream quota to interactive requests
+        request_priority.set(Priority.BACKGROUND)
+        while True:
+            payload = await self.queue.get()
+            try:
+                for transfer in await self.decode(payload):
+                    await self._publish(transfer)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.failed += 1
+                logger.error("Failed to process stream event: %s", e)
+            finally:
+                self.queue.task_done()
+
+    async def decode(self, payload: dict) -> List[WhaleTransfer]:
+        """Turn a stream payload into qualifying transfers"""
+        event = payload
+        if "actions" not in payload:
+            event_id = payload.get("tx_hash") or payload.get("event_id")
+            if not event_id:
+                return []
+            event = await self.ton_client.get_event(event_id)
+            if event is None:
+                raise APIError(f"Event {event_id} not found")
+        return WhaleTransfer.parse(event, self.jetton, self.min_amount)
+
+    async def _publish(self, transfer: WhaleTransfer) -> None:
+        # Both sides of a transfer may be watched; publish it once
+        if transfer.key in self._seen:
+            return
+        self._seen[transfer.key] = None
+        if len(self._seen) > self.SEEN_LIMIT:
+            self._seen.popitem(last=False)
+
+        chat_ids = [
+            chat_id for chat_id, subscription in self.subscriptions.items()
+            if transfer.amount >= subscription.min_amount
+        ]
+        if not chat_ids:
+            return
+        self.published += 1
+        for listener in self._listeners:
+            try:
+                await listener(transfer, chat_ids)
+            except Exception as e:
+                logger.error("Whale listener failed for %s: %s", transfer.key, e)
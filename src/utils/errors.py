@@ -17,6 +17,14 @@ class APIError(BotError):
     """Raised when external API calls fail"""
     pass
 
+class CircuitOpenError(APIError):
+    """Raised when an upstream is cut off by its circuit breaker"""
+    pass
+
+class RateLimitError(APIError):
+    """Raised when a request can't get an upstream slot in time"""
+    pass
+
 class StorageError(BotError):
     """Raised when storage operations fail"""
     pass
@@ -34,7 +42,7 @@ async def handle_error(
         else:
             user_message = "An unexpected error occurred. Please try again later."
             
-        logger.error(f"Error handling update: {error}", exc_info=error)
+        logger.error("Error handling update: %s", error, exc_info=error)
         
         if update.callback_query:
             await update.callback_query.message.edit_text(
@@ -52,4 +60,4 @@ async def handle_error(
             )
             
     except Exception as e:
-        logger.error(f"Error in error handler: {e}", exc_info=e) 
\ No newline at end of file
+        logger.error("Error in error handler: %s", e, exc_info=e) 
\ No newline at end of file
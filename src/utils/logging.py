@@ -1,52 +1,162 @@
+import atexit
 import logging
+import queue
+import random
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import List, Optional
 from ..app.config import get_settings
 
+class RotatingLogFile(RotatingFileHandler):
+    """Rolls the log over when it reaches ``max_bytes`` or every ``interval`` seconds"""
+
+    def __init__(self, filename: Path, max_bytes: int, backup_count: int, interval: float):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+        self.interval = interval
+        self.rollover_at = time.time() + interval if interval else None
+
+    def shouldRollover(self, record: logging.LogRecord) -> int:
+        if self.rollover_at is not None and time.time() >= self.rollover_at:
+            return 1
+        return super().shouldRollover(record)
+
+    def doRollover(self) -> None:
+        super().doRollover()
+        if self.interval:
+            self.rollover_at = time.time() + self.interval
+
+class FieldsFormatter(logging.Formatter):
+    """Appends structured fields passed to the logger as ``key=value`` pairs"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = getattr(record, 'fields', None)
+        if not fields:
+            return line
+        pairs = ' '.join(f'{key}={value}' for key, value in fields.items())
+        head, newline, trace = line.partition('\n')
+        return f'{head} {pairs}{newline}{trace}'
+
+class DroppingQueueHandler(QueueHandler):
+    """Queue handler that drops records instead of blocking when the writer falls behind"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only the message is resolved here, since its arguments may change
+        # later; timestamps and tracebacks are formatted by the writer thread.
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
 class BotLogger:
-    def __init__(self):
+    """
+    Application logger that never writes on the event loop thread
+
+    Records go through a bounded queue to a listener thread that owns the
+    console and rotating file handlers. Messages take ``%`` style arguments
+    and are only formatted when their level is enabled; keyword arguments
+    become structured fields, and ``sample`` keeps a fraction of
+    high-volume events. Handlers and the writer thread are created when
+    the first record is logged, so importing the module does no I/O.
+    """
+
+    def __init__(
+        self,
+        name: str = 'bolt_bot',
+        level: Optional[int] = None,
+        log_dir: Optional[Path] = None,
+        handlers: Optional[List[logging.Handler]] = None
+    ):
         self.settings = get_settings()
-        self.logger = logging.getLogger('bolt_bot')
-        self._setup_logger()
-        
-    def _setup_logger(self):
+        self.logger = logging.getLogger(name)
+        self.log_dir = log_dir
+        self.handlers = handlers
+        self._started = False
+        self._listener: Optional[QueueListener] = None
+        self._setup_logger(level)
+
+    def _setup_logger(self, level: Optional[int]):
         """Setup logger configuration"""
-        # Create logs directory
-        log_dir = Path('logs')
-        log_dir.mkdir(exist_ok=True)
-        
         # Set logging level
-        level = logging.DEBUG if self.settings.DEBUG else logging.INFO
+        if level is None:
+            level = logging.DEBUG if self.settings.DEBUG else logging.INFO
         self.logger.setLevel(level)
-        
-        # Create handlers
-        file_handler = logging.FileHandler(
-            log_dir / 'bot.log',
-            encoding='utf-8'
-        )
-        console_handler = logging.StreamHandler()
-        
+
+        # The event loop only enqueues; the listener thread does the writing
+        self.queue_handler = DroppingQueueHandler(queue.Queue(self.settings.LOG_QUEUE_SIZE))
+        self.logger.addHandler(self.queue_handler)
+
+    def _start(self):
+        """Create the handlers and the writer thread on the first record, keeping imports free of I/O"""
+        self._started = True
+        if self.handlers is None:
+            log_dir = Path(self.log_dir or self.settings.LOG_DIR)
+            log_dir.mkdir(parents=True, exist_ok=True)
+            self.handlers = [
+                RotatingLogFile(
+                    log_dir / 'bot.log',
+                    max_bytes=self.settings.LOG_MAX_BYTES,
+                    backup_count=self.settings.LOG_BACKUP_COUNT,
+                    interval=self.settings.LOG_ROTATE_INTERVAL
+                ),
+                logging.StreamHandler()
+            ]
+
         # Create formatter
-        formatter = logging.Formatter(
+        formatter = FieldsFormatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
-        
-        # Add handlers
-        self.logger.addHandler(file_handler)
-        self.logger.addHandler(console_handler)
-        
-    def debug(self, msg: str):
-        self.logger.debug(msg)
-        
-    def info(self, msg: str):
-        self.logger.info(msg)
-        
-    def warning(self, msg: str):
-        self.logger.warning(msg)
-        
-    def error(self, msg: str, exc_info=True):
-        self.logger.error(msg, exc_info=exc_info)
+        for handler in self.handlers:
+            handler.setFormatter(formatter)
+
+        self._listener = QueueListener(self.queue_handler.queue, *self.handlers, respect_handler_level=True)
+        self._listener.start()
+        atexit.register(self.stop)
+
+    def stop(self):
+        """Flush queued records and write any later ones directly"""
+        if not self._listener:
+            return
+        self._listener.stop()
+        self._listener = None
+        self.logger.removeHandler(self.queue_handler)
+        for handler in self.handlers:
+            self.logger.addHandler(handler)
+
+    @property
+    def dropped(self) -> int:
+        return self.queue_handler.dropped
+
+    def _log(self, level: int, msg: str, args: tuple, fields: dict, sample: float, exc_info=None):
+        if not self.logger.isEnabledFor(level):
+            return
+        if sample < 1 and random.random() >= sample:
+            return
+        if not self._started:
+            self._start()
+        self.logger.log(level, msg, *args, exc_info=exc_info, extra={'fields': fields}, stacklevel=3)
+
+    def debug(self, msg: str, *args, sample: float = 1, **fields):
+        self._log(logging.DEBUG, msg, args, fields, sample)
+
+    def info(self, msg: str, *args, sample: float = 1, **fields):
+        self._log(logging.INFO, msg, args, fields, sample)
+
+    def warning(self, msg: str, *args, sample: float = 1, **fields):
+        self._log(logging.WARNING, msg, args, fields, sample)
+
+    def error(self, msg: str, *args, exc_info=True, **fields):
+        self._log(logging.ERROR, msg, args, fields, 1, exc_info)
 
 # Create global logger instance
-logger = BotLogger() 
\ No newline at end of file
+logger = BotLogger()
@@ -2,6 +2,14 @@ from functools import wraps
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import CallbackContext
 from .logging import logger
+from .metrics import registry
+from .rendering import Screen
+
+HANDLER_ERRORS = registry.counter(
+    "bot_handler_errors_total",
+    "Handler calls that raised, including errors answered by error_handler",
+    ["handler"]
+)
 
 def error_handler(func):
     """Decorator to handle errors in handlers"""
@@ -10,16 +18,20 @@ def error_handler(func):
         try:
             return await func(self, update, context, *args, **kwargs)
         except Exception as e:
-            logger.error(f"Error in {func.__name__}: {str(e)}")
+            logger.error("Error in %s: %s", func.__name__, e)
+            HANDLER_ERRORS.labels(func.__name__).inc()
             
             error_message = "❌ An error occurred. Please try again."
             keyboard = [[InlineKeyboardButton("⬅️ Back to Menu", callback_data="main_menu")]]
             
             if update.callback_query:
-                await update.callback_query.message.edit_text(
-                    error_message,
-                    reply_markup=InlineKeyboardMarkup(keyboard)
-                )
+                # Menu handlers edit through their screen cache so it knows what the message shows
+                screen = Screen(error_message, InlineKeyboardMarkup(keyboard), parse_mode=None)
+                screens = getattr(self, 'screens', None)
+                if screens:
+                    await screens.edit(update.callback_query, screen)
+                else:
+                    await update.callback_query.message.edit_text(screen.text, **screen.options())
             else:
                 await update.message.reply_text(
                     error_message,
@@ -0,0 +1,108 @@
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, NamedTuple, Optional, Tuple
+from telegram import CallbackQuery, InlineKeyboardMarkup, Message
+from telegram.error import BadRequest
+from .logging import logger
+
+class Screen(NamedTuple):
+    """A fully rendered message: text plus keyboard and send options"""
+    text: str
+    reply_markup: Optional[InlineKeyboardMarkup] = None
+    parse_mode: Optional[str] = 'Markdown'
+    disable_web_page_preview: Optional[bool] = None
+
+    def options(self) -> dict:
+        return {
+            "reply_markup": self.reply_markup,
+            "parse_mode": self.parse_mode,
+            "disable_web_page_preview": self.disable_web_page_preview
+        }
+
+def is_not_modified(error: BadRequest) -> bool:
+    return "message is not modified" in str(error).lower()
+
+class ScreenCache:
+    """
+    Rendered screens and what each message currently shows
+
+    Static screens are registered once; dynamic ones are rendered again only
+    when their key changes (for price screens, the price version). Edits are
+    skipped when the target message already shows the same screen, tracked
+    for the last ``max_messages`` edited or sent messages; every edit of a
+    menu message must therefore go through ``edit``. Telegram's
+    "message is not modified" answer, e.g. for messages from before a
+    restart, is treated as success.
+    """
+
+    def __init__(self, max_messages: int = 10_000):
+        self.max_messages = max_messages
+        self._static: Dict[str, Screen] = {}
+        self._dynamic: Dict[str, Tuple[Hashable, Screen]] = {}
+        # (chat_id, message_id) -> screen shown
+        self._shown: "OrderedDict[Tuple[int, int], Screen]" = OrderedDict()
+        self.renders = 0
+        self.hits = 0
+        self.skipped_edits = 0
+
+    def register(self, name: str, screen: Screen) -> Screen:
+        """Store a static screen"""
+        self._static[name] = screen
+        return screen
+
+    def static(self, name: str) -> Screen:
+        return self._static[name]
+
+    def get(self, name: str, key: Hashable, render: Callable[[], Screen]) -> Screen:
+        """Cached dynamic screen, rendered again when ``key`` differs"""
+        cached = self._dynamic.get(name)
+        if cached is not None and cached[0] == key:
+            self.hits += 1
+            return cached[1]
+        screen = render()
+        self.renders += 1
+        self._dynamic[name] = (key, screen)
+        return screen
+
+    def invalidate(self, name: Optional[str] = None) -> None:
+        """Drop one dynamic screen, or all of them"""
+        if name is None:
+            self._dynamic.clear()
+        else:
+            self._dynamic.pop(name, None)
+
+    def _remember(self, message: Message, screen: Screen) -> None:
+        key = (message.chat_id, message.message_id)
+        self._shown[key] = screen
+        self._shown.move_to_end(key)
+        while len(self._shown) > self.max_messages:
+            self._shown.popitem(last=False)
+
+    async def edit(self, query: CallbackQuery, screen: Screen) -> None:
+        """Show a screen in the query's message unless it is already shown"""
+        message = query.message
+        if self._shown.get((message.chat_id, message.message_id)) == screen:
+            self.skipped_edits += 1
+            return
+        try:
+            await message.edit_text(screen.text, **screen.options())
+        except BadRequest as e:
+            if not is_not_modified(e):
+                raise
+            logger.debug("Edit skipped by Telegram: %s", e)
+        self._remember(message, screen)
+
+    async def reply(self, message: Message, screen: Screen) -> Message:
+        """Send a screen as a reply and remember it for later edits"""
+        sent = await message.reply_text(screen.text, **screen.options())
+        self._remember(sent, screen)
+        return sent
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "static": len(self._static),
+            "dynamic": len(self._dynamic),
+            "tracked_messages": len(self._shown),
+            "renders": self.renders,
+            "hits": self.hits,
+            "skipped_edits": self.skipped_edits
+        }
@@ -0,0 +1,111 @@
+import importlib._bootstrap as bootstrap
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Awaitable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+class ImportProfiler:
+    """
+    Records the time spent importing each module while installed
+
+    Wraps the import system's module loading entry point, so only modules
+    not yet in ``sys.modules`` are measured. Self time excludes the nested
+    imports a module triggers, which are recorded separately.
+    """
+
+    def __init__(self):
+        # module -> (inclusive seconds, self seconds)
+        self.modules: Dict[str, Tuple[float, float]] = {}
+        self._stack: List[float] = []
+        self._original = None
+
+    def install(self) -> None:
+        if self._original:
+            return
+        self._original = original = bootstrap._find_and_load
+
+        def find_and_load(name, import_):
+            started = time.perf_counter()
+            self._stack.append(0.0)
+            try:
+                return original(name, import_)
+            finally:
+                elapsed = time.perf_counter() - started
+                children = self._stack.pop()
+                self.modules.setdefault(name, (elapsed, elapsed - children))
+                if self._stack:
+                    self._stack[-1] += elapsed
+        bootstrap._find_and_load = find_and_load
+
+    def uninstall(self) -> None:
+        if self._original:
+            bootstrap._find_and_load = self._original
+            self._original = None
+
+    @property
+    def total(self) -> float:
+        return sum(self_time for _, self_time in self.modules.values())
+
+    def by_package(self) -> Dict[str, float]:
+        """Self time summed per top-level package, with ``src`` split per subpackage"""
+        totals: Dict[str, float] = defaultdict(float)
+        for name, (_, self_time) in self.modules.items():
+            parts = name.split(".")
+            totals[".".join(parts[:3]) if parts[0] == "src" else parts[0]] += self_time
+        return dict(totals)
+
+class StartupProfile:
+    """Timings of one process start: imports, initialization steps and the first update"""
+
+    def __init__(self, started: Optional[float] = None):
+        # perf_counter() at process start; defaults to when the profile is created
+        self.started = started if started is not None else time.perf_counter()
+        self.phases: Dict[str, float] = {}
+        self.marks: Dict[str, float] = {}
+        self.imports: Optional[ImportProfiler] = None
+
+    def trace_imports(self) -> None:
+        """Measure every import from now until ``report``"""
+        self.imports = ImportProfiler()
+        self.imports.install()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = time.perf_counter() - started
+
+    async def timed(self, name: str, step: Awaitable[T]) -> T:
+        started = time.perf_counter()
+        try:
+            return await step
+        finally:
+            self.phases[name] = time.perf_counter() - started
+
+    def mark(self, name: str) -> float:
+        """Record the seconds since process start at which ``name`` happened"""
+        self.marks[name] = time.perf_counter() - self.started
+        return self.marks[name]
+
+    def stats(self) -> Dict[str, float]:
+        return {f"{name}_seconds": seconds for name, seconds in self.marks.items()}
+
+    def report(self, top: int = 15) -> str:
+        lines = ["Startup profile"]
+        if self.imports:
+            self.imports.uninstall()
+            lines.append(f"  imports {self.imports.total * 1000:9.1f}ms")
+            packages = sorted(self.imports.by_package().items(), key=lambda item: -item[1])
+            for name, seconds in packages[:top]:
+                lines.append(f"    {name:<36} {seconds * 1000:8.1f}ms")
+        if self.phases:
+            lines.append("  initialization (concurrent steps overlap)")
+            for name, seconds in self.phases.items():
+                lines.append(f"    {name:<36} {seconds * 1000:8.1f}ms")
+        for name, seconds in self.marks.items():
+            lines.append(f"  {name:<38} {seconds:8.3f}s after start")
+        return "\n".join(lines)
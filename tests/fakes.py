@@ -0,0 +1,421 @@
+"""Local aiohttp stand-ins for the upstream APIs used in tests and benchmarks"""
+import asyncio
+import json
+import random
+from typing import Dict, List, Optional, Set, Tuple
+import aiohttp
+from aiohttp import web
+from src.core.models.wallet import to_raw_address
+
+
+class FakeServer:
+    """
+    Minimal upstream server bound to an ephemeral localhost port
+
+    ``latency`` delays every response, ``error_rate`` turns a random share of
+    requests into 503s and ``fail_next`` queues explicit status codes for the
+    next requests.
+    """
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.fail_next: List[int] = []
+        self.path_latency: Dict[str, float] = {}
+        self.requests: List[Tuple[str, str]] = []
+        self.random = random.Random(seed)
+        self.app = web.Application(middlewares=[self._inject_faults])
+        self.setup_routes(self.app.router)
+        self._runner: Optional[web.AppRunner] = None
+        self.url = ""
+
+    def setup_routes(self, router: web.UrlDispatcher) -> None:
+        pass
+
+    @web.middleware
+    async def _inject_faults(self, request: web.Request, handler):
+        self.requests.append((request.method, request.path))
+        latency = self.path_latency.get(request.path, self.latency)
+        if latency:
+            await asyncio.sleep(latency)
+        if self.fail_next:
+            status = self.fail_next.pop(0)
+            headers = {"Retry-After": "0"} if status == 429 else None
+            return web.json_response({"error": "injected"}, status=status, headers=headers)
+        if self.error_rate and self.random.random() < self.error_rate:
+            return web.json_response({"error": "injected"}, status=503)
+        return await handler(request)
+
+    def count(self, path: str) -> int:
+        return sum(1 for _, requested in self.requests if requested == path)
+
+    async def start(self) -> str:
+        self._runner = web.AppRunner(self.app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self.url
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "FakeServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        await self.stop()
+
+
+class FakeTonApi(FakeServer):
+    """tonapi.io stand-in serving accounts, jetton balances and rates"""
+
+    def __init__(self, accounts: Optional[Dict[str, dict]] = None, bulk: bool = True, **kwargs):
+        self.accounts = accounts if accounts is not None else {}
+        self.jettons: Dict[str, List[dict]] = {}
+        self.rates: Dict[str, float] = {}
+        self.bulk = bulk
+        super().__init__(**kwargs)
+
+    def setup_routes(self, router: web.UrlDispatcher) -> None:
+        router.add_post("/v2/accounts/_bulk", self.get_accounts_bulk)
+        router.add_get("/v2/accounts/{address}", self.get_account)
+        router.add_get("/v2/accounts/{address}/jettons", self.get_jettons)
+        router.add_get("/v2/rates", self.get_rates)
+
+    async def get_accounts_bulk(self, request: web.Request) -> web.Response:
+        if not self.bulk:
+            return web.json_response({"error": "not implemented"}, status=501)
+        body = await request.json()
+        accounts = []
+        for address in body.get("account_ids", []):
+            if address in self.accounts:
+                account = dict(self.accounts[address])
+                account.setdefault("address", to_raw_address(address))
+                accounts.append(account)
+        return web.json_response({"accounts": accounts})
+
+    async def get_account(self, request: web.Request) -> web.Response:
+        account = self.accounts.get(request.match_info["address"])
+        if account is None:
+            return web.json_response({"error": "account not found"}, status=404)
+        return web.json_response(account)
+
+    async def get_jettons(self, request: web.Request) -> web.Response:
+        return web.json_response({"balances": self.jettons.get(request.match_info["address"], [])})
+
+    async def get_rates(self, request: web.Request) -> web.Response:
+        currency = request.query.get("currencies", "usd").upper()
+        return web.json_response({"rates": {
+            token: {"prices": {currency: self.rates[token]}}
+            for token in request.query.get("tokens", "").split(",")
+            if token in self.rates
+        }})
+
+
+class FakeCoinGecko(FakeServer):
+    """CoinGecko stand-in serving simple/price"""
+
+    def __init__(self, prices: Optional[Dict[str, float]] = None, **kwargs):
+        self.prices = prices if prices is not None else {"the-open-network": 2.5}
+        super().__init__(**kwargs)
+
+    def setup_routes(self, router: web.UrlDispatcher) -> None:
+        router.add_get("/api/v3/simple/price", self.simple_price)
+
+    async def simple_price(self, request: web.Request) -> web.Response:
+        ids = request.query.get("ids", "").split(",")
+        return web.json_response({
+            id: {"usd": self.prices[id]} for id in ids if id in self.prices
+        })
+
+
+def jetton_transfer_event(
+    event_id: str,
+    amount: float,
+    jetton: str,
+    symbol: str = "BOLT",
+    decimals: int = 9,
+    sender: str = "0:" + "1" * 64,
+    recipient: str = "0:" + "2" * 64
+) -> dict:
+    """A tonapi event holding one jetton transfer"""
+    return {
+        "event_id": event_id,
+        "timestamp": 1_700_000_000,
+        "actions": [{
+            "type": "JettonTransfer",
+            "status": "ok",
+            "JettonTransfer": {
+                "sender": {"address": sender},
+                "recipient": {"address": recipient},
+                "amount": str(int(amount * 10 ** decimals)),
+                "jetton": {"address": jetton, "symbol": symbol, "decimals": decimals}
+            }
+        }]
+    }
+
+
+class FakeTonApiStream(FakeServer):
+    """
+    tonapi streaming stand-in replaying recorded transaction events over SSE
+
+    Each ``records`` entry is an event payload streamed with its index as the
+    SSE id; ``Last-Event-ID`` resumes after it. ``drop_after`` closes the
+    connection after that many events, and ``events`` serves
+    ``/v2/events/{id}`` for payloads that only carry a transaction hash.
+    """
+
+    def __init__(self, records: Optional[List[dict]] = None, drop_after: Optional[int] = None, **kwargs):
+        self.records = records if records is not None else []
+        self.events: Dict[str, dict] = {}
+        self.drop_after = drop_after
+        self.resumed_from: List[Optional[str]] = []
+        self._streams: Set[asyncio.Task] = set()
+        self._closing = False
+        super().__init__(**kwargs)
+
+    def setup_routes(self, router: web.UrlDispatcher) -> None:
+        router.add_get("/v2/sse/accounts/transactions", self.stream)
+        router.add_get("/v2/events/{event_id}", self.get_event)
+
+    async def stop(self) -> None:
+        self._closing = True
+        await asyncio.gather(*self._streams, return_exceptions=True)
+        await super().stop()
+
+    async def stream(self, request: web.Request) -> web.StreamResponse:
+        task = asyncio.current_task()
+        self._streams.add(task)
+        try:
+            return await self._replay(request)
+        finally:
+            self._streams.discard(task)
+
+    async def _replay(self, request: web.Request) -> web.StreamResponse:
+        last_id = request.headers.get("Last-Event-ID")
+        self.resumed_from.append(last_id)
+        start = int(last_id) + 1 if last_id is not None else 0
+
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        await response.write(b"retry: 10\n: connected\n\n")
+        sent = 0
+        for index in range(start, len(self.records)):
+            if self.drop_after is not None and sent >= self.drop_after:
+                return response
+            body = json.dumps(self.records[index])
+            await response.write(f"id: {index}\nevent: message\ndata: {body}\n\n".encode())
+            sent += 1
+        while not self._closing:
+            await response.write(b"event: heartbeat\ndata: {}\n\n")
+            await asyncio.sleep(0.05)
+        return response
+
+    async def get_event(self, request: web.Request) -> web.Response:
+        event = self.events.get(request.match_info["event_id"])
+        if event is None:
+            return web.json_response({"error": "not found"}, status=404)
+        return web.json_response(event)
+
+
+class FakeBotApi(FakeServer):
+    """
+    Telegram Bot API stand-in for ``Bot(token, base_url=f"{url}/bot")``
+
+    Records every ``sendMessage`` and ``editMessageText`` with its arrival
+    time. ``flood_next`` queues ``retry_after`` values answered as 429
+    flood-control errors and ``blocked`` chats answer 403. ``push_update``
+    and ``push_callback`` deliver an incoming message or button tap the way
+    Telegram would: through ``getUpdates`` long polling, or as a POST to the
+    registered webhook.
+    """
+
+    TOKEN = "123456:TEST"
+
+    def __init__(self, **kwargs):
+        self.messages: List[Tuple[float, int, str]] = []
+        self.edits: List[Tuple[float, int, int, str]] = []
+        self.flood_next: List[int] = []
+        self.blocked: Set[int] = set()
+        self.updates: List[dict] = []
+        self.webhook: Optional[Tuple[str, str]] = None
+        self._update_id = 0
+        self._new_update: Optional[asyncio.Event] = None
+        self._message_waiters: Dict[str, asyncio.Future] = {}
+        self._reply_waiters: Dict[int, asyncio.Future] = {}
+        self._polls: Set[asyncio.Task] = set()
+        self._session = None
+        super().__init__(**kwargs)
+
+    def setup_routes(self, router: web.UrlDispatcher) -> None:
+        router.add_post(f"/bot{self.TOKEN}/getMe", self.get_me)
+        router.add_post(f"/bot{self.TOKEN}/sendMessage", self.send_message)
+        router.add_post(f"/bot{self.TOKEN}/editMessageText", self.edit_message_text)
+        router.add_post(f"/bot{self.TOKEN}/answerCallbackQuery", self.answer_callback_query)
+        router.add_post(f"/bot{self.TOKEN}/getUpdates", self.get_updates)
+        router.add_post(f"/bot{self.TOKEN}/setWebhook", self.set_webhook)
+        router.add_post(f"/bot{self.TOKEN}/deleteWebhook", self.delete_webhook)
+
+    async def stop(self) -> None:
+        if self._session:
+            await self._session.close()
+            self._session = None
+        if self._new_update:
+            # Let parked long polls answer before the server goes away
+            self._new_update.set()
+        await asyncio.gather(*self._polls, return_exceptions=True)
+        await super().stop()
+
+    @staticmethod
+    def _ok(result) -> web.Response:
+        return web.json_response({"ok": True, "result": result})
+
+    @staticmethod
+    def _error(code: int, description: str, **parameters) -> web.Response:
+        body = {"ok": False, "error_code": code, "description": description}
+        if parameters:
+            body["parameters"] = parameters
+        return web.json_response(body, status=code)
+
+    async def get_me(self, request: web.Request) -> web.Response:
+        return self._ok({"id": 123456, "is_bot": True, "first_name": "Test", "username": "test_bot"})
+
+    async def send_message(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        chat_id = int(form["chat_id"])
+        if self.flood_next:
+            retry_after = self.flood_next.pop(0)
+            return self._error(429, f"Too Many Requests: retry after {retry_after}", retry_after=retry_after)
+        if chat_id in self.blocked:
+            return self._error(403, "Forbidden: bot was blocked by the user")
+        now = asyncio.get_running_loop().time()
+        self.messages.append((now, chat_id, form["text"]))
+        waiter = self._message_waiters.pop(form["text"], None)
+        if waiter and not waiter.done():
+            waiter.set_result(now)
+        self._replied(chat_id, now)
+        return self._ok({
+            "message_id": len(self.messages),
+            "date": 1_700_000_000,
+            "chat": {"id": chat_id, "type": "private" if chat_id > 0 else "group"},
+            "text": form["text"]
+        })
+
+    async def edit_message_text(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        chat_id, message_id = int(form["chat_id"]), int(form["message_id"])
+        now = asyncio.get_running_loop().time()
+        self.edits.append((now, chat_id, message_id, form["text"]))
+        self._replied(chat_id, now)
+        return self._ok({
+            "message_id": message_id,
+            "date": 1_700_000_000,
+            "chat": {"id": chat_id, "type": "private" if chat_id > 0 else "group"},
+            "text": form["text"]
+        })
+
+    async def answer_callback_query(self, request: web.Request) -> web.Response:
+        return self._ok(True)
+
+    def _replied(self, chat_id: int, now: float) -> None:
+        waiter = self._reply_waiters.pop(chat_id, None)
+        if waiter and not waiter.done():
+            waiter.set_result(now)
+
+    def chat_messages(self, chat_id: int) -> List[Tuple[float, str]]:
+        return [(sent, text) for sent, chat, text in self.messages if chat == chat_id]
+
+    def wait_for_message(self, text: str) -> asyncio.Future:
+        """Future resolved with the loop time at which ``text`` is sent"""
+        future = asyncio.get_running_loop().create_future()
+        self._message_waiters[text] = future
+        return future
+
+    def wait_for_reply(self, chat_id: int) -> asyncio.Future:
+        """Future resolved with the loop time of the next message sent or edited in ``chat_id``"""
+        future = asyncio.get_running_loop().create_future()
+        self._reply_waiters[chat_id] = future
+        return future
+
+    async def push_update(self, text: str, chat_id: int = 1) -> dict:
+        """Deliver an incoming text message to the bot"""
+        self._update_id += 1
+        return await self._deliver({
+            "update_id": self._update_id,
+            "message": {
+                "message_id": self._update_id,
+                "date": 1_700_000_000,
+                "chat": {"id": chat_id, "type": "private"},
+                "from": {"id": chat_id, "is_bot": False, "first_name": "User"},
+                "text": text
+            }
+        })
+
+    async def push_callback(self, data: str, chat_id: int = 1, message_id: int = 1) -> dict:
+        """Deliver a tap on an inline button of the bot's message ``message_id``"""
+        self._update_id += 1
+        return await self._deliver({
+            "update_id": self._update_id,
+            "callback_query": {
+                "id": str(self._update_id),
+                "from": {"id": chat_id, "is_bot": False, "first_name": "User"},
+                "chat_instance": str(chat_id),
+                "data": data,
+                "message": {
+                    "message_id": message_id,
+                    "date": 1_700_000_000,
+                    "chat": {"id": chat_id, "type": "private"},
+                    "from": {"id": 123456, "is_bot": True, "first_name": "Test"},
+                    "text": "menu"
+                }
+            }
+        })
+
+    async def _deliver(self, update: dict) -> dict:
+        if self.webhook:
+            if self._session is None:
+                self._session = aiohttp.ClientSession()
+            url, secret = self.webhook
+            async with self._session.post(
+                url, json=update, headers={"X-Telegram-Bot-Api-Secret-Token": secret}
+            ) as response:
+                response.raise_for_status()
+        else:
+            self.updates.append(update)
+            if self._new_update:
+                self._new_update.set()
+        return update
+
+    async def get_updates(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        offset = int(form.get("offset", 0) or 0)
+        timeout = float(form.get("timeout", 0) or 0)
+        if self._new_update is None:
+            self._new_update = asyncio.Event()
+
+        self.updates = [update for update in self.updates if update["update_id"] >= offset]
+        if not self.updates and timeout:
+            self._new_update.clear()
+            task = asyncio.current_task()
+            self._polls.add(task)
+            try:
+                await asyncio.wait_for(self._new_update.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            finally:
+                self._polls.discard(task)
+        return self._ok(list(self.updates))
+
+    async def set_webhook(self, request: web.Request) -> web.Response:
+        form = await request.post()
+        self.webhook = (form["url"], form.get("secret_token", ""))
+        return self._ok(True)
+
+    async def delete_webhook(self, request: web.Request) -> web.Response:
+        self.webhook = None
+        return self._ok(True)
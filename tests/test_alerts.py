@@ -0,0 +1,148 @@
+import pytest
+import pytest_asyncio
+from src.core.alert_index import AlertIndex
+from src.core.models.alert import Alert, ABOVE, BELOW
+from src.core.models.price import PriceQuote
+from src.infrastructure.storage.json_storage import JsonRepository
+from src.services.alert_service import AlertService
+from src.utils.errors import ValidationError
+
+def make_alert(id, threshold, direction=ABOVE, symbol="BOLT", **kwargs):
+    return Alert(id=id, user_id="1", chat_id=1, symbol=symbol, direction=direction, threshold=threshold, **kwargs)
+
+class StubPriceService:
+    def __init__(self, prices):
+        self.prices = {
+            symbol: PriceQuote(symbol, value, 0.0, "test", 300) for symbol, value in prices.items()
+        }
+        self.listeners = []
+
+    def add_listener(self, listener):
+        self.listeners.append(listener)
+
+    def get_price(self, symbol):
+        quote = self.prices.get(symbol)
+        return quote.value if quote else None
+
+    async def tick(self, symbol, value, now=1000.0):
+        quote = PriceQuote(symbol, value, now, "test", 300)
+        self.prices[symbol] = quote
+        for listener in self.listeners:
+            await listener({symbol: quote})
+
+@pytest.fixture
+def price_service():
+    return StubPriceService({"BOLT": 0.010})
+
+@pytest_asyncio.fixture
+async def alert_service(tmp_path, price_service):
+    repo = JsonRepository(tmp_path / "alerts.json", Alert)
+    service = AlertService(repo, price_service)
+    await service.load()
+    yield service
+    await repo.close()
+
+def test_index_returns_only_crossed_thresholds():
+    index = AlertIndex()
+    index.load([make_alert(str(i), t) for i, t in enumerate([1.0, 2.0, 3.0, 4.0])])
+    index.add(make_alert("below", 1.5, BELOW))
+
+    assert [a.threshold for a in index.crossed("BOLT", 1.5, 3.0)] == [2.0, 3.0]
+    assert index.crossed("BOLT", 3.0, 3.5) == []
+    assert [a.id for a in index.crossed("BOLT", 2.0, 1.5)] == ["below"]
+    assert index.crossed("BOLT", None, 5.0) == []
+    assert index.crossed("TON", 1.0, 5.0) == []
+
+def test_index_remove_among_equal_thresholds():
+    index = AlertIndex()
+    alerts = [make_alert(str(i), 2.0) for i in range(3)]
+    for alert in alerts:
+        index.add(alert)
+
+    assert index.remove(alerts[1])
+    assert not index.remove(alerts[1])
+    assert [a.id for a in index.crossed("BOLT", 1.0, 2.0)] == ["0", "2"]
+    assert len(index) == 2
+
+def test_take_crossed_removes_one_shot_alerts_at_once():
+    index = AlertIndex()
+    alerts = [make_alert(str(i), 2.0) for i in range(6)] + [make_alert("high", 3.0)]
+    for alert in alerts[:6:2]:
+        alert.repeat = True
+    index.load(list(alerts))
+
+    taken = index.take_crossed("BOLT", 1.0, 2.0)
+    assert sorted(a.id for a in taken) == ["0", "1", "2", "3", "4", "5"]
+    assert sorted(a.id for a in index.crossed("BOLT", 1.0, 3.0)) == ["0", "2", "4", "high"]
+    assert list(index._list("BOLT", ABOVE).thresholds) == [2.0, 2.0, 2.0, 3.0]
+    assert len(index) == 4
+
+@pytest.mark.asyncio
+async def test_one_shot_alert_fires_once(alert_service, price_service):
+    fired = []
+
+    async def listener(alert, price):
+        fired.append((alert.id, price))
+
+    alert_service.add_listener(listener)
+    alert = await alert_service.create_alert("1", 1, "bolt", 0.012)
+    assert alert.direction == ABOVE
+
+    await price_service.tick("BOLT", 0.011)
+    await price_service.tick("BOLT", 0.013)
+    await price_service.tick("BOLT", 0.009)
+    await price_service.tick("BOLT", 0.014)
+
+    assert fired == [(alert.id, 0.013)]
+    assert alert_service.list_alerts("1") == []
+    assert await alert_service.alert_repository.get(alert.id) is None
+
+@pytest.mark.asyncio
+async def test_repeating_alert_respects_cooldown(alert_service, price_service):
+    fired = []
+
+    async def listener(alert, price):
+        fired.append(price)
+
+    alert_service.add_listener(listener)
+    alert = await alert_service.create_alert("1", 1, "BOLT", 0.008, repeat=True, cooldown=60)
+    assert alert.direction == BELOW
+
+    await price_service.tick("BOLT", 0.007, now=1000)
+    await price_service.tick("BOLT", 0.009, now=1010)
+    await price_service.tick("BOLT", 0.006, now=1020)  # within cooldown
+    await price_service.tick("BOLT", 0.009, now=1100)
+    await price_service.tick("BOLT", 0.005, now=1110)
+
+    assert fired == [0.007, 0.005]
+    stored = await alert_service.alert_repository.get(alert.id)
+    assert stored.last_triggered == 1110
+
+@pytest.mark.asyncio
+async def test_alerts_survive_restart(tmp_path, price_service):
+    repo = JsonRepository(tmp_path / "alerts.json", Alert)
+    service = AlertService(repo, price_service)
+    alert = await service.create_alert("1", 1, "BOLT", 0.02)
+    await repo.close()
+
+    reloaded = AlertService(JsonRepository(tmp_path / "alerts.json", Alert), price_service)
+    await reloaded.load()
+    assert [a.id for a in reloaded.list_alerts("1")] == [alert.id]
+    assert [a.id for a, _ in reloaded.evaluate("BOLT", 0.01, 0.03)] == [alert.id]
+    await reloaded.alert_repository.close()
+
+@pytest.mark.asyncio
+async def test_create_alert_validation(alert_service):
+    with pytest.raises(ValidationError):
+        await alert_service.create_alert("1", 1, "BOLT", 0.02, direction=BELOW)
+    with pytest.raises(ValidationError):
+        await alert_service.create_alert("1", 1, "DOGE", 1.0)
+    with pytest.raises(ValidationError):
+        await alert_service.create_alert("1", 1, "BOLT", -1)
+
+@pytest.mark.asyncio
+async def test_delete_only_own_alert(alert_service):
+    alert = await alert_service.create_alert("1", 1, "BOLT", 0.02)
+    assert not await alert_service.delete_alert("2", alert.id)
+    assert await alert_service.delete_alert("1", alert.id)
+    assert len(alert_service.index) == 0
@@ -0,0 +1,24 @@
+import os
+import pytest
+from benchmarks.micro import BASELINE, CASES, load_baseline, measure
+
+# Opt-in: timings only mean something against a baseline from the same machine
+GATE = os.getenv("BENCH_GATE") == "1"
+THRESHOLD = float(os.getenv("BENCH_THRESHOLD", "1.5"))
+
+pytestmark = pytest.mark.skipif(not GATE, reason="set BENCH_GATE=1 to compare hot paths with the baseline")
+
+@pytest.mark.parametrize("name", list(CASES))
+def test_hot_path_has_not_regressed(name):
+    baseline = load_baseline().get(name)
+    if baseline is None:
+        pytest.skip(f"{name} has no baseline; record one with python -m benchmarks.micro --save")
+
+    # Retry once so a single noisy run does not fail the gate
+    result = measure(name, rounds=10)
+    if result > baseline * THRESHOLD:
+        result = min(result, measure(name, rounds=10))
+    assert result <= baseline * THRESHOLD, (
+        f"{name}: {result:.0f}ns/op is {result / baseline:.2f}x the {baseline:.0f}ns/op "
+        f"in {BASELINE.name} (limit {THRESHOLD}x)"
+    )
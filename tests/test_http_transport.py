@@ -0,0 +1,74 @@
+import asyncio
+import pytest
+from src.infrastructure.http.transport import HttpTransport
+from src.utils.errors import APIError, CircuitOpenError
+from tests.fakes import FakeTonApi
+
+ADDRESS = "EQD0vdSA_NedR9uvbgN9EikRX-suesDxGeFg69XQMavfLqIw"
+
+def make_transport(url: str, **kwargs) -> HttpTransport:
+    options = dict(timeout=2, max_retries=3, backoff_base=0.01, backoff_max=0.05)
+    options.update(kwargs)
+    return HttpTransport(f"{url}/v2", **options)
+
+@pytest.mark.asyncio
+async def test_get_json_and_not_found():
+    async with FakeTonApi(accounts={ADDRESS: {"balance": 5}}) as server:
+        transport = make_transport(server.url)
+        assert await transport.get_json(f"/accounts/{ADDRESS}") == {"balance": 5}
+        assert await transport.get_json("/accounts/unknown") is None
+        await transport.close()
+
+@pytest.mark.asyncio
+async def test_retries_transient_errors():
+    async with FakeTonApi(accounts={ADDRESS: {"balance": 5}}) as server:
+        server.fail_next = [503, 429]
+        transport = make_transport(server.url)
+
+        assert await transport.get_json(f"/accounts/{ADDRESS}") == {"balance": 5}
+        assert server.count(f"/v2/accounts/{ADDRESS}") == 3
+        assert transport.retries == 2
+        await transport.close()
+
+@pytest.mark.asyncio
+async def test_does_not_retry_client_errors():
+    async with FakeTonApi() as server:
+        server.fail_next = [400]
+        transport = make_transport(server.url)
+
+        with pytest.raises(APIError):
+            await transport.get_json(f"/accounts/{ADDRESS}")
+        assert len(server.requests) == 1
+        await transport.close()
+
+@pytest.mark.asyncio
+async def test_deadline_bounds_slow_upstream():
+    async with FakeTonApi(accounts={ADDRESS: {}}, latency=1) as server:
+        transport = make_transport(server.url, timeout=0.2)
+
+        started = asyncio.get_running_loop().time()
+        with pytest.raises(APIError):
+            await transport.get_json(f"/accounts/{ADDRESS}")
+        assert asyncio.get_running_loop().time() - started < 0.5
+        await transport.close()
+
+@pytest.mark.asyncio
+async def test_circuit_opens_and_recovers():
+    async with FakeTonApi(accounts={ADDRESS: {"balance": 1}}) as server:
+        server.fail_next = [503] * 4
+        transport = make_transport(server.url, max_retries=0, failure_threshold=2, reset_timeout=0.1)
+
+        for _ in range(2):
+            with pytest.raises(APIError):
+                await transport.get_json(f"/accounts/{ADDRESS}")
+
+        requests_before = len(server.requests)
+        with pytest.raises(CircuitOpenError):
+            await transport.get_json(f"/accounts/{ADDRESS}")
+        assert len(server.requests) == requests_before
+
+        server.fail_next = []
+        await asyncio.sleep(0.15)
+        assert await transport.get_json(f"/accounts/{ADDRESS}") == {"balance": 1}
+        assert transport.stats()["breakers"][server.url[7:]]["state"] == "closed"
+        await transport.close()
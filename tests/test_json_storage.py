@@ -0,0 +1,108 @@
+import asyncio
+import json
+import pytest
+from src.core.models.user import User
+from src.infrastructure.storage.json_storage import JsonRepository
+
+@pytest.fixture
+def file_path(tmp_path):
+    return tmp_path / "user_data.json"
+
+@pytest.mark.asyncio
+async def test_save_get_delete(file_path):
+    repo = JsonRepository(file_path, User)
+
+    await repo.save("1", User(id="1", session_data={"step": "start"}))
+    user = await repo.get("1")
+    assert user.session_data == {"step": "start"}
+
+    assert await repo.delete("1") is True
+    assert await repo.delete("1") is False
+    assert await repo.get("1") is None
+
+    await repo.close()
+
+@pytest.mark.asyncio
+async def test_returned_entities_are_detached(file_path):
+    repo = JsonRepository(file_path, User)
+    await repo.save("1", User(id="1"))
+
+    user = await repo.get("1")
+    user.session_data["unsaved"] = True
+
+    assert (await repo.get("1")).session_data == {}
+    await repo.close()
+
+@pytest.mark.asyncio
+async def test_concurrent_saves_are_group_committed(file_path, monkeypatch):
+    repo = JsonRepository(file_path, User)
+    batches = []
+    write_batch = repo._write_batch
+    monkeypatch.setattr(repo, "_write_batch", lambda data: (batches.append(data), write_batch(data)))
+
+    await asyncio.gather(*(repo.save(str(i), User(id=str(i))) for i in range(50)))
+
+    assert len(batches) < 50
+    assert sum(batch.count("\n") for batch in batches) == 50
+    await repo.close()
+
+@pytest.mark.asyncio
+async def test_crash_recovery_discards_torn_record(file_path):
+    repo = JsonRepository(file_path, User)
+    await repo.save("1", User(id="1", session_data={"a": 1}))
+    await repo.save("2", User(id="2"))
+    await repo.delete("2")
+    await repo.save("1", User(id="1", session_data={"a": 2}))
+
+    # Simulate a crash mid-append: no close(), half a record on disk
+    repo._writer.cancel()
+    with open(repo.journal_path, "ab") as f:
+        f.write(b'{"op": "put", "id": "3", "da')
+
+    recovered = JsonRepository(file_path, User)
+    assert (await recovered.get("1")).session_data == {"a": 2}
+    assert await recovered.get("2") is None
+    assert await recovered.get("3") is None
+
+    # The torn tail is truncated so new records stay parseable
+    await recovered.save("4", User(id="4"))
+    reopened = JsonRepository(file_path, User)
+    assert {u.id for u in await reopened.list()} == {"1", "4"}
+    await recovered.close()
+
+@pytest.mark.asyncio
+async def test_compaction_rewrites_snapshot(file_path):
+    repo = JsonRepository(file_path, User, compact_threshold=5)
+    for i in range(12):
+        await repo.save(str(i), User(id=str(i)))
+
+    snapshot = json.loads(file_path.read_text(encoding="utf-8"))
+    assert len(snapshot) >= 5
+    assert repo._journal_records < 12
+
+    await repo.close()
+    assert repo.journal_path.stat().st_size == 0
+
+    reopened = JsonRepository(file_path, User)
+    assert len(await reopened.list()) == 12
+
+@pytest.mark.asyncio
+async def test_compaction_interval_grows_with_the_snapshot(file_path, monkeypatch):
+    repo = JsonRepository(file_path, User, compact_threshold=5)
+    compactions = []
+    compact = repo._compact
+    async def counting_compact():
+        compactions.append(len(repo._index))
+        await compact()
+    monkeypatch.setattr(repo, "_compact", counting_compact)
+
+    for i in range(100):
+        await repo.save(str(i), User(id=str(i)))
+
+    assert compactions == [5, 10, 20, 40, 80]
+    await repo.close()
+
+def test_loads_legacy_snapshot(file_path):
+    file_path.write_text(json.dumps({"7": {"id": "7", "session_data": {}}}, indent=4))
+    repo = JsonRepository(file_path, User)
+    assert "7" in repo._index
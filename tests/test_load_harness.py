@@ -0,0 +1,12 @@
+import pytest
+from benchmarks.load_test import run_load
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("mode", ["polling", "webhook"])
+async def test_bot_answers_every_request_offline(mode, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    result = await run_load(users=3, requests=30, mode=mode, wallets=5, reply_timeout=5)
+
+    assert result.timeouts == 0
+    assert len(result.latencies) == 30
+    assert result.requests["tonapi"] > 0
@@ -0,0 +1,88 @@
+import logging
+import os
+import threading
+import pytest
+from src.utils.logging import BotLogger, RotatingLogFile
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.lines = []
+        self.threads = set()
+
+    def emit(self, record):
+        self.threads.add(threading.get_ident())
+        self.lines.append(self.format(record))
+
+class CountingArg:
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "arg"
+
+@pytest.fixture
+def captured(request):
+    handler = ListHandler()
+    bot_logger = BotLogger(f"test.{request.node.name}", level=logging.INFO, handlers=[handler])
+    yield bot_logger, handler
+    bot_logger.stop()
+
+def test_records_are_written_off_the_calling_thread(captured):
+    bot_logger, handler = captured
+    bot_logger.info("Handled update %s", 7, handler="price_menu", chat=42, latency_ms=1.5)
+    bot_logger.stop()
+
+    assert handler.lines[0].endswith("Handled update 7 handler=price_menu chat=42 latency_ms=1.5")
+    assert threading.get_ident() not in handler.threads
+
+    # Records after stop are written directly instead of being lost
+    bot_logger.warning("late")
+    assert handler.lines[-1].endswith("late")
+
+def test_disabled_levels_are_never_formatted(captured):
+    bot_logger, handler = captured
+    arg = CountingArg()
+    bot_logger.debug("value %s", arg)
+    bot_logger.info("value %s", arg, sample=0)
+    bot_logger.stop()
+    assert arg.formatted == 0
+    assert handler.lines == []
+
+def test_errors_keep_tracebacks(captured):
+    bot_logger, handler = captured
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        bot_logger.error("Failed", chat=1)
+    bot_logger.stop()
+    head, _, trace = handler.lines[0].partition("\n")
+    assert head.endswith("Failed chat=1")
+    assert "ValueError: boom" in trace
+
+def test_full_queue_drops_instead_of_blocking():
+    handler = ListHandler()
+    bot_logger = BotLogger("test.full_queue", level=logging.INFO, handlers=[handler])
+    # Keep the writer from starting so nothing drains the queue
+    bot_logger._started = True
+    for i in range(bot_logger.queue_handler.queue.maxsize + 5):
+        bot_logger.info("record %d", i)
+    assert bot_logger.dropped == 5
+
+def test_log_rotates_by_size_and_time(tmp_path, monkeypatch):
+    path = tmp_path / "bot.log"
+    handler = RotatingLogFile(path, max_bytes=100, backup_count=2, interval=60)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    record = lambda: logging.LogRecord("t", logging.INFO, __file__, 1, "x" * 40, None, None)
+
+    for _ in range(3):
+        handler.emit(record())
+    assert os.path.exists(f"{path}.1")
+
+    now = handler.rollover_at
+    monkeypatch.setattr("src.utils.logging.time.time", lambda: now)
+    handler.emit(record())
+    assert os.path.exists(f"{path}.2")
+    assert path.read_text() == "x" * 40 + "\n"
+    handler.close()
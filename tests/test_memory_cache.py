@@ -0,0 +1,71 @@
+import time
+import pytest
+from src.infrastructure.cache.memory_cache import MemoryCache
+
+@pytest.fixture
+def cache():
+    return MemoryCache(
+        default_ttl=60,
+        namespace_ttls={"price": 1, "wallet": 120},
+        max_entries=3
+    )
+
+def test_get_set(cache):
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("missing") is None
+
+    stats = cache.stats()["default"]
+    assert stats.hits == 1
+    assert stats.misses == 1
+    assert stats.hit_rate == 0.5
+
+def test_namespaces_are_isolated(cache):
+    cache.set("key", "price", namespace="price")
+    cache.set("key", "wallet", namespace="wallet")
+    assert cache.get("key", "price") == "price"
+    assert cache.get("key", "wallet") == "wallet"
+    assert cache.get("key") is None
+
+def test_lru_eviction(cache):
+    for key in ("a", "b", "c"):
+        cache.set(key, key)
+
+    # Touch "a" so "b" becomes least recently used
+    cache.get("a")
+    cache.set("d", "d")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "a"
+    assert cache.stats()["default"].evictions == 1
+
+def test_byte_budget():
+    cache = MemoryCache(max_bytes=1024)
+    assert cache.set("small", "x") is True
+    assert cache.set("huge", "x" * 4096) is False
+    assert cache.get("huge") is None
+
+    for i in range(100):
+        cache.set(f"k{i}", "y" * 100)
+    entries, size = cache.totals()
+    assert size <= 1024
+    assert entries < 100
+
+def test_lazy_expiry(cache, monkeypatch):
+    cache.set("ton", 2.5, namespace="price")
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 5)
+
+    assert cache.get("ton", "price") is None
+    assert cache.stats()["price"].expirations == 1
+
+def test_sweep_removes_expired(cache, monkeypatch):
+    cache.set("ton", 2.5, namespace="price")
+    cache.set("acc", {"balance": 1}, namespace="wallet")
+
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 5)
+
+    assert cache.sweep() == 1
+    assert cache.get("acc", "wallet") == {"balance": 1}
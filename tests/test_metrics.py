@@ -0,0 +1,108 @@
+import asyncio
+import aiohttp
+import pytest
+from aiohttp import web
+from src.infrastructure.http.transport import HttpTransport, UPSTREAM_REQUESTS
+from src.utils.metrics import (
+    LoopLagMonitor,
+    MetricFamily,
+    MetricsRegistry,
+    MetricsServer,
+    stats_collector
+)
+
+def test_counters_gauges_and_labels():
+    metrics = MetricsRegistry()
+    requests = metrics.counter("requests_total", "Requests", ["status"])
+    requests.labels("200").inc()
+    requests.labels("200").inc(2)
+    requests.labels('we"ird').inc()
+    metrics.gauge("depth", "Queue depth").set(1.5)
+
+    text = metrics.render()
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{status="200"} 3' in text
+    assert 'requests_total{status="we\\"ird"} 1' in text
+    assert "depth 1.5" in text
+
+    with pytest.raises(ValueError):
+        requests.labels()
+    with pytest.raises(ValueError):
+        metrics.gauge("requests_total", "Requests", ["status"])
+    assert metrics.counter("requests_total", "Requests", ["status"]) is requests
+
+def test_histogram_buckets_are_cumulative():
+    metrics = MetricsRegistry()
+    latency = metrics.histogram("latency_seconds", "Latency", ["handler"], buckets=(0.1, 1))
+    child = latency.labels("menu")
+    for value in (0.05, 0.1, 0.5, 3):
+        child.observe(value)
+
+    text = metrics.render()
+    assert 'latency_seconds_bucket{handler="menu",le="0.1"} 2' in text
+    assert 'latency_seconds_bucket{handler="menu",le="1"} 3' in text
+    assert 'latency_seconds_bucket{handler="menu",le="+Inf"} 4' in text
+    assert 'latency_seconds_count{handler="menu"} 4' in text
+    assert 'latency_seconds_sum{handler="menu"} 3.65' in text
+
+def test_collectors_are_read_at_scrape_time():
+    metrics = MetricsRegistry()
+    stats = {"queued": 0, "name": "x", "nested": {"a": 1}}
+    metrics.add_collector(stats_collector("bot_queue", "Queue", lambda: stats, worker="1"))
+    metrics.add_collector(lambda: [MetricFamily("custom", "gauge", "Custom", [({}, 7)])])
+
+    def broken():
+        raise RuntimeError("boom")
+    metrics.add_collector(broken)
+
+    stats["queued"] = 5
+    text = metrics.render()
+    assert 'bot_queue_queued{worker="1"} 5' in text
+    assert "bot_queue_name" not in text and "nested" not in text
+    assert "custom 7" in text
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_and_loop_lag():
+    metrics = MetricsRegistry()
+    monitor = LoopLagMonitor(interval=0.01, metrics=metrics)
+    await monitor.start()
+    await asyncio.sleep(0.05)
+    await monitor.stop()
+
+    server = MetricsServer(metrics, port=0)
+    await server.start()
+    try:
+        async with aiohttp.ClientSession() as session:
+            async with session.get(f"http://127.0.0.1:{server.port}/metrics") as response:
+                assert response.status == 200
+                assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+                text = await response.text()
+    finally:
+        await server.stop()
+    assert "bot_event_loop_lag_seconds_count" in text
+    assert "bot_event_loop_last_lag_seconds" in text
+
+@pytest.mark.asyncio
+async def test_transport_records_upstream_statuses():
+    async def handler(request):
+        return web.json_response({"ok": True}, status=int(request.query["status"]))
+
+    app = web.Application()
+    app.router.add_get("/", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    host = f"127.0.0.1:{port}"
+
+    transport = HttpTransport(f"http://{host}", max_retries=0)
+    try:
+        await transport.get_json("/", params={"status": "200"})
+        assert await transport.get_json("/", params={"status": "404"}) is None
+    finally:
+        await transport.close()
+        await runner.cleanup()
+
+    assert UPSTREAM_REQUESTS.labels(host, "200").value == 1
+    assert UPSTREAM_REQUESTS.labels(host, "404").value == 1
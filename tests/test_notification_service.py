@@ -0,0 +1,128 @@
+import asyncio
+import time
+import pytest
+from telegram import Bot
+from telegram.request import HTTPXRequest
+from src.services.notification_service import NotificationDispatcher
+from tests.fakes import FakeBotApi
+
+def make_bot(server):
+    return Bot(
+        FakeBotApi.TOKEN,
+        base_url=f"{server.url}/bot",
+        request=HTTPXRequest(connection_pool_size=16)
+    )
+
+def make_dispatcher(**kwargs):
+    kwargs.setdefault("global_rate", 100)
+    kwargs.setdefault("chat_interval", 0.2)
+    kwargs.setdefault("group_interval", 0.4)
+    return NotificationDispatcher(**kwargs)
+
+async def deliver(server, dispatcher, timeout=5):
+    bot = make_bot(server)
+    await dispatcher.start(bot)
+    await asyncio.wait_for(dispatcher.drain(), timeout)
+    await dispatcher.stop()
+    await bot.shutdown()
+
+@pytest.mark.asyncio
+async def test_pending_notifications_are_coalesced():
+    async with FakeBotApi() as server:
+        dispatcher = make_dispatcher()
+        for i in range(3):
+            dispatcher.notify(1, f"event {i}")
+        await deliver(server, dispatcher)
+
+    assert [text for _, text in server.chat_messages(1)] == ["event 0\n\nevent 1\n\nevent 2"]
+    stats = dispatcher.stats()
+    assert stats["sent_messages"] == 1
+    assert stats["sent_notifications"] == 3
+    assert stats["coalesced"] == 2
+
+@pytest.mark.asyncio
+async def test_coalescing_respects_message_length():
+    async with FakeBotApi() as server:
+        dispatcher = make_dispatcher()
+        for _ in range(3):
+            dispatcher.notify(1, "x" * 2000)
+        await deliver(server, dispatcher)
+
+    assert [len(text) for _, text in server.chat_messages(1)] == [4002, 2000]
+
+@pytest.mark.asyncio
+async def test_per_chat_interval():
+    async with FakeBotApi() as server:
+        dispatcher = make_dispatcher()
+        bot = make_bot(server)
+        await dispatcher.start(bot)
+        dispatcher.notify(1, "first")
+        dispatcher.notify(-100, "group first")
+        await asyncio.sleep(0.05)
+        dispatcher.notify(1, "second")
+        dispatcher.notify(-100, "group second")
+        dispatcher.notify(2, "other chat")
+        await asyncio.wait_for(dispatcher.drain(), 5)
+        await dispatcher.stop()
+        await bot.shutdown()
+
+    (first, _), (second, _) = server.chat_messages(1)
+    assert second - first >= 0.19
+    (first, _), (second, _) = server.chat_messages(-100)
+    assert second - first >= 0.39
+    # Another chat isn't held back by chat 1's interval
+    (other, _), = server.chat_messages(2)
+    assert other < second
+
+@pytest.mark.asyncio
+async def test_global_rate_limit():
+    rate, chats = 50, 26
+    async with FakeBotApi() as server:
+        dispatcher = make_dispatcher(global_rate=rate)
+        for chat_id in range(chats):
+            dispatcher.notify(chat_id, "hello")
+        started = time.monotonic()
+        await deliver(server, dispatcher)
+        elapsed = time.monotonic() - started
+
+    assert len(server.messages) == chats
+    assert elapsed >= (chats - 1) / rate * 0.9
+
+@pytest.mark.asyncio
+async def test_retry_after_pauses_and_requeues():
+    async with FakeBotApi() as server:
+        server.flood_next = [1]
+        dispatcher = make_dispatcher()
+        dispatcher.notify(1, "hello")
+        dispatcher.notify(2, "world")
+        started = time.monotonic()
+        await deliver(server, dispatcher)
+
+    assert sorted(text for _, _, text in server.messages) == ["hello", "world"]
+    assert time.monotonic() - started >= 0.9
+    assert dispatcher.stats()["retry_after"] == 1
+
+@pytest.mark.asyncio
+async def test_blocked_chat_is_dropped():
+    async with FakeBotApi() as server:
+        server.blocked.add(1)
+        dispatcher = make_dispatcher()
+        dispatcher.notify(1, "hello")
+        dispatcher.notify(2, "hello")
+        await deliver(server, dispatcher)
+
+    assert [chat for _, chat, _ in server.messages] == [2]
+    assert dispatcher.stats()["failed"] == 1
+
+def test_pending_queue_is_bounded():
+    dispatcher = make_dispatcher(max_pending_per_chat=2)
+    for i in range(5):
+        dispatcher.notify(1, str(i))
+    assert dispatcher.queued == 2
+    assert dispatcher.stats()["dropped"] == 3
+
+def test_disabled_dispatcher_ignores_notifications():
+    dispatcher = make_dispatcher()
+    dispatcher.enabled = False
+    assert dispatcher.notify(1, "hello") is False
+    assert dispatcher.queued == 0
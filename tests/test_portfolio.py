@@ -0,0 +1,119 @@
+import pytest
+from src.core.models.wallet import JettonBalance, Portfolio, WalletSnapshot, to_raw_address
+from src.features.portfolio.handlers import PortfolioHandlers
+from src.infrastructure.ton_api.client import TonApiClient
+from src.services.wallet_service import WalletService
+from tests.fakes import FakeTonApi
+
+ADDRESSES = [f"0:{i:064x}" for i in range(1, 31)]
+
+class StubPriceService:
+    def get_price(self, symbol):
+        return {"TON": 2.0}.get(symbol)
+
+class StubMessage:
+    def __init__(self, text=""):
+        self.text = text
+        self.edits = []
+        self.replies = []
+
+    async def reply_text(self, text, **kwargs):
+        reply = StubMessage(text)
+        self.replies.append(reply)
+        return reply
+
+    async def edit_text(self, text, **kwargs):
+        self.edits.append(text)
+
+class StubUpdate:
+    def __init__(self, text):
+        self.message = StubMessage(text)
+        self.callback_query = None
+
+def make_server(**kwargs):
+    server = FakeTonApi(
+        accounts={address: {"balance": 1_000_000_000 * (i + 1)} for i, address in enumerate(ADDRESSES[:-1])},
+        **kwargs
+    )
+    for address in ADDRESSES[:-1]:
+        server.jettons[address] = [{
+            "balance": "2000000000",
+            "jetton": {"symbol": "BOLT", "decimals": 9, "address": "0:b01t"},
+            "price": {"prices": {"USD": 0.5}}
+        }]
+    return server
+
+def make_service(server):
+    client = TonApiClient()
+    client.transport.base_url = f"{server.url}/v2"
+    client.transport.max_retries = 0
+    client.transport.rate_limiter = None
+    return WalletService(client, StubPriceService(), timeout=2), client
+
+def test_to_raw_address():
+    assert to_raw_address("EQD0vdSA_NedR9uvbgN9EikRX-suesDxGeFg69XQMavfLqIw") == \
+        "0:f4bdd480fcd79d47dbaf6e037d1229115feb2e7ac0f119e160ebd5d031abdf2e"
+
+def test_parse_addresses_dedupes():
+    text = "!портфель EQD0vdSA_NedR9uvbgN9EikRX-suesDxGeFg69XQMavfLqIw, " \
+           "0:f4bdd480fcd79d47dbaf6e037d1229115feb2e7ac0f119e160ebd5d031abdf2e junk"
+    assert PortfolioHandlers.parse_addresses(text) == ["EQD0vdSA_NedR9uvbgN9EikRX-suesDxGeFg69XQMavfLqIw"]
+
+def test_aggregate_single_pass():
+    wallets = [
+        WalletSnapshot("a", ton_balance=1.5, jettons=[JettonBalance("BOLT", "", "0:b", 10, 0.1)]),
+        WalletSnapshot("b", ton_balance=2.5, jettons=[
+            JettonBalance("BOLT", "", "0:b", 5, 0.1),
+            JettonBalance("XYZ", "", "0:x", 7)
+        ]),
+        WalletSnapshot("c", found=False)
+    ]
+    portfolio = Portfolio.aggregate(wallets)
+
+    assert portfolio.total_ton == 4.0
+    bolt, xyz = portfolio.jettons
+    assert (bolt.amount, bolt.holders) == (15, 2)
+    assert bolt.value_usd == pytest.approx(1.5)
+    assert xyz.value_usd is None
+    assert portfolio.not_found == ["c"]
+
+@pytest.mark.asyncio
+async def test_bulk_accounts_use_one_request():
+    async with make_server() as server:
+        service, client = make_service(server)
+        snapshots = [s async for s in service.stream_snapshots(ADDRESSES)]
+
+        assert len(snapshots) == len(ADDRESSES)
+        assert server.count("/v2/accounts/_bulk") == 1
+        assert not any(path == f"/v2/accounts/{ADDRESSES[0]}" for _, path in server.requests)
+        portfolio = Portfolio.aggregate(snapshots)
+        assert portfolio.total_ton == sum(range(1, 30))
+        assert portfolio.not_found == [ADDRESSES[-1]]
+        await client.close()
+
+@pytest.mark.asyncio
+async def test_falls_back_to_single_requests():
+    async with make_server(bulk=False) as server:
+        service, client = make_service(server)
+        accounts = await client.get_accounts_bulk(ADDRESSES)
+
+        assert accounts[ADDRESSES[0]]["balance"] == 1_000_000_000
+        assert accounts[ADDRESSES[-1]] is None
+        assert server.count(f"/v2/accounts/{ADDRESSES[0]}") == 1
+        await client.close()
+
+@pytest.mark.asyncio
+async def test_handler_edits_one_message():
+    async with make_server() as server:
+        service, client = make_service(server)
+        handlers = PortfolioHandlers(service, StubPriceService())
+        handlers.PROGRESS_INTERVAL = 0
+        update = StubUpdate("!портфель " + " ".join(ADDRESSES[:5]))
+
+        await handlers.handle_portfolio_command(update, None)
+
+        progress, = update.message.replies
+        assert progress.text.startswith("⏳")
+        assert "15.00 TON" in progress.edits[-1]
+        assert "BOLT: *10.00* ($5.00)" in progress.edits[-1]
+        await client.close()
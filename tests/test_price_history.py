@@ -0,0 +1,132 @@
+import threading
+import pytest
+from src.infrastructure.price_history.store import PriceHistory, TICK
+
+HOUR = 3600
+START = 1_700_000_000 - 1_700_000_000 % 86400  # midnight UTC
+
+@pytest.fixture
+def history(tmp_path):
+    history = PriceHistory(tmp_path, tick_capacity=100)
+    yield history
+    history.close()
+
+def fill(history, symbol="TON", hours=48, step=60, price=lambda i: 2.0 + i * 0.001):
+    for i in range(hours * HOUR // step):
+        history.record(symbol, price(i), START + i * step)
+
+def test_rollup_into_ohlc_tiers(history):
+    prices = [3.0, 5.0, 1.0, 4.0]
+    for i, price in enumerate(prices):
+        history.record("TON", price, START + i * 10)
+
+    candle, = history.candles("TON", "1m", START, START + 59)
+    assert (candle.open, candle.high, candle.low, candle.close) == (3.0, 5.0, 1.0, 4.0)
+    assert len(history.candles("TON", "1h", START, START + HOUR)) == 1
+
+def test_range_query_selects_overlapping_candles(history):
+    fill(history, hours=3)
+    candles = history.candles("TON", "1h", START + 30 * 60, START + 2 * HOUR)
+    assert [c.start for c in candles] == [START, START + HOUR, START + 2 * HOUR]
+
+def test_percent_change(history):
+    history.record("TON", 2.0, START)
+    history.record("TON", 2.5, START + 24 * HOUR)
+    assert history.change_percent("TON", 24) == pytest.approx(25.0)
+    assert history.change_percent("BOLT", 24) is None
+
+def test_change_is_unknown_before_history_starts(history):
+    history.record("TON", 2.0, START + 12 * HOUR)
+    assert history.change_percent("TON", 24, now=START + 36 * HOUR - 1) is None
+
+def test_retention_trims_old_buckets(tmp_path):
+    history = PriceHistory(tmp_path, tick_capacity=10, tiers=(("1m", 60, 5),))
+    fill(history, hours=1)
+    assert len(history.series("TON").timestamps) <= 20
+    assert len(history.series("TON").tiers["1m"]) <= 10
+    history.close()
+
+def test_out_of_order_ticks_are_ignored(history):
+    assert history.record("TON", 2.0, START + 60)
+    assert not history.record("TON", 3.0, START)
+    assert history.latest("TON") == (START + 60, 2.0)
+
+def test_reload_from_disk(tmp_path):
+    history = PriceHistory(tmp_path, tick_capacity=50)
+    fill(history, hours=2)
+    history.close()
+
+    reloaded = PriceHistory(tmp_path, tick_capacity=50)
+    assert reloaded.latest("TON") == (START + 2 * HOUR - 60, pytest.approx(2.0 + 119 * 0.001))
+    assert len(reloaded.candles("TON", "1m", START, START + 2 * HOUR)) == 120
+    reloaded.close()
+
+def test_old_ticks_are_read_from_mapped_log(history):
+    fill(history, hours=2)
+    history.flush()
+    # Only the last 100 ticks stay in memory; the first ones come from disk
+    ticks = history.ticks("TON", START, START + 120)
+    assert ticks == [(START, 2.0), (START + 60, pytest.approx(2.001)), (START + 120, pytest.approx(2.002))]
+
+def test_torn_tail_is_truncated(tmp_path):
+    history = PriceHistory(tmp_path)
+    history.record("TON", 2.0, START)
+    history.close()
+    path = tmp_path / "TON.bin"
+    with open(path, "ab") as f:
+        f.write(b"\x00" * 5)
+
+    reloaded = PriceHistory(tmp_path)
+    assert reloaded.latest("TON") == (START, 2.0)
+    assert path.stat().st_size == TICK.size
+    reloaded.close()
+
+def test_log_is_compacted_to_the_ring(tmp_path):
+    history = PriceHistory(tmp_path, tick_capacity=50)
+    for day in range(3):
+        for i in range(24 * 60):
+            history.record("TON", 2.0 + i * 0.001, START + day * 86400 + i * 60)
+        history.flush()
+        # The log never holds more than twice the ring, however long the bot runs
+        assert (tmp_path / "TON.bin").stat().st_size <= 2 * 50 * TICK.size + 24 * 60 * TICK.size
+    history.record("TON", 5.0, START + 3 * 86400)
+    history.flush()
+    assert (tmp_path / "TON.bin").stat().st_size <= 2 * 50 * TICK.size
+    history.close()
+
+    reloaded = PriceHistory(tmp_path, tick_capacity=50)
+    assert reloaded.latest("TON") == (START + 3 * 86400, 5.0)
+    # Candles from before the retained ticks come from the saved tiers
+    assert len(reloaded.candles("TON", "1h", START, START + 3 * 86400)) == 73
+    assert reloaded.price_at("TON", START + 30) == pytest.approx(2.059)  # close of the first hour
+    assert reloaded.price_at("TON", START - 1) is None
+    reloaded.close()
+
+@pytest.mark.asyncio
+async def test_persist_writes_off_the_event_loop(tmp_path, monkeypatch):
+    history = PriceHistory(tmp_path, tick_capacity=10)
+    writers = set()
+    write = history.series("TON").write
+    monkeypatch.setattr(history.series("TON"), "write", lambda *args: (writers.add(threading.get_ident()), write(*args)))
+    fill(history, hours=1)
+    await history.persist()
+
+    assert threading.get_ident() not in writers
+    assert (tmp_path / "TON.tiers").exists()
+    assert (tmp_path / "TON.bin").stat().st_size <= 2 * 10 * TICK.size
+    history.close()
+
+def test_ranges_past_the_ring_include_unwritten_ticks(tmp_path):
+    history = PriceHistory(tmp_path, tick_capacity=10)
+    for i in range(20):
+        history.record("TON", 2.0, START + i * 60)
+    history.flush()
+    # The ring drops its oldest ticks while the newest are still unwritten
+    for i in range(20, 25):
+        history.record("TON", 3.0, START + i * 60)
+    assert history.series("TON").timestamps[0] > START
+
+    ticks = history.ticks("TON", START, START + 25 * 60)
+    assert [t for t, _ in ticks] == [START + i * 60 for i in range(25)]
+    assert ticks[-1] == (START + 24 * 60, 3.0)
+    history.close()
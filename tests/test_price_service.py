@@ -1,36 +1,101 @@
+import asyncio
+import time
 import pytest
 from src.services.price_service import PriceService
-from src.infrastructure.price_api.client import PriceApiClient
+from src.infrastructure.price_history.store import PriceHistory
+from src.app.config import get_settings
+
+BOLT_JETTON = get_settings().BOLT_JETTON
 
 @pytest.fixture
 def price_client():
     class MockPriceClient:
-        async def get_ton_price(self):
-            return 2.5  # Mock TON price
+        def __init__(self):
+            self.calls = []
+            
+        async def get_prices(self, coin_ids):
+            self.calls.append(coin_ids)
+            return {"the-open-network": 2.5}  # Mock TON price
             
     return MockPriceClient()
 
 @pytest.fixture
-def price_service(price_client):
-    return PriceService(price_client)
+def ton_client():
+    class MockTonClient:
+        def __init__(self):
+            self.calls = []
+            
+        async def get_rates(self, tokens):
+            self.calls.append(tokens)
+            return {BOLT_JETTON: 0.0042}  # Mock BOLT rate
+            
+    return MockTonClient()
+
+@pytest.fixture
+def price_service(price_client, ton_client):
+    return PriceService(price_client, ton_client)
 
 @pytest.mark.asyncio
-async def test_price_tracking():
+async def test_price_tracking(price_service):
     """Test price tracking functionality"""
-    service = price_service()
-    
     # Start tracking
-    await service.start()
+    await price_service.start()
+    await asyncio.sleep(0.01)
     
     # Check prices are updated
-    assert service.get_price('TON') == 2.5
-    assert service.get_price('BOLT') == 2.5 * 0.012
+    assert price_service.get_price('TON') == 2.5
+    assert price_service.get_price('BOLT') == 0.0042
     
     # Stop tracking
-    await service.stop()
+    await price_service.stop()
+
+@pytest.mark.asyncio
+async def test_refresh_batches_requests(price_service, price_client, ton_client):
+    """Each source is queried once per refresh"""
+    await price_service.refresh()
+    
+    assert price_client.calls == [["the-open-network"]]
+    assert ton_client.calls == [[BOLT_JETTON]]
+    assert price_service.version == 1
+
+@pytest.mark.asyncio
+async def test_quotes_carry_freshness(price_service):
+    await price_service.refresh()
+    
+    quote = price_service.get_quote('ton')
+    assert quote.source == "coingecko"
+    assert not quote.is_stale
+    assert price_service.get_quote('BOLT').source == "tonapi"
+
+@pytest.mark.asyncio
+async def test_stale_quote(price_service, monkeypatch):
+    await price_service.refresh()
+    
+    later = time.time() + get_settings().PRICE_STALE_AFTER + 1
+    monkeypatch.setattr(time, "time", lambda: later)
+    assert price_service.get_quote('TON').is_stale
 
 @pytest.mark.asyncio
-async def test_get_price_unknown_token():
+async def test_failed_source_keeps_other_prices(price_service, ton_client):
+    async def failing_rates(tokens):
+        raise RuntimeError("tonapi down")
+    ton_client.get_rates = failing_rates
+    
+    assert await price_service.refresh() == {"TON": 2.5}
+    assert price_service.get_price('BOLT') is None
+
+@pytest.mark.asyncio
+async def test_get_price_unknown_token(price_service):
     """Test getting price for unknown token"""
-    service = price_service()
-    assert service.get_price('UNKNOWN') is None 
\ No newline at end of file
+    assert price_service.get_price('UNKNOWN') is None
+
+@pytest.mark.asyncio
+async def test_refresh_records_history(price_client, ton_client, tmp_path):
+    history = PriceHistory(tmp_path)
+    service = PriceService(price_client, ton_client, history=history)
+    await service.refresh()
+
+    assert history.latest("TON")[1] == 2.5
+    assert history.latest("BOLT") is not None
+    assert (tmp_path / "TON.bin").stat().st_size > 0
+    history.close()
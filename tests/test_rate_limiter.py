@@ -0,0 +1,81 @@
+import asyncio
+import pytest
+from src.infrastructure.http.rate_limiter import (
+    Priority,
+    RateLimiter,
+    TokenBucket,
+    background_priority,
+    request_priority
+)
+from src.utils.errors import RateLimitError
+
+def test_token_bucket_burst_and_refill():
+    bucket = TokenBucket(rate=100, capacity=2)
+    assert bucket.try_acquire()
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+    assert 0 < bucket.time_until_available() <= 0.01
+
+@pytest.mark.asyncio
+async def test_burst_is_granted_immediately():
+    limiter = RateLimiter("test", rate=1, burst=3)
+    waits = [await limiter.acquire() for _ in range(3)]
+    assert waits == [0.0, 0.0, 0.0]
+
+@pytest.mark.asyncio
+async def test_interactive_requests_jump_the_queue():
+    limiter = RateLimiter("test", rate=50, burst=1)
+    await limiter.acquire()
+    order = []
+
+    async def request(name, priority):
+        await limiter.acquire(priority)
+        order.append(name)
+
+    background = [asyncio.create_task(request(f"bg{i}", Priority.BACKGROUND)) for i in range(3)]
+    await asyncio.sleep(0)
+    interactive = asyncio.create_task(request("user", Priority.INTERACTIVE))
+    await asyncio.gather(*background, interactive)
+
+    assert order[0] == "user"
+    assert order[1:] == ["bg0", "bg1", "bg2"]
+
+@pytest.mark.asyncio
+async def test_queue_deadline():
+    limiter = RateLimiter("test", rate=1, burst=1, max_wait={Priority.INTERACTIVE: 0.05})
+    await limiter.acquire()
+
+    with pytest.raises(RateLimitError):
+        await limiter.acquire(Priority.INTERACTIVE)
+
+    stats = limiter.stats()
+    assert stats["priorities"]["interactive"]["timeouts"] == 1
+    assert stats["queue_depth"] == 0
+
+@pytest.mark.asyncio
+async def test_queue_metrics():
+    limiter = RateLimiter("test", rate=100, burst=1)
+    await limiter.acquire()
+
+    waiters = [asyncio.create_task(limiter.acquire()) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert limiter.queue_depth == 3
+
+    await asyncio.gather(*waiters)
+    interactive = limiter.stats()["priorities"]["interactive"]
+    assert interactive["granted"] == 4
+    assert interactive["max_wait"] > 0
+
+@pytest.mark.asyncio
+async def test_background_priority_context():
+    assert request_priority.get() == Priority.INTERACTIVE
+    with background_priority():
+        assert request_priority.get() == Priority.BACKGROUND
+    assert request_priority.get() == Priority.INTERACTIVE
+
+@pytest.mark.asyncio
+async def test_penalize_delays_next_grant():
+    limiter = RateLimiter("test", rate=20, burst=5)
+    limiter.penalize(0.1)
+    waited = await limiter.acquire()
+    assert waited >= 0.09
@@ -0,0 +1,160 @@
+import time
+from types import SimpleNamespace
+import pytest
+from telegram.error import BadRequest
+from src.core.models.price import PriceQuote
+from src.features.community.handlers import CommunityHandlers
+from src.features.alerts.handlers import AlertHandlers
+from src.features.prices.handlers import PriceHandlers
+from src.features.tracking.handlers import TrackingHandlers
+from src.features.wallet_info.handlers import WalletInfoHandlers
+from src.core.models.wallet import WalletSnapshot
+from src.utils.rendering import Screen, ScreenCache
+
+class StubMessage:
+    def __init__(self, chat_id=1, message_id=10, error=None):
+        self.chat_id = chat_id
+        self.message_id = message_id
+        self.error = error
+        self.edits = []
+
+    async def edit_text(self, text, **kwargs):
+        self.edits.append(text)
+        if self.error:
+            raise self.error
+
+class StubQuery:
+    def __init__(self, message):
+        self.message = message
+
+    async def answer(self):
+        pass
+
+class StubPriceService:
+    def __init__(self):
+        self.version = 1
+        self.quotes = {
+            "TON": PriceQuote("TON", 3.0, time.time(), "test", 300),
+            "BOLT": PriceQuote("BOLT", 0.01, time.time(), "test", 300)
+        }
+        self.renders = 0
+
+    def get_quote(self, symbol):
+        self.renders += 1
+        return self.quotes.get(symbol)
+
+    def get_change(self, symbol, hours):
+        return None
+
+    def get_price(self, symbol):
+        quote = self.quotes.get(symbol)
+        return quote.value if quote else None
+
+def callback(message):
+    return SimpleNamespace(callback_query=StubQuery(message))
+
+def test_dynamic_screens_render_once_per_key():
+    screens = ScreenCache()
+    calls = []
+
+    def render():
+        calls.append(1)
+        return Screen(f"render {len(calls)}")
+
+    assert screens.get("prices", 1, render).text == "render 1"
+    assert screens.get("prices", 1, render).text == "render 1"
+    assert screens.get("prices", 2, render).text == "render 2"
+    screens.invalidate("prices")
+    assert screens.get("prices", 2, render).text == "render 3"
+    assert screens.stats()["hits"] == 1
+
+@pytest.mark.asyncio
+async def test_identical_edits_are_skipped():
+    screens = ScreenCache()
+    message = StubMessage()
+    query = StubQuery(message)
+
+    await screens.edit(query, Screen("a"))
+    await screens.edit(query, Screen("a"))
+    await screens.edit(query, Screen("b"))
+    await screens.edit(StubQuery(StubMessage(message_id=11)), Screen("b"))
+    assert message.edits == ["a", "b"]
+    assert screens.stats()["skipped_edits"] == 1
+
+@pytest.mark.asyncio
+async def test_not_modified_errors_are_swallowed():
+    screens = ScreenCache()
+    not_modified = BadRequest("Message is not modified: specified new message content is the same")
+    await screens.edit(StubQuery(StubMessage(error=not_modified)), Screen("a"))
+
+    with pytest.raises(BadRequest):
+        await screens.edit(StubQuery(StubMessage(message_id=2, error=BadRequest("Chat not found"))), Screen("a"))
+
+@pytest.mark.asyncio
+async def test_tracked_messages_are_bounded():
+    screens = ScreenCache(max_messages=2)
+    for message_id in range(3):
+        await screens.edit(StubQuery(StubMessage(message_id=message_id)), Screen("a"))
+    assert screens.stats()["tracked_messages"] == 2
+
+@pytest.mark.asyncio
+async def test_price_menu_follows_price_version():
+    prices = StubPriceService()
+    handlers = PriceHandlers(prices, ScreenCache())
+    message = StubMessage()
+
+    await handlers.handle_price_menu(callback(message), None)
+    renders = prices.renders
+    await handlers.handle_price_menu(callback(message), None)
+    assert len(message.edits) == 1
+    # Only the cache key was computed the second time
+    assert prices.renders == renders + 2
+
+    prices.quotes["TON"] = PriceQuote("TON", 3.5, time.time(), "test", 300)
+    prices.version += 1
+    await handlers.handle_price_menu(callback(message), None)
+    assert len(message.edits) == 2
+    assert "$3.500" in message.edits[-1]
+
+@pytest.mark.asyncio
+async def test_community_screens_are_prerendered():
+    screens = ScreenCache()
+    handlers = CommunityHandlers(screens)
+    assert screens.stats()["static"] == 2
+
+    message = StubMessage()
+    await handlers.handle_community_menu(callback(message), None)
+    await handlers.handle_community_menu(callback(message), None)
+    await handlers.handle_social_media(callback(message), None)
+    assert len(message.edits) == 2
+    assert message.edits[0] is screens.static("community_menu").text
+
+@pytest.mark.asyncio
+async def test_menu_edits_made_by_other_handlers_are_tracked():
+    screens = ScreenCache()
+    tracking = TrackingHandlers(None, None, None, screens)
+    wallet_info = WalletInfoHandlers(None, StubPriceService(), None, screens)
+    alerts = AlertHandlers(alert_service=None, notifications=None, screens=screens)
+    message = StubMessage()
+
+    await tracking.handle_main_menu(callback(message), None)
+    await wallet_info.handle_wallet_info_menu(callback(message), None)
+    await tracking.handle_main_menu(callback(message), None)
+    assert message.edits[-1] is screens.static("main_menu").text
+
+    # The error fallback replaces the menu too
+    await alerts.handle_list_command(SimpleNamespace(callback_query=StubQuery(message), effective_user=None), None)
+    assert message.edits[-1].startswith("❌")
+    await tracking.handle_main_menu(callback(message), None)
+    assert len(message.edits) == 5
+    assert screens.stats()["skipped_edits"] == 0
+
+def test_wallet_reply_shows_snapshot_age():
+    handlers = WalletInfoHandlers(None, StubPriceService(), None, ScreenCache())
+    snapshot = WalletSnapshot(address="EQ" + "A" * 46, ton_balance=1.0, jettons=[])
+    assert "Updated just now" in handlers.render_snapshot(snapshot)
+
+    snapshot.fetched_at -= 45
+    assert "Updated 45s ago" in handlers.render_snapshot(snapshot)
+    snapshot.fetched_at -= 400
+    assert "Updated 7 min ago" in handlers.render_snapshot(snapshot)
@@ -0,0 +1,168 @@
+import pytest
+from telegram import Bot, Update
+from telegram.ext import ApplicationBuilder
+from src.core.commands.base import Command
+from src.core.commands.registry import CommandRegistry
+from src.core.commands.router import HANDLER_DURATION, Router, callback_data
+from src.core.models.wallet import ADDRESS_PATTERN
+from src.features.alerts.handlers import ALERTS_PER_PAGE, AlertHandlers
+from src.core.models.alert import Alert, ABOVE
+from src.utils.rendering import ScreenCache
+from tests.fakes import FakeBotApi
+
+ADDRESS = "EQ" + "A" * 46
+
+BOT = Bot(FakeBotApi.TOKEN)
+
+class Recorder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, name):
+        async def callback(update, context):
+            self.calls.append((name, list(context.args)))
+        return callback
+
+def message_update(text, update_id=1):
+    return Update.de_json({
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 1_700_000_000,
+            "chat": {"id": 7, "type": "private"},
+            "from": {"id": 7, "is_bot": False, "first_name": "Test"},
+            "text": text
+        }
+    }, BOT)
+
+def callback_update(data, update_id=1):
+    return Update.de_json({
+        "update_id": update_id,
+        "callback_query": {
+            "id": str(update_id),
+            "chat_instance": "1",
+            "from": {"id": 7, "is_bot": False, "first_name": "Test"},
+            "data": data
+        }
+    }, BOT)
+
+@pytest.fixture
+def routes():
+    recorder = Recorder()
+    router = Router()
+    router.command("/start", recorder("start"))
+    router.command(["!болт", "!тон"], recorder("price"))
+    router.command(["/portfolio", "!портфель"], recorder("portfolio"))
+    router.callback_query("main_menu", recorder("menu"))
+    router.callback_query("alerts", recorder("alerts"))
+    router.pattern(ADDRESS_PATTERN, recorder("wallet"))
+    return router, recorder
+
+def test_commands_and_aliases_resolve(routes):
+    router, _ = routes
+    assert router.resolve_text("!болт") is not None
+    assert router.resolve_text("!ТОН") is not None
+    assert router.resolve_text("/start") is not None
+    callback, args = router.resolve_text(f"!портфель {ADDRESS} x")
+    assert args == [ADDRESS, "x"]
+    assert router.resolve_text("hello") is None
+    assert router.resolve_text("") is None
+
+def test_bot_mentions(routes):
+    router, _ = routes
+    assert router.resolve_text("/start@BoltBot", bot_username="BoltBot") is not None
+    assert router.resolve_text("/start@OtherBot", bot_username="BoltBot") is None
+
+def test_pattern_fallback(routes):
+    router, _ = routes
+    assert router.resolve_text(ADDRESS) is not None
+    assert router.resolve_text(ADDRESS + " trailing") is None
+
+def test_callback_data_with_arguments(routes):
+    router, _ = routes
+    assert callback_data("alerts", 3) == "alerts:3"
+    _, args = router.resolve_callback("alerts:3")
+    assert args == ["3"]
+    _, args = router.resolve_callback("main_menu")
+    assert args == []
+    assert router.resolve_callback("unknown:1") is None
+    with pytest.raises(ValueError):
+        callback_data("x", "y" * 64)
+
+def test_duplicate_routes_are_rejected(routes):
+    router, recorder = routes
+    with pytest.raises(ValueError):
+        router.command("!БОЛТ", recorder("other"))
+    with pytest.raises(ValueError):
+        router.callback_query("alerts", recorder("other"))
+    with pytest.raises(ValueError):
+        router.callback_query("a:b", recorder("other"))
+
+def test_registry_commands_are_routed(routes):
+    router, _ = routes
+
+    class Ping(Command):
+        def __init__(self):
+            super().__init__()
+            self.name = "!ping"
+            self.aliases = ["!пинг"]
+
+        async def execute(self, update, context):
+            pass
+
+    registry = CommandRegistry()
+    ping = Ping()
+    registry.register(ping)
+    assert registry.get_command("!PING") is ping
+    assert registry.get_command("!пинг") is ping
+    assert registry.get_command("!pong") is None
+
+    router.include(registry)
+    callback, _ = router.resolve_text("!пинг")
+    assert callback == ping.execute
+
+@pytest.mark.asyncio
+async def test_application_dispatches_through_router(routes):
+    router, recorder = routes
+    async with FakeBotApi() as server:
+        app = ApplicationBuilder().token(FakeBotApi.TOKEN).base_url(f"{server.url}/bot").build()
+        app.add_handler(router)
+        async with app:
+            await app.process_update(message_update("!тон"))
+            await app.process_update(message_update("/portfolio a b", 2))
+            await app.process_update(callback_update("alerts:2", 3))
+            await app.process_update(message_update("nothing here", 4))
+
+    assert recorder.calls == [("price", []), ("portfolio", ["a", "b"]), ("alerts", ["2"])]
+    assert sum(HANDLER_DURATION.labels("callback").counts) >= 3
+
+@pytest.mark.asyncio
+async def test_router_callback_dispatches_directly(routes):
+    router, recorder = routes
+    context = type("Context", (), {"args": None})()
+    assert router.callback == router.dispatch
+
+    await router.callback(callback_update("main_menu:1"), context)
+    await router.callback(message_update("nothing here"), context)
+    assert recorder.calls == [("menu", ["1"])]
+
+def test_alert_pages():
+    handlers = AlertHandlers(alert_service=None, notifications=None, screens=ScreenCache())
+    alerts = [
+        Alert(id=str(i), user_id="7", chat_id=7, symbol="TON", direction=ABOVE, threshold=i)
+        for i in range(ALERTS_PER_PAGE * 2 + 1)
+    ]
+
+    text, markup = handlers.render_page(alerts, 0)
+    assert "(1/3)" in text
+    assert [b.callback_data for b in markup.inline_keyboard[0]] == ["alerts:2"]
+
+    text, markup = handlers.render_page(alerts, 1)
+    assert [b.callback_data for b in markup.inline_keyboard[0]] == ["alerts:1", "alerts:3"]
+
+    text, markup = handlers.render_page(alerts, 99)
+    assert "(3/3)" in text
+    assert text.count("`") == 2
+
+    text, markup = handlers.render_page(alerts[:1], 0)
+    assert markup is None
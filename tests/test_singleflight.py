@@ -0,0 +1,83 @@
+import asyncio
+import pytest
+from src.utils.singleflight import SingleFlight
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_are_coalesced():
+    flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"balance": 42}
+
+    results = await asyncio.gather(*(flight.do(("acc", "addr"), fetch) for _ in range(20)))
+
+    assert calls == 1
+    assert all(result == {"balance": 42} for result in results)
+    assert flight.stats() == {"calls": 20, "coalesced": 19, "in_flight": 0}
+
+@pytest.mark.asyncio
+async def test_failure_is_shared():
+    flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("upstream down")
+
+    results = await asyncio.gather(
+        *(flight.do("key", fetch) for _ in range(5)),
+        return_exceptions=True
+    )
+
+    assert calls == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+@pytest.mark.asyncio
+async def test_distinct_keys_run_separately():
+    flight = SingleFlight()
+
+    async def fetch(value):
+        await asyncio.sleep(0.01)
+        return value
+
+    a, b = await asyncio.gather(
+        flight.do("a", lambda: fetch("a")),
+        flight.do("b", lambda: fetch("b"))
+    )
+
+    assert (a, b) == ("a", "b")
+    assert flight.coalesced == 0
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_others():
+    flight = SingleFlight()
+
+    async def fetch():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    first = asyncio.create_task(flight.do("key", fetch))
+    second = asyncio.create_task(flight.do("key", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "done"
+
+@pytest.mark.asyncio
+async def test_next_call_after_completion_runs_again():
+    flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        return calls
+
+    assert await flight.do("key", fetch) == 1
+    assert await flight.do("key", fetch) == 2
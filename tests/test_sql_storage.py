@@ -0,0 +1,113 @@
+import asyncio
+import pytest
+from sqlalchemy import text
+from src.core.models.user import User
+from src.infrastructure.storage.sql_storage import SqlRepository
+from src.utils.errors import StorageError
+
+@pytest.fixture
+def database_url(tmp_path):
+    return f"sqlite:///{tmp_path / 'bot.db'}"
+
+@pytest.mark.asyncio
+async def test_save_get_delete(database_url):
+    repo = SqlRepository(database_url, User)
+
+    await repo.save("1", User(id="1", session_data={"lang": "ru"}))
+    assert (await repo.get("1")).session_data == {"lang": "ru"}
+
+    assert await repo.delete("1") is True
+    assert await repo.delete("1") is False
+    assert await repo.get("1") is None
+
+    await repo.close()
+
+@pytest.mark.asyncio
+async def test_uses_wal_mode(database_url):
+    repo = SqlRepository(database_url, User)
+    with repo.engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+    await repo.close()
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_share_transactions(database_url, monkeypatch):
+    repo = SqlRepository(database_url, User)
+    batches = []
+    commit_batch = repo._commit_batch
+    monkeypatch.setattr(repo, "_commit_batch", lambda batch: (batches.append(len(batch)), commit_batch(batch)))
+
+    await asyncio.gather(*(repo.save(str(i), User(id=str(i))) for i in range(100)))
+
+    assert len(batches) < 100
+    assert sum(batches) == 100
+    assert await repo.count() == 100
+    await repo.close()
+
+@pytest.mark.asyncio
+async def test_pending_writes_are_visible(database_url):
+    repo = SqlRepository(database_url, User)
+    save = asyncio.create_task(repo.save("1", User(id="1", session_data={"x": 1})))
+    await asyncio.sleep(0)
+
+    assert (await repo.get("1")).session_data == {"x": 1}
+    await save
+    await repo.close()
+
+@pytest.mark.asyncio
+async def test_iterate_streams_pages(database_url):
+    repo = SqlRepository(database_url, User, page_size=7)
+    await asyncio.gather(*(repo.save(f"{i:03}", User(id=f"{i:03}")) for i in range(30)))
+
+    ids = [user.id async for user in repo.iterate()]
+    assert ids == [f"{i:03}" for i in range(30)]
+    assert len(await repo.list()) == 30
+    await repo.close()
+
+@pytest.mark.asyncio
+async def test_data_survives_reopen(database_url):
+    repo = SqlRepository(database_url, User)
+    await repo.save("1", User(id="1", session_data={"k": "v"}))
+    await repo.close()
+
+    reopened = SqlRepository(database_url, User)
+    assert (await reopened.get("1")).session_data == {"k": "v"}
+    await reopened.close()
+
+@pytest.mark.asyncio
+async def test_in_memory_sqlite_is_shared_across_threads():
+    repo = SqlRepository("sqlite://", User)
+    await asyncio.gather(*(repo.save(str(i), User(id=str(i), session_data={"n": i})) for i in range(20)))
+
+    assert (await repo.get("7")).session_data == {"n": 7}
+    assert await repo.count() == 20
+    await repo.close()
+
+@pytest.mark.asyncio
+async def test_sqlite_directory_is_created(tmp_path):
+    repo = SqlRepository(f"sqlite:///{tmp_path / 'missing' / 'bot.db'}", User)
+    await repo.save("1", User(id="1"))
+    assert (tmp_path / "missing" / "bot.db").exists()
+    await repo.close()
+
+@pytest.mark.asyncio
+async def test_failed_commit_keeps_writes_pending(database_url, monkeypatch):
+    repo = SqlRepository(database_url, User)
+    await repo.save("1", User(id="1", session_data={"v": 1}))
+    commit_batch = repo._commit_batch
+
+    def fail(batch):
+        raise RuntimeError("database is locked")
+    monkeypatch.setattr(repo, "_commit_batch", fail)
+    with pytest.raises(StorageError):
+        await repo.save("1", User(id="1", session_data={"v": 2}))
+    # The failed write is still what readers see, and the next write commits it
+    assert (await repo.get("1")).session_data == {"v": 2}
+
+    monkeypatch.setattr(repo, "_commit_batch", commit_batch)
+    await repo.save("2", User(id="2"))
+    await repo.close()
+
+    reopened = SqlRepository(database_url, User)
+    assert (await reopened.get("1")).session_data == {"v": 2}
+    assert await reopened.count() == 2
+    await reopened.close()
@@ -0,0 +1,110 @@
+import asyncio
+import importlib
+import os
+import subprocess
+import sys
+from pathlib import Path
+import pytest
+from dependency_injector import providers
+from src.app.config import get_settings
+from src.app.container import deferred
+from src.utils.rendering import ScreenCache
+from src.utils.startup import ImportProfiler, StartupProfile
+from tests.fakes import FakeBotApi
+
+ROOT = Path(__file__).resolve().parent.parent
+
+def test_import_profiler_splits_self_time(tmp_path, monkeypatch):
+    (tmp_path / "outer_mod.py").write_text("import time\nimport inner_mod\ntime.sleep(0.02)\n")
+    (tmp_path / "inner_mod.py").write_text("import time\ntime.sleep(0.05)\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    profiler = ImportProfiler()
+    profiler.install()
+    try:
+        importlib.import_module("outer_mod")
+    finally:
+        profiler.uninstall()
+        sys.modules.pop("outer_mod", None)
+        sys.modules.pop("inner_mod", None)
+
+    outer_total, outer_self = profiler.modules["outer_mod"]
+    inner_total, inner_self = profiler.modules["inner_mod"]
+    assert inner_self >= 0.05 and outer_total >= 0.07
+    assert 0.02 <= outer_self < 0.05
+    assert profiler.by_package()["outer_mod"] == outer_self
+
+@pytest.mark.asyncio
+async def test_startup_profile_records_phases_and_marks():
+    profile = StartupProfile()
+    await asyncio.gather(
+        profile.timed("fast", asyncio.sleep(0)),
+        profile.timed("slow", asyncio.sleep(0.02))
+    )
+    with profile.phase("handlers"):
+        pass
+    profile.mark("ready")
+
+    assert profile.phases["slow"] >= 0.02
+    assert set(profile.stats()) == {"ready_seconds"}
+    report = profile.report()
+    assert "slow" in report and "ready" in report
+
+@pytest.fixture
+def unimported(monkeypatch):
+    """Remove a module from sys.modules for the duration of a test"""
+    def remove(name):
+        monkeypatch.delitem(sys.modules, name, raising=False)
+        parent, _, child = name.rpartition(".")
+        if parent in sys.modules:
+            monkeypatch.delattr(sys.modules[parent], child, raising=False)
+    return remove
+
+def test_deferred_providers_import_on_first_use(unimported):
+    unimported("src.features.community.handlers")
+    create = deferred(".features.community.handlers:CommunityHandlers")
+    assert create.__name__ == "CommunityHandlers"
+    assert "src.features.community.handlers" not in sys.modules
+
+    handlers = create(screens=ScreenCache())
+    assert "src.features.community.handlers" in sys.modules
+    assert type(handlers) is sys.modules["src.features.community.handlers"].CommunityHandlers
+
+def test_json_backend_does_not_import_sqlalchemy():
+    code = "import sys, src.app.container; print('sqlalchemy' in sys.modules)"
+    env = dict(os.environ, STORAGE_BACKEND="json", STATE_BACKEND="memory")
+    result = subprocess.check_output([sys.executable, "-c", code], cwd=ROOT, env=env, text=True)
+    assert result.strip() == "False"
+
+class SlowStep:
+    def __init__(self):
+        self.cancelled = False
+        self.finished = False
+
+    async def run(self):
+        try:
+            await asyncio.sleep(1)
+            self.finished = True
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+    start = initialize = load = run
+
+@pytest.mark.asyncio
+async def test_failed_startup_step_cancels_the_others(monkeypatch):
+    from src.app.bot import BoltBot
+    monkeypatch.setattr(get_settings(), "BOT_TOKEN", FakeBotApi.TOKEN)
+    bot = BoltBot()
+    steps = {}
+    for name in ("cache", "state_backend", "ton_client", "price_client", "alert_service", "whale_service"):
+        steps[name] = SlowStep()
+        getattr(bot.container, name).override(providers.Object(steps[name]))
+
+    async def fail():
+        raise RuntimeError("getMe failed")
+    monkeypatch.setattr(bot.app, "initialize", fail)
+
+    with pytest.raises(RuntimeError, match="getMe failed"):
+        await bot.startup()
+    assert all(step.cancelled and not step.finished for step in steps.values())
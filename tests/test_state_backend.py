@@ -0,0 +1,107 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+import pytest
+import pytest_asyncio
+from src.core.state_manager import StateManager
+from src.infrastructure.state.memory import MemoryStateBackend
+from src.infrastructure.state.sqlite import SqliteStateBackend
+
+@pytest_asyncio.fixture(params=["memory", "sqlite"])
+async def backend(request, tmp_path):
+    if request.param == "memory":
+        backend = MemoryStateBackend(StateManager(expiry_minutes=1))
+    else:
+        backend = SqliteStateBackend(str(tmp_path / "state.db"), expiry_minutes=1)
+    yield backend
+    await backend.close()
+
+@pytest.mark.asyncio
+async def test_set_get_delete(backend):
+    assert await backend.get("1") is None
+    version = await backend.set("1", "awaiting_address", {"page": 2})
+    state = await backend.get("1")
+    assert (state.state, state.data, state.version) == ("awaiting_address", {"page": 2}, version)
+
+    await backend.delete("1")
+    assert await backend.get("1") is None
+
+@pytest.mark.asyncio
+async def test_compare_and_set(backend):
+    assert await backend.compare_and_set("1", 5, "menu") is None
+    first = await backend.compare_and_set("1", 0, "menu")
+    assert first is not None
+    assert await backend.compare_and_set("1", 0, "other") is None
+
+    second = await backend.compare_and_set("1", first, "other")
+    assert second is not None and second != first
+    assert await backend.compare_and_set("1", first, "stale") is None
+    assert (await backend.get("1")).state == "other"
+
+@pytest.mark.asyncio
+async def test_versions_are_not_reused_after_delete(backend):
+    first = await backend.set("1", "menu")
+    await backend.delete("1")
+    assert await backend.set("1", "menu") != first
+
+@pytest.mark.asyncio
+async def test_update_retries_conflicts(backend):
+    async def increment():
+        await backend.update("counter", lambda s: ("count", {"n": (s.data.get("n", 0) if s else 0) + 1}))
+
+    await asyncio.gather(*(increment() for _ in range(20)))
+    assert (await backend.get("counter")).data == {"n": 20}
+
+@pytest.mark.asyncio
+async def test_sqlite_expiry(tmp_path, monkeypatch):
+    backend = SqliteStateBackend(str(tmp_path / "state.db"), expiry_minutes=1)
+    await backend.set("1", "menu")
+    version = (await backend.get("1")).version
+
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+    assert await backend.get("1") is None
+    # An expired state counts as absent for compare-and-set
+    assert await backend.compare_and_set("1", version, "menu") is None
+    assert await backend.compare_and_set("1", 0, "menu") is not None
+
+    monkeypatch.setattr(time, "time", lambda: now + 200)
+    assert await backend.reap() == 1
+    await backend.close()
+
+WORKER = """
+import asyncio, sys
+from src.infrastructure.state.sqlite import SqliteStateBackend
+
+async def main(path, increments):
+    backend = SqliteStateBackend(path, expiry_minutes=5)
+    for _ in range(increments):
+        await backend.update(
+            "counter",
+            lambda s: ("count", {"n": (s.data.get("n", 0) if s else 0) + 1}),
+            attempts=1000
+        )
+    await backend.close()
+
+asyncio.run(main(sys.argv[1], int(sys.argv[2])))
+"""
+
+@pytest.mark.asyncio
+async def test_sqlite_state_is_consistent_across_processes(tmp_path):
+    path = str(tmp_path / "state.db")
+    # Create the schema before the workers race to do it
+    await SqliteStateBackend(path).close()
+
+    workers = [
+        await asyncio.create_subprocess_exec(
+            sys.executable, "-c", WORKER, path, "50", cwd=Path(__file__).parent.parent
+        )
+        for _ in range(4)
+    ]
+    assert [await worker.wait() for worker in workers] == [0, 0, 0, 0]
+
+    backend = SqliteStateBackend(path)
+    state = await backend.get("counter")
+    assert state.data == {"n": 200}
+    await backend.close()
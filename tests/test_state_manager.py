@@ -0,0 +1,74 @@
+import asyncio
+import time
+import pytest
+from src.core.state_manager import StateManager
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(time, "monotonic", lambda: now[0])
+    return now
+
+def test_state_expires_after_ttl(clock):
+    manager = StateManager(expiry_minutes=1)
+    manager.set_state("1", "awaiting_address", {"step": 1})
+    manager.update_data("1", {"step": 2})
+
+    clock[0] += 59
+    assert manager.get_state("1").data == {"step": 2}
+    clock[0] += 1
+    assert manager.get_state("1") is None
+    assert manager.stats()["expired"] == 1
+
+def test_reaper_drops_abandoned_states(clock):
+    manager = StateManager(expiry_minutes=1, resolution=1)
+    for i in range(10):
+        manager.set_state(str(i), "menu")
+        clock[0] += 10
+    # Setting again files the state under a later slot; the old entry is skipped
+    manager.set_state("0", "menu")
+
+    # Set at 1010..1030; "4" expires at 1100 exactly, in the slot still open
+    assert manager.reap() == 3
+    assert set(manager.states) == {"0", "4", "5", "6", "7", "8", "9"}
+    assert manager.reap() == 0
+
+    clock[0] += 61
+    assert manager.reap() == 7
+    assert not manager.states
+    assert manager.stats()["wheel_slots"] == 0
+
+def test_max_states_evicts_closest_to_expiry(clock):
+    manager = StateManager(expiry_minutes=1, max_states=3, resolution=1)
+    for i in range(5):
+        manager.set_state(str(i), "menu")
+        clock[0] += 1
+    assert sorted(manager.states) == ["2", "3", "4"]
+    # Replacing an existing state does not evict anything
+    manager.set_state("3", "other")
+    assert sorted(manager.states) == ["2", "3", "4"]
+    assert manager.stats()["evicted"] == 2
+
+def test_data_is_created_on_demand(clock):
+    manager = StateManager()
+    manager.set_state("1", "menu")
+    assert manager.get_state("1")._data is None
+    manager.update_data("1", {"page": 2})
+    assert manager.get_state("1").data == {"page": 2}
+
+def test_wall_clock_jumps_are_ignored(clock, monkeypatch):
+    manager = StateManager(expiry_minutes=1)
+    manager.set_state("1", "menu")
+    monkeypatch.setattr(time, "time", lambda: 0)
+    assert manager.get_state("1") is not None
+
+@pytest.mark.asyncio
+async def test_background_reaper():
+    manager = StateManager(expiry_minutes=0, reap_interval=0.01, resolution=0.001)
+    for i in range(5):
+        manager.set_state(str(i), "menu")
+    await manager.start()
+    await asyncio.sleep(0.05)
+    await manager.stop()
+    assert not manager.states
+    assert manager.stats()["expired"] == 5
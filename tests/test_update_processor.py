@@ -0,0 +1,141 @@
+import asyncio
+import time
+import pytest
+from telegram import Bot, Update
+from telegram.ext import ApplicationBuilder, CallbackContext, MessageHandler, filters
+from src.app.update_processor import KeyedUpdateProcessor
+from tests.fakes import FakeBotApi
+
+BOT = Bot(FakeBotApi.TOKEN)
+
+def make_update(update_id, chat_id):
+    return Update.de_json({
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": 1_700_000_000,
+            "chat": {"id": chat_id, "type": "private"},
+            "text": str(update_id)
+        }
+    }, BOT)
+
+async def run_all(processor, updates, handler):
+    await asyncio.gather(*(
+        processor.process_update(update, handler(update)) for update in updates
+    ))
+
+@pytest.mark.asyncio
+async def test_same_chat_updates_stay_ordered():
+    processor = KeyedUpdateProcessor(8)
+    finished = []
+
+    async def handler(update):
+        # Earlier updates are slower, so only serialization keeps the order
+        await asyncio.sleep(0.05 / update.update_id)
+        finished.append(update.update_id)
+
+    await run_all(processor, [make_update(i, 1) for i in range(1, 6)], handler)
+    assert finished == [1, 2, 3, 4, 5]
+    assert processor.stats()["deferred"] == 4
+
+@pytest.mark.asyncio
+async def test_different_chats_run_in_parallel():
+    processor = KeyedUpdateProcessor(8)
+
+    async def handler(update):
+        await asyncio.sleep(0.1)
+
+    started = time.monotonic()
+    await run_all(processor, [make_update(i, i) for i in range(1, 9)], handler)
+    assert time.monotonic() - started < 0.3
+
+@pytest.mark.asyncio
+async def test_concurrency_cap_and_metrics():
+    processor = KeyedUpdateProcessor(2)
+    peak = 0
+
+    async def handler(update):
+        nonlocal peak
+        peak = max(peak, processor.in_flight)
+        await asyncio.sleep(0.02)
+
+    updates = [make_update(1, 1), make_update(2, 1), make_update(3, 1)]
+    updates += [make_update(i, i) for i in range(4, 10)]
+    tasks = [asyncio.create_task(processor.process_update(u, handler(u))) for u in updates]
+    await asyncio.sleep(0.001)
+    assert processor.queue_lengths()[("chat", 1)] == 2
+    assert processor.stats()["in_flight"] == 2
+    await asyncio.gather(*tasks)
+
+    assert peak == 2
+    assert processor.stats()["processed"] == 9
+    assert processor.stats()["busy_keys"] == 0
+
+@pytest.mark.asyncio
+async def test_busy_chat_backlog_does_not_block_other_chats():
+    processor = KeyedUpdateProcessor(2)
+    finished = []
+
+    async def handler(update):
+        await asyncio.sleep(0.05)
+        finished.append(update.effective_chat.id)
+
+    updates = [make_update(i, 1) for i in range(1, 6)] + [make_update(10, 2)]
+    await run_all(processor, updates, handler)
+    # Chat 2 finishes alongside chat 1's first update, not after its backlog
+    assert finished.index(2) <= 1
+
+@pytest.mark.asyncio
+async def test_backlog_is_bounded():
+    processor = KeyedUpdateProcessor(4, max_pending_per_key=2)
+
+    async def handler(update):
+        await asyncio.sleep(0.01)
+
+    await run_all(processor, [make_update(i, 1) for i in range(1, 7)], handler)
+    stats = processor.stats()
+    assert stats["processed"] == 3
+    assert stats["dropped"] == 3
+
+@pytest.mark.asyncio
+async def test_application_replies_in_order_per_chat():
+    async with FakeBotApi() as server:
+        app = (
+            ApplicationBuilder()
+            .token(FakeBotApi.TOKEN)
+            .base_url(f"{server.url}/bot")
+            .concurrent_updates(KeyedUpdateProcessor(8))
+            .build()
+        )
+
+        async def handler(update: Update, context: CallbackContext):
+            if update.message.text == "slow":
+                await asyncio.sleep(0.2)
+            await update.message.reply_text(f"re:{update.message.text}")
+
+        app.add_handler(MessageHandler(filters.TEXT, handler))
+        async with app:
+            await app.updater.start_polling(timeout=1)
+            await app.start()
+            await server.push_update("slow", chat_id=1)
+            await server.push_update("fast", chat_id=1)
+            await server.push_update("other", chat_id=2)
+            await asyncio.wait_for(server.wait_for_message("re:fast"), 5)
+            await app.updater.stop()
+            await app.stop()
+
+    replies = [(chat, text) for _, chat, text in server.messages]
+    assert replies.index((1, "re:slow")) < replies.index((1, "re:fast"))
+    assert replies.index((2, "re:other")) < replies.index((1, "re:slow"))
+
+@pytest.mark.asyncio
+async def test_first_update_hook_runs_once():
+    processor = KeyedUpdateProcessor(8)
+    calls = []
+    processor.on_first_update = lambda: calls.append(1)
+
+    async def handler(update):
+        pass
+
+    await run_all(processor, [make_update(i, i) for i in range(1, 4)], handler)
+    assert calls == [1]
@@ -22,26 +22,23 @@ def user_service(user_repository):
     return UserService(user_repository)
 
 @pytest.mark.asyncio
-async def test_create_user(user_service):
+async def test_create_session_user(user_service):
     user_id = "123"
-    user = await user_service.create_user(user_id)
+    user = await user_service.create_session_user(user_id)
     assert user.id == user_id
-    assert user.saved_address is None
-    assert len(user.tracked_wallets) == 0
+    assert user.session_data == {}
+    assert await user_service.get_or_create_session_user(user_id) is user
 
 @pytest.mark.asyncio
-async def test_add_tracked_wallet(user_service):
+async def test_update_and_clear_session(user_service, user_repository):
     user_id = "123"
-    address = "test_address"
     
-    # Create user first
-    user = await user_service.create_user(user_id)
+    # Session is created on first update
+    user = await user_service.update_session_data(user_id, {"address": "test_address"})
+    assert user.session_data == {"address": "test_address"}
     
-    # Add tracked wallet
-    result = await user_service.add_tracked_wallet(user_id, address)
-    assert result is True
-    
-    # Verify wallet was added
-    user = await user_service.get_user(user_id)
-    assert len(user.tracked_wallets) == 1
-    assert user.tracked_wallets[0].address == address 
\ No newline at end of file
+    # Clearing keeps the user but drops the data
+    await user_service.clear_user_session(user_id)
+    user = await user_service.get_session_user(user_id)
+    assert user.session_data == {}
+    assert user_repository.users[user_id] is user
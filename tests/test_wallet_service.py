@@ -0,0 +1,169 @@
+import asyncio
+import pytest
+from src.infrastructure.cache.memory_cache import MemoryCache
+from src.infrastructure.ton_api.client import TonApiClient
+from src.services.wallet_service import WalletService
+from src.utils.errors import APIError
+from tests.fakes import FakeTonApi
+
+ADDRESS = "EQD0vdSA_NedR9uvbgN9EikRX-suesDxGeFg69XQMavfLqIw"
+
+class StubPriceService:
+    def get_price(self, symbol):
+        return {"TON": 2.0, "BOLT": 0.5}.get(symbol)
+
+def make_server(**kwargs):
+    server = FakeTonApi(accounts={ADDRESS: {"balance": 12_500_000_000, "status": "active"}}, **kwargs)
+    server.jettons[ADDRESS] = [
+        {"balance": "3000000000", "jetton": {"symbol": "bolt", "decimals": 9}},
+        {"balance": "150", "jetton": {"symbol": "USDT", "decimals": 2}, "price": {"prices": {"USD": 1.0}}}
+    ]
+    return server
+
+async def make_service(server, cache=None, timeout=1.0):
+    client = TonApiClient()
+    client.transport.base_url = f"{server.url}/v2"
+    client.transport.max_retries = 0
+    client.transport.rate_limiter = None
+    return WalletService(client, StubPriceService(), cache=cache, timeout=timeout), client
+
+@pytest.mark.asyncio
+async def test_snapshot_is_parsed_and_priced():
+    async with make_server() as server:
+        service, client = await make_service(server)
+        snapshot = await service.get_snapshot(ADDRESS)
+
+        assert snapshot.ton_balance == 12.5
+        assert not snapshot.partial
+        bolt, usdt = snapshot.jettons
+        assert (bolt.symbol, bolt.amount, bolt.value_usd) == ("BOLT", 3.0, 1.5)
+        assert (usdt.amount, usdt.value_usd) == (1.5, 1.5)
+        await client.close()
+
+@pytest.mark.asyncio
+async def test_account_and_jettons_are_fetched_concurrently():
+    async with make_server(latency=0.1) as server:
+        service, client = await make_service(server)
+        started = asyncio.get_running_loop().time()
+        await service.get_snapshot(ADDRESS)
+
+        assert asyncio.get_running_loop().time() - started < 0.19
+        await client.close()
+
+@pytest.mark.asyncio
+async def test_slow_part_yields_partial_snapshot():
+    async with make_server() as server:
+        server.path_latency[f"/v2/accounts/{ADDRESS}/jettons"] = 1
+        service, client = await make_service(server, cache=MemoryCache(), timeout=0.1)
+        snapshot = await service.get_snapshot(ADDRESS)
+
+        assert snapshot.ton_balance == 12.5
+        assert snapshot.jettons is None
+        assert snapshot.missing == ["jettons"]
+        # Partial snapshots are never cached
+        assert not service.cache.contains(f"snapshot:{ADDRESS}", "wallet")
+        await client.close()
+
+@pytest.mark.asyncio
+async def test_total_timeout_raises():
+    async with make_server(latency=1) as server:
+        service, client = await make_service(server, timeout=0.05)
+        with pytest.raises(APIError):
+            await service.get_snapshot(ADDRESS)
+        await client.close()
+
+@pytest.mark.asyncio
+async def test_unknown_account_is_not_found():
+    async with make_server() as server:
+        service, client = await make_service(server)
+        snapshot = await service.get_snapshot("EQ" + "A" * 46)
+        assert snapshot.found is False
+        await client.close()
+
+@pytest.mark.asyncio
+async def test_concurrent_handlers_share_one_snapshot():
+    async with make_server(latency=0.05) as server:
+        service, client = await make_service(server, cache=MemoryCache())
+        snapshots = await asyncio.gather(*(service.get_snapshot(ADDRESS) for _ in range(10)))
+
+        assert all(snapshot is snapshots[0] for snapshot in snapshots)
+        assert server.count(f"/v2/accounts/{ADDRESS}") == 1
+        assert await service.get_snapshot(ADDRESS) is snapshots[0]
+        await client.close()
+
+@pytest.mark.asyncio
+async def test_stale_snapshot_is_served_while_one_refresh_runs():
+    async with make_server() as server:
+        service, client = await make_service(server, cache=MemoryCache())
+        first = await service.get_snapshot(ADDRESS)
+        service.fresh_ttl = 0
+        server.latency = 0.1
+
+        started = asyncio.get_running_loop().time()
+        snapshots = await asyncio.gather(*(service.get_snapshot(ADDRESS) for _ in range(10)))
+        assert asyncio.get_running_loop().time() - started < 0.05
+        assert all(snapshot is first for snapshot in snapshots)
+
+        await asyncio.gather(*service._refreshes.values())
+        assert server.count(f"/v2/accounts/{ADDRESS}") == 2
+        assert await service.get_snapshot(ADDRESS) is not first
+        assert service.stats()["stale_hits"] == 11
+        await client.close()
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_serving_stale_snapshot():
+    async with make_server() as server:
+        service, client = await make_service(server, cache=MemoryCache())
+        first = await service.get_snapshot(ADDRESS)
+        service.fresh_ttl = 0
+        server.error_rate = 1
+
+        await service.refresh(ADDRESS)
+        assert service.refresh_failures == 1
+        assert await service.get_snapshot(ADDRESS) is first
+        await service.stop()
+        await client.close()
+
+@pytest.mark.asyncio
+async def test_prefetch_refreshes_requested_and_pinned_addresses(monkeypatch):
+    other = "EQ" + "B" * 46
+    once = "EQ" + "C" * 46
+    async with make_server() as server:
+        server.accounts[other] = server.accounts[once] = {"balance": 1, "status": "active"}
+        service, client = await make_service(server, cache=MemoryCache())
+        monkeypatch.setattr(service.settings, "WALLET_PREFETCH_ADDRESSES", [ADDRESS])
+        for _ in range(3):
+            await service.get_snapshot(other)
+        await service.get_snapshot(once)
+        assert service.hot_addresses() == [ADDRESS, other]
+
+        # The pinned address is missing and the hot one goes stale before the next pass
+        service.fresh_ttl = service.prefetch_interval
+        assert await service.prefetch() == 2
+        assert server.count(f"/v2/accounts/{ADDRESS}") == 1
+        assert server.count(f"/v2/accounts/{other}") == 2
+        assert server.count(f"/v2/accounts/{once}") == 1
+
+        # Counts decay until addresses that stopped being requested are forgotten
+        await service.prefetch()
+        await service.prefetch()
+        assert service.hot_addresses() == [ADDRESS]
+        assert once not in service.demand
+        await client.close()
+
+@pytest.mark.asyncio
+async def test_refresh_bypasses_the_clients_raw_cache():
+    async with make_server() as server:
+        cache = MemoryCache()
+        service, client = await make_service(server, cache=cache)
+        # The container shares one cache between the client and the service
+        client.cache = cache
+        first = await service.get_snapshot(ADDRESS)
+        first.fetched_at -= 95
+
+        await service.refresh(ADDRESS)
+        assert server.count(f"/v2/accounts/{ADDRESS}") == 2
+        assert server.count(f"/v2/accounts/{ADDRESS}/jettons") == 2
+        refreshed = await service.get_snapshot(ADDRESS)
+        assert refreshed is not first and refreshed.age < 1
+        await client.close()
@@ -0,0 +1,63 @@
+import asyncio
+import aiohttp
+import pytest
+import pytest_asyncio
+from telegram import Bot
+from src.app.webhook import SECRET_HEADER, WebhookServer
+from tests.fakes import FakeBotApi
+
+SECRET = "s3cret-token"
+
+class StubApplication:
+    def __init__(self):
+        self.bot = Bot(FakeBotApi.TOKEN)
+        self.update_queue = asyncio.Queue()
+
+@pytest_asyncio.fixture
+async def webhook():
+    server = WebhookServer(StubApplication(), SECRET, host="127.0.0.1", port=0, max_body=4096)
+    await server.start()
+    server.url = f"http://127.0.0.1:{server.port}{server.path}"
+    yield server
+    await server.stop()
+
+UPDATE = {
+    "update_id": 1,
+    "message": {
+        "message_id": 1,
+        "date": 1_700_000_000,
+        "chat": {"id": 7, "type": "private"},
+        "text": "!тон"
+    }
+}
+
+async def post(url, secret=SECRET, **kwargs):
+    headers = {SECRET_HEADER: secret} if secret is not None else {}
+    async with aiohttp.ClientSession() as session:
+        async with session.post(url, headers=headers, **kwargs) as response:
+            return response.status
+
+@pytest.mark.asyncio
+async def test_valid_update_is_queued(webhook):
+    assert await post(webhook.url, json=UPDATE) == 200
+    update = webhook.application.update_queue.get_nowait()
+    assert update.message.text == "!тон"
+    assert webhook.stats() == {"received": 1, "rejected": 0}
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("secret", [None, "wrong", SECRET + "x"])
+async def test_wrong_secret_is_rejected(webhook, secret):
+    assert await post(webhook.url, secret=secret, json=UPDATE) == 403
+    assert webhook.application.update_queue.empty()
+
+@pytest.mark.asyncio
+async def test_oversized_body_is_rejected(webhook):
+    body = {**UPDATE, "padding": "x" * 10_000}
+    assert await post(webhook.url, json=body) == 413
+    assert webhook.application.update_queue.empty()
+
+@pytest.mark.asyncio
+async def test_malformed_body_is_rejected(webhook):
+    assert await post(webhook.url, data=b"not json") == 400
+    assert await post(webhook.url, json=[1, 2]) == 400
+    assert webhook.stats()["rejected"] == 2
@@ -0,0 +1,140 @@
+import asyncio
+import pytest
+from src.app.config import get_settings
+from src.core.models.whale import WhaleSubscription, WhaleTransfer
+from src.infrastructure.storage.json_storage import JsonRepository
+from src.infrastructure.ton_api.client import TonApiClient
+from src.services.whale_service import WhaleService
+from tests.fakes import FakeTonApiStream, jetton_transfer_event
+
+BOLT = get_settings().BOLT_JETTON
+OTHER = "0:" + "ab" * 32
+
+def make_service(server, tmp_path):
+    client = TonApiClient()
+    client.transport.base_url = f"{server.url}/v2"
+    client.transport.max_retries = 0
+    client.transport.rate_limiter = None
+    repo = JsonRepository(tmp_path / "whales.json", WhaleSubscription)
+    service = WhaleService(client, repo, stream=client.open_stream("/sse/accounts/transactions"))
+    service.min_amount = 1000
+    return service
+
+async def run_until(service, condition, timeout=5):
+    await service.start()
+    try:
+        async def wait():
+            while not condition():
+                await asyncio.sleep(0.01)
+        await asyncio.wait_for(wait(), timeout)
+    finally:
+        await service.stop()
+        await service.ton_client.close()
+        await service.subscription_repository.close()
+
+def test_parse_filters_jetton_and_amount():
+    event = jetton_transfer_event("e1", 5000, BOLT)
+    event["actions"].append(jetton_transfer_event("e1", 9000, OTHER)["actions"][0])
+    event["actions"].append(jetton_transfer_event("e1", 10, BOLT)["actions"][0])
+
+    transfers = WhaleTransfer.parse(event, BOLT, 1000)
+    assert [(t.amount, t.action_index) for t in transfers] == [(5000, 0)]
+
+@pytest.mark.asyncio
+async def test_streams_large_transfers_to_subscribers(tmp_path):
+    records = [
+        jetton_transfer_event("big", 50_000, BOLT),
+        jetton_transfer_event("small", 10, BOLT),
+        jetton_transfer_event("other", 50_000, OTHER),
+        jetton_transfer_event("huge", 2_000_000, BOLT)
+    ]
+    async with FakeTonApiStream(records) as server:
+        service = make_service(server, tmp_path)
+        await service.subscribe(1)
+        await service.subscribe(2, min_amount=1_000_000)
+        published = []
+
+        async def listener(transfer, chat_ids):
+            published.append((transfer.event_id, sorted(chat_ids)))
+
+        service.add_listener(listener)
+        await run_until(service, lambda: len(published) == 2)
+
+    assert sorted(published) == [("big", [1]), ("huge", [1, 2])]
+    assert service.received == 4
+
+@pytest.mark.asyncio
+async def test_reconnects_and_resumes_from_last_event(tmp_path):
+    records = [jetton_transfer_event(f"e{i}", 5000, BOLT) for i in range(5)]
+    async with FakeTonApiStream(records, drop_after=2) as server:
+        service = make_service(server, tmp_path)
+        await service.subscribe(1)
+        published = []
+
+        async def listener(transfer, chat_ids):
+            published.append(transfer.event_id)
+
+        service.add_listener(listener)
+        await run_until(service, lambda: len(published) == 5)
+
+    assert sorted(published) == [f"e{i}" for i in range(5)]
+    assert server.resumed_from[:3] == [None, "1", "3"]
+
+@pytest.mark.asyncio
+async def test_hash_only_events_are_resolved(tmp_path):
+    async with FakeTonApiStream([{"account_id": OTHER, "lt": 1, "tx_hash": "abc"}]) as server:
+        server.events["abc"] = jetton_transfer_event("abc", 5000, BOLT)
+        service = make_service(server, tmp_path)
+        await service.subscribe(1)
+        published = []
+
+        async def listener(transfer, chat_ids):
+            published.append(transfer.event_id)
+
+        service.add_listener(listener)
+        await run_until(service, lambda: published)
+
+    assert published == ["abc"]
+
+@pytest.mark.asyncio
+async def test_slow_consumers_pause_the_stream(tmp_path):
+    records = [jetton_transfer_event(f"e{i}", 5000, BOLT) for i in range(200)]
+    async with FakeTonApiStream(records) as server:
+        service = make_service(server, tmp_path)
+        service.queue = asyncio.Queue(maxsize=2)
+        await service.subscribe(1)
+        blocked = asyncio.Event()
+
+        async def listener(transfer, chat_ids):
+            await blocked.wait()
+
+        service.add_listener(listener)
+        workers = get_settings().WHALE_WORKERS
+        await service.start()
+        while service.received < workers + 2:
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.2)
+        received = service.received
+        await service.stop()
+        await service.ton_client.close()
+        await service.subscription_repository.close()
+
+    # Stalled workers hold one event each, the queue is full and the reader
+    # waits on one more; nothing else was pulled off the socket
+    assert received <= workers + 2 + 1
+
+@pytest.mark.asyncio
+async def test_subscriptions_persist(tmp_path):
+    async with FakeTonApiStream() as server:
+        service = make_service(server, tmp_path)
+        await service.subscribe(7, min_amount=5)
+        await service.subscription_repository.close()
+        await service.ton_client.close()
+
+        reloaded = make_service(server, tmp_path)
+        await reloaded.load()
+        assert reloaded.subscriptions[7].min_amount == 1000
+        assert await reloaded.unsubscribe(7)
+        assert not await reloaded.unsubscribe(7)
+        await reloaded.subscription_repository.close()
+        await reloaded.ton_client.close()